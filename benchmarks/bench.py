@@ -0,0 +1,370 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This script benchmarks the hot paths of purple and writes the results as
+JSON, so that runs can be compared across versions. It needs no network access
+or extra packages. Run it from the top of the source tree:
+
+    python benchmarks/bench.py -o results.json
+    python benchmarks/bench.py --compare results.json
+
+Each benchmark is timed several times and the best time is kept. The following
+benchmarks are run; pass their names to run only some of them:
+
+    engine      letters/second for encrypt and decrypt, per engine
+    construct   microseconds per from_key_sheet() call
+    import      milliseconds to import purple.machine in a fresh interpreter
+    cli         letters/second through purple.main.main on a large input file
+    search      trial keys/second when decrypting and scoring a message
+    service     latency and throughput of "purple serve" on localhost under
+                concurrent clients
+
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from purple.compiled import CompiledPurple97
+from purple.machine import Purple97
+from purple.pool import MachinePool
+import purple.main
+from purple.scoring import ENGLISH
+from purple.search import search_chunk
+from purple.service import PurpleService
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+def best_of(func, repeat):
+    """Calls func repeat times and returns the shortest time in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def random_text(rng, n):
+    return ''.join(rng.choice(string.ascii_uppercase) for _ in range(n))
+
+
+def random_key(rng):
+    """Returns a random (switches, alphabet) key sheet pair."""
+    positions = [rng.randint(1, 25) for _ in range(4)]
+    fast, middle = rng.sample('123', 2)
+    alphabet = list(string.ascii_uppercase)
+    rng.shuffle(alphabet)
+    switches = '{}-{},{},{}-{}{}'.format(*positions, fast, middle)
+    return switches, ''.join(alphabet)
+
+
+def bench_engine(args):
+    """Letters per second for each engine and direction."""
+    rng = random.Random(1)
+    text = random_text(rng, args.letters)
+    engines = {
+        'Purple97': lambda: Purple97.from_key_sheet(SWITCHES, ALPHABET),
+        'Purple97-fused': lambda: Purple97.from_key_sheet(SWITCHES, ALPHABET,
+                                                          fused='full'),
+        'CompiledPurple97': lambda: CompiledPurple97.from_key_sheet(SWITCHES,
+                                                                    ALPHABET),
+    }
+    results = {}
+    for name, factory in engines.items():
+        # Warm up any shared tables before timing:
+        factory().encrypt(text[:100])
+        for action in ('encrypt', 'decrypt'):
+            elapsed = best_of(lambda: getattr(factory(), action)(text),
+                              args.repeat)
+            results['{}.{}'.format(name, action)] = {
+                'letters_per_sec': len(text) / elapsed,
+            }
+    return results
+
+
+def bench_construct(args):
+    """Microseconds per from_key_sheet() call, or per MachinePool.machine()
+    call, with one repeated key (warm caches) and with a different key every
+    call (cold caches).
+
+    """
+    rng = random.Random(2)
+    keys = [random_key(rng) for _ in range(args.keys)]
+    results = {}
+    for cls in (Purple97, CompiledPurple97):
+        def warm():
+            for _ in range(args.keys):
+                cls.from_key_sheet(SWITCHES, ALPHABET)
+
+        def cold():
+            for switches, alphabet in keys:
+                cls.from_key_sheet(switches, alphabet)
+
+        for label, func in (('warm', warm), ('cold', cold)):
+            elapsed = best_of(func, args.repeat)
+            results['{}.{}'.format(cls.__name__, label)] = {
+                'usec_per_call': 1e6 * elapsed / args.keys,
+            }
+
+    # A pooled machine is rekeyed instead
+    pool = MachinePool(1)
+
+    def warm():
+        for _ in range(args.keys):
+            with pool.machine(SWITCHES, ALPHABET):
+                pass
+
+    def cold():
+        for switches, alphabet in keys:
+            with pool.machine(switches, alphabet):
+                pass
+
+    for label, func in (('warm', warm), ('cold', cold)):
+        elapsed = best_of(func, args.repeat)
+        results['MachinePool.{}'.format(label)] = {
+            'usec_per_call': 1e6 * elapsed / args.keys,
+        }
+    return results
+
+
+def bench_import(args):
+    """Milliseconds to import purple.machine in a fresh interpreter."""
+    code = ('import time; t = time.perf_counter(); import purple.machine; '
+            'print(time.perf_counter() - t)')
+    times = []
+    for _ in range(args.repeat):
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         cwd=ROOT)
+        times.append(float(output))
+    return {'purple.machine': {'msec': 1e3 * min(times)}}
+
+
+def bench_cli(args):
+    """Letters per second through purple.main.main for encrypt and decrypt of
+    a large input file, with the default grouped output.
+
+    """
+    rng = random.Random(3)
+    text = random_text(rng, args.cli_letters)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'input.txt')
+        with open(path, 'w') as fp:
+            fp.write(text)
+
+        for action in ('encrypt', 'decrypt'):
+            argv = ['-' + action[0], '-s', SWITCHES, '-a', ALPHABET, '-i', path]
+
+            def run():
+                with open(os.devnull, 'w') as devnull, \
+                        contextlib.redirect_stdout(devnull):
+                    purple.main.main(argv)
+
+            elapsed = best_of(run, args.repeat)
+            results[action] = {'letters_per_sec': len(text) / elapsed}
+    return results
+
+
+def bench_search(args):
+    """Trial keys per second when scoring by English monogram log
+    probability: building a CompiledPurple97 for each random key, and the
+    purple.search engine, which rekeys one machine per motion order and
+    rejects most settings after a short probe.
+
+    """
+    rng = random.Random(4)
+    ciphertext = random_text(rng, args.message)
+    keys = [random_key(rng) for _ in range(args.keys)]
+
+    def search():
+        best = None
+        for switches, alphabet in keys:
+            purple = CompiledPurple97.from_key_sheet(switches, alphabet)
+            score = ENGLISH.score(purple.decrypt(ciphertext))
+            if best is None or score > best:
+                best = score
+
+    elapsed = best_of(search, args.repeat)
+    results = {'monogram': {
+        'keys_per_sec': args.keys / elapsed,
+        'letters_per_sec': args.keys * args.message / elapsed,
+    }}
+
+    # Search the twenties settings around the key of a longer message drawn
+    # from English letter frequencies, with and without early rejection
+    letters = sorted(ENGLISH.log_probs)
+    plaintext = ''.join(rng.choices(letters,
+            [10 ** ENGLISH.log_probs[c] for c in letters], k=5 * args.message))
+    index = 3 * 25 ** 3 + 7 * 625 + 11 * 25 + 13
+    purple = CompiledPurple97((4, 7, 11, 13), 2, 3, ALPHABET)
+    message = purple.encrypt(plaintext)
+    indexes = range(index - args.keys // 2, index + args.keys // 2)
+    for name, sigmas in (('keysearch', 2.0), ('keysearch_exact', None)):
+        elapsed = best_of(lambda: search_chunk(message, ALPHABET, 4, indexes,
+                abort_sigmas=sigmas), args.repeat)
+        results[name] = {'keys_per_sec': len(indexes) / elapsed}
+    return results
+
+
+def percentile(values, fraction):
+    """Returns the given fraction (0-1) percentile of a list of values."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def bench_service(args):
+    """Latency and throughput of the TCP service on localhost. Each client
+    sends short requests on its own persistent connection, either waiting for
+    each reply before sending the next (closed loop), or sending them all at
+    once (pipelined).
+
+    """
+    rng = random.Random(5)
+    keys = [random_key(rng) for _ in range(100)]
+    requests = [(json.dumps({'op': 'decrypt', 'switches': switches,
+                             'alphabet': alphabet,
+                             'text': random_text(rng, args.message)}) +
+                 '\n').encode('ascii') for switches, alphabet in keys]
+
+    async def closed_loop(port, latencies):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for i in range(args.requests):
+            start = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            await reader.readline()
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    async def pipelined(port, latencies):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        start = time.perf_counter()
+        writer.write(b''.join(requests[i % len(requests)]
+                              for i in range(args.requests)))
+        for _ in range(args.requests):
+            await reader.readline()
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    async def run(client):
+        async with PurpleService(port=0) as service:
+            # Warm up the worker processes:
+            await asyncio.gather(*[closed_loop(service.port, [])
+                                   for _ in range(2)])
+            latencies = []
+            start = time.perf_counter()
+            await asyncio.gather(*[client(service.port, latencies)
+                                   for _ in range(args.clients)])
+            elapsed = time.perf_counter() - start
+            return {
+                'clients': args.clients,
+                'requests_per_sec': len(latencies) / elapsed,
+                'letters_per_sec': len(latencies) * args.message / elapsed,
+                'latency_p50_ms': 1e3 * percentile(latencies, 0.5),
+                'latency_p99_ms': 1e3 * percentile(latencies, 0.99),
+                'batches': service.batches,
+            }
+
+    return {
+        'closed_loop': asyncio.run(run(closed_loop)),
+        'pipelined': asyncio.run(run(pipelined)),
+    }
+
+
+BENCHMARKS = {
+    'engine': bench_engine,
+    'construct': bench_construct,
+    'import': bench_import,
+    'cli': bench_cli,
+    'search': bench_search,
+    'service': bench_service,
+}
+
+
+def compare(old, new):
+    """Prints the ratio of each metric in new to the same metric in old."""
+    for bench, results in new['results'].items():
+        for case, metrics in results.items():
+            for metric, value in metrics.items():
+                try:
+                    before = old['results'][bench][case][metric]
+                except KeyError:
+                    continue
+                print('{:40} {:>14.1f} {:>14.1f} {:>7.2f}x'.format(
+                        '{}/{}/{}'.format(bench, case, metric), before, value,
+                        value / before if before else float('nan')))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark purple',
+            epilog='Benchmarks: ' + ', '.join(BENCHMARKS))
+    parser.add_argument('benchmarks', nargs='*', metavar='NAME',
+        help='benchmarks to run [default: all]')
+    parser.add_argument('-o', '--output', metavar='FILE',
+        help='write the JSON results to %(metavar)s instead of stdout')
+    parser.add_argument('-c', '--compare', metavar='FILE',
+        help='print a comparison against earlier JSON results in %(metavar)s')
+    parser.add_argument('-q', '--quick', action='store_true',
+        help='use small inputs, for a fast smoke test')
+    parser.add_argument('-r', '--repeat', type=int, default=5, metavar='N',
+        help='time each benchmark %(metavar)s times [default: %(default)s]')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmark: ' + ', '.join(sorted(unknown)))
+
+    scale = 10 if args.quick else 1
+    args.letters = 200000 // scale
+    args.cli_letters = 1000000 // scale
+    args.keys = 1000 // scale
+    args.message = 200
+    args.clients = 16
+    args.requests = 500 // scale
+
+    results = {}
+    for name in args.benchmarks or BENCHMARKS:
+        print('running {}...'.format(name), file=sys.stderr)
+        results[name] = BENCHMARKS[name](args)
+
+    report = {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'quick': args.quick,
+        'repeat': args.repeat,
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+            fp.write('\n')
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    if args.compare:
+        with open(args.compare) as fp:
+            compare(json.load(fp), report)
+
+
+if __name__ == '__main__':
+    main()
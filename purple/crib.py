@@ -0,0 +1,300 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains the CribSolver class, which finds the plugboard
+alphabets consistent with a crib (a guess at a stretch of plaintext) under
+known switch settings, and the "purple crib" command that runs it.
+
+The switches permute plugboard levels, and the alphabet only names them: with
+the alphabet A, ciphertext letter c deciphers at machine state t to
+
+    p = A[D_t[A^-1[c]]]
+
+where D_t is the level permutation of state t (see
+purple.compiled.level_permutations()). Each crib letter p over ciphertext
+letter c therefore constrains the unknown levels of two letters:
+
+    level(p) = D_t[level(c)]
+
+The set of levels a letter may still have is kept as a 26 bit integer. Each
+constraint narrows the levels of p to the image under D_t of the levels of c,
+and those of c to the image of the levels of p under the inverse permutation;
+a letter whose level is settled is removed from the sets of all the others,
+since no two letters share a level. This is repeated until nothing changes. A
+set becoming empty rejects the crib placement outright, usually within a few
+letters, with no trial decryption.
+
+When propagation alone does not settle every crib letter, solve() picks a
+crib letter with the fewest candidate levels, tries each, and propagates
+again. The results are partial alphabets: strings of 26 characters, one per
+level, with '?' at levels not fixed by the crib.
+
+"""
+import argparse
+import string
+import sys
+
+from purple.compiled import level_permutations
+from purple.machine import Purple97, Purple97Error, parse_key_sheet
+from purple.switch import SteppingSwitchError
+
+
+DESC = """Find the plugboard alphabets consistent with a crib"""
+
+EPILOG = """\
+The switch settings of the message must be known. With --offset, the partial
+alphabets consistent with the crib at that ciphertext position are printed,
+with ? at levels the crib does not fix. Otherwise every position of the
+message is tried and the positions where the crib fits are printed.
+"""
+
+LETTERS = string.ascii_uppercase
+LETTER_INDEX = {c: n for n, c in enumerate(LETTERS)}
+ALL_LEVELS = (1 << 26) - 1
+UNKNOWN = '?'
+
+DEFAULT_LIMIT = 1000
+
+
+class CribError(Purple97Error):
+    """Exception class for cribs that cannot be placed."""
+
+
+# Level sets are split into these (shift, width) chunks for lookup:
+CHUNKS = ((0, 6), (6, 5), (11, 5), (16, 5), (21, 5))
+
+
+def _image_tables(perm):
+    """Returns lookup tables giving the image under perm of any set of
+    levels, one per chunk of CHUNKS; see _image().
+
+    """
+    tables = []
+    for shift, width in CHUNKS:
+        table = [0] * (1 << width)
+        for m in range(1, 1 << width):
+            low = m & -m
+            table[m] = table[m ^ low] | 1 << perm[shift + low.bit_length() - 1]
+        tables.append(table)
+    return tuple(tables)
+
+
+def _image(levels, tables):
+    """Returns the set of levels that the permutation with the given image
+    tables maps the set levels to.
+
+    """
+    t0, t1, t2, t3, t4 = tables
+    return (t0[levels & 63] | t1[levels >> 6 & 31] | t2[levels >> 11 & 31] |
+            t3[levels >> 16 & 31] | t4[levels >> 21])
+
+
+def _count(levels):
+    return bin(levels).count('1')
+
+
+def _fixed_points(perm):
+    return sum(1 << n for n, m in enumerate(perm) if n == m)
+
+
+class CribSolver:
+    """A constraint solver for the plugboard alphabet of one message."""
+
+    def __init__(self, ciphertext, switches):
+        """Build a solver for ciphertext, which was enciphered with the given
+        switch settings in key sheet notation, e.g. 9-1,24,6-23. Whitespace is
+        ignored and '-' marks a garble.
+
+        """
+        text = ''.join(ciphertext.split())
+        for c in text:
+            if c != '-' and c not in LETTER_INDEX:
+                raise Purple97Error("invalid input '{}' to decrypt".format(c))
+        switches_pos, fast_switch, middle_switch = parse_key_sheet(switches)
+
+        self.text = text
+        self.decrypt_perms = level_permutations(
+                Purple97(switches_pos, fast_switch, middle_switch), len(text))
+        self.tables = {}
+
+    def _constraints(self, crib, offset):
+        """Returns the constraints of crib at offset as a list of tuples
+        (c, p, decrypt, encrypt) of letter indexes and the image tables of the
+        permutation and its inverse, or (c, c, fixed, None) when a letter
+        deciphers to itself, where fixed is the set of levels the permutation
+        fixes.
+
+        """
+        crib = ''.join(crib.split())
+        if not crib:
+            raise CribError("empty crib")
+        for p in crib:
+            if p not in LETTER_INDEX:
+                raise CribError("invalid crib letter '{}'".format(p))
+        if not 0 <= offset <= len(self.text) - len(crib):
+            raise CribError("crib does not fit at offset {}".format(offset))
+
+        constraints = []
+        for i, p in enumerate(crib, offset):
+            c = self.text[i]
+            if c == '-':
+                continue
+            perm = self.decrypt_perms[i]
+            if c == p:
+                constraints.append((LETTER_INDEX[c], LETTER_INDEX[p],
+                        _fixed_points(perm), None))
+                continue
+            # Image tables are built on first use and kept for other cribs
+            tables = self.tables.get(i)
+            if tables is None:
+                inverse = bytearray(26)
+                for n, m in enumerate(perm):
+                    inverse[m] = n
+                tables = (_image_tables(perm), _image_tables(inverse))
+                self.tables[i] = tables
+            constraints.append((LETTER_INDEX[c], LETTER_INDEX[p]) + tables)
+        return constraints
+
+    @staticmethod
+    def _propagate(constraints, domains):
+        """Narrows a copy of domains, a list of the candidate level sets of
+        each letter, until the constraints and the distinct levels rule
+        agree. Returns the narrowed list, or None if a set became empty.
+
+        """
+        domains = list(domains)
+        changed = True
+        while changed:
+            changed = False
+            for c, p, decrypt, encrypt in constraints:
+                if encrypt is None:
+                    levels = domains[c] & decrypt
+                    if not levels:
+                        return None
+                    if levels != domains[c]:
+                        domains[c] = levels
+                        changed = True
+                    continue
+                old_c, old_p = domains[c], domains[p]
+                new_p = old_p & _image(old_c, decrypt)
+                if not new_p:
+                    return None
+                new_c = old_c & _image(new_p, encrypt)
+                if not new_c:
+                    return None
+                if new_p != old_p or new_c != old_c:
+                    domains[c], domains[p] = new_c, new_p
+                    changed = True
+
+            # No two letters may share a level
+            settled = 0
+            for levels in domains:
+                if not levels & (levels - 1):
+                    if levels & settled:
+                        return None
+                    settled |= levels
+            for n, levels in enumerate(domains):
+                if levels & (levels - 1) and levels & settled:
+                    levels &= ~settled
+                    if not levels:
+                        return None
+                    domains[n] = levels
+                    changed = True
+        return domains
+
+    def domains(self, crib, offset):
+        """Returns a dictionary mapping each letter of the crib (and of the
+        ciphertext under it) to a list of its candidate plugboard levels
+        after propagation, or None if the crib cannot be at offset.
+
+        """
+        constraints = self._constraints(crib, offset)
+        domains = self._propagate(constraints, [ALL_LEVELS] * 26)
+        if domains is None:
+            return None
+        letters = {n for c, p, _, _ in constraints for n in (c, p)}
+        return {LETTERS[n]: [m for m in range(26) if domains[n] >> m & 1]
+                for n in sorted(letters)}
+
+    def solve(self, crib, offset, limit=DEFAULT_LIMIT):
+        """Returns a list of up to limit partial alphabets consistent with
+        crib placed at ciphertext position offset. Every level fixed by the
+        crib holds its letter, the others hold '?'. An empty list means the
+        crib cannot be at offset.
+
+        """
+        constraints = self._constraints(crib, offset)
+        letters = sorted({n for c, p, _, _ in constraints for n in (c, p)})
+        results = []
+
+        def search(domains):
+            domains = self._propagate(constraints, domains)
+            if domains is None:
+                return
+            open_letters = [n for n in letters
+                            if domains[n] & (domains[n] - 1)]
+            if not open_letters:
+                alphabet = [UNKNOWN] * 26
+                for n in letters:
+                    alphabet[domains[n].bit_length() - 1] = LETTERS[n]
+                results.append(''.join(alphabet))
+                return
+            n = min(open_letters, key=lambda n: _count(domains[n]))
+            levels = domains[n]
+            while levels and len(results) < limit:
+                low = levels & -levels
+                levels ^= low
+                domains[n] = low
+                search(domains)
+
+        search([ALL_LEVELS] * 26)
+        return results
+
+    def placements(self, crib, start=0, end=None):
+        """Returns a list of the ciphertext positions from start up to end
+        (by default, the end of the message) at which crib is consistent with
+        some alphabet.
+
+        """
+        length = len(''.join(crib.split()))
+        last = len(self.text) - length
+        end = last + 1 if end is None else min(end, last + 1)
+        return [offset for offset in range(max(start, 0), end)
+                if self.solve(crib, offset, limit=1)]
+
+
+def main(argv=None):
+    """Entry point for the "purple crib" command."""
+
+    parser = argparse.ArgumentParser(prog='purple crib',
+            description=DESC, epilog=EPILOG)
+    parser.add_argument('input', metavar='FILE',
+        help='file to read the ciphertext from, - for stdin')
+    parser.add_argument('-s', '--switches', required=True,
+        help='switch settings of the message, e.g. 9-1,24,6-23')
+    parser.add_argument('-c', '--crib', required=True,
+        help='the suspected plaintext')
+    parser.add_argument('-o', '--offset', type=int,
+        help='ciphertext position of the crib [default: try every position]')
+    parser.add_argument('-l', '--limit', type=int, default=DEFAULT_LIMIT,
+        metavar='N',
+        help='print at most %(metavar)s alphabets [default: %(default)s]')
+
+    args = parser.parse_args(args=argv)
+
+    if args.limit < 1:
+        parser.error("The --limit option must be 1 or greater")
+
+    try:
+        fp = sys.stdin if args.input == '-' else open(args.input, 'r')
+        with fp:
+            solver = CribSolver(fp.read(), args.switches)
+        if args.offset is None:
+            for offset in solver.placements(args.crib):
+                print(offset)
+        else:
+            for alphabet in solver.solve(args.crib, args.offset, args.limit):
+                print(alphabet)
+    except (Purple97Error, SteppingSwitchError, OSError) as ex:
+        raise SystemExit(str(ex))
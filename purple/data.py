@@ -11,16 +11,24 @@ Sullivan, and Frode Weierud. This paper was published in Cryptologia, Volume 27,
 Issue 1, January, 2003, pp. 1-43.
 
 To aid in verifying the data matches the data from the source paper, we have
-kept it 1-based. At runtime the data is converted to be 0-based by the factory
-functions to retrieve the data. As this simulation matures we may decide to
-change the data to be 0-based to avoid the startup cost of converting the data.
+kept it 1-based. The 0-based tables used at runtime are precomputed from this
+data and shipped in the generated purple.wiring module, so that no conversion
+is done when the simulation starts up. The unit tests check that the two
+agree; to regenerate purple.wiring after changing the data here, run:
+
+    python -m purple.data > purple/wiring.py
 
 This data was obtained by running an OCR program on a PDF of the above paper.
 The resulting text was then converted to Python statements by a throw-away
 script (which can be viewed by examing an early revision of the switches.py
 module.
 
+The list of lists views DECRYPT_DATA and ENCRYPT_DATA of the precomputed
+tables are kept for convenience; they are built on first use.
+
 """
+from purple.wiring import NUM_LEVELS, DECRYPT_TABLES, ENCRYPT_TABLES
+
 
 SIXES_DATA = \
 [[2, 1, 3, 5, 4, 6],
@@ -130,14 +138,7 @@ TWENTIES_3_DATA = \
  [8, 7, 5, 1, 15, 14, 9, 16, 11, 17, 18, 6, 19, 20, 3, 12, 4, 2, 10, 13],
  [13, 2, 17, 7, 14, 8, 3, 9, 20, 5, 16, 10, 6, 1, 12, 15, 11, 18, 4, 19]]
 
-# Convert wiring data to be 0-based.
-
-DECRYPT_DATA = [SIXES_DATA, TWENTIES_1_DATA, TWENTIES_2_DATA, TWENTIES_3_DATA]
-
-for table in DECRYPT_DATA:
-    for i in range(len(table)):
-        for j in range(len(table[i])):
-            table[i][j] = table[i][j] - 1
+SOURCE_DATA = [SIXES_DATA, TWENTIES_1_DATA, TWENTIES_2_DATA, TWENTIES_3_DATA]
 
 
 def build_encrypt_wiring(dec_wiring):
@@ -147,9 +148,88 @@ def build_encrypt_wiring(dec_wiring):
     """
     enc_wiring = []
     for level in dec_wiring:
-        enc_wiring.append(
-            [level.index(n) for n in range(len(level))])
+        reciprocal = [0] * len(level)
+        for n, x in enumerate(level):
+            reciprocal[x] = n
+        enc_wiring.append(reciprocal)
     return enc_wiring
 
-# Build reciprocal encrypt wiring tables:
-ENCRYPT_DATA = [build_encrypt_wiring(wiring) for wiring in DECRYPT_DATA]
+
+def build_tables(source=SOURCE_DATA):
+    """Builds the flat 0-based decrypt and encrypt tables from the 1-based
+    source data. A 2-tuple of lists of bytes objects is returned, one table per
+    switch, indexed by position * num_levels + level.
+
+    """
+    decrypt = [[[n - 1 for n in level] for level in wiring]
+               for wiring in source]
+    encrypt = [build_encrypt_wiring(wiring) for wiring in decrypt]
+    return ([bytes(n for level in wiring for n in level) for wiring in decrypt],
+            [bytes(n for level in wiring for n in level) for wiring in encrypt])
+
+
+def generate_wiring_module(source=SOURCE_DATA):
+    """Returns the Python source of the purple.wiring module, built from the
+    1-based source data.
+
+    """
+    decrypt, encrypt = build_tables(source)
+    lines = [WIRING_HEADER]
+    lines.append('NUM_LEVELS = {!r}'.format(
+            [len(wiring[0]) for wiring in source]))
+    for name, tables in (('DECRYPT_TABLES', decrypt),
+                         ('ENCRYPT_TABLES', encrypt)):
+        lines.append('')
+        lines.append('{} = ('.format(name))
+        for table in tables:
+            chunks = [table[i:i + 16] for i in range(0, len(table), 16)]
+            for i, chunk in enumerate(chunks):
+                text = ''.join('\\x{:02x}'.format(n) for n in chunk)
+                lines.append("    {}b'{}'{}".format('(' if i == 0 else ' ',
+                        text, '),' if i == len(chunks) - 1 else ''))
+        lines.append(')')
+    return '\n'.join(lines) + '\n'
+
+
+WIRING_HEADER = \
+"""# Copyright (C) 2013 - 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+#
+# This file was generated by purple.data; do not edit.
+
+\"\"\"This module contains the 0-based wiring tables for the PURPLE switches,
+precomputed from the 1-based data in purple.data.
+
+Each table is a bytes object indexed by position * num_levels + level, in the
+order sixes, twenties 1, twenties 2, twenties 3.
+
+\"\"\"
+"""
+
+
+def _list_view(tables):
+    """Returns the flat tables as lists of lists, indexed [position][level]."""
+    return [[list(table[i:i + n]) for i in range(0, len(table), n)]
+            for n, table in zip(NUM_LEVELS, tables)]
+
+
+_VIEWS = {
+    'DECRYPT_DATA': DECRYPT_TABLES,
+    'ENCRYPT_DATA': ENCRYPT_TABLES,
+}
+
+
+def __getattr__(name):
+    # Builds the list of lists views on first use, so that importing this
+    # module costs nothing at startup
+    tables = _VIEWS.get(name)
+    if tables is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(
+                __name__, name))
+    view = globals()[name] = _list_view(tables)
+    return view
+
+
+if __name__ == '__main__':
+    print(generate_wiring_module(), end='')
@@ -0,0 +1,343 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains the PlugboardSolver class, which recovers the
+plugboard alphabet of a message whose switch settings are known by hill
+climbing, and the "purple plugboard" command that runs it.
+
+The switches act on plugboard levels, not letters, so once the switch settings
+are known every letter of the message has a fixed permutation of the 26
+levels, the same whatever the alphabet. The solver computes these once. An
+alphabet maps levels to letters, and the plaintext letter at each position is
+
+    alphabet[perm[inverse[c]]]
+
+where c is the ciphertext letter and inverse maps letters to levels.
+
+The climber keeps the output level of every position and the number of
+positions at each output level. Swapping the letters at levels i and j of the
+alphabet changes the plaintext in two ways: positions whose ciphertext letter
+is one of the two swapped letters get a new input level, and so a new output
+level; and every other position whose output level is i or j now shows the
+other letter. Only the first kind has to be visited, about 2/26 of the
+message; the score change of the second kind follows from the counts. So a
+trial swap costs a small fraction of a decryption, and no Purple97 is built or
+validated per trial.
+
+The score is the language model score of the plaintext (see purple.scoring).
+With an n-gram model (see purple.ngrams) a swap also changes the n-grams
+around the positions of the second kind, so those are visited as well and
+only the n-grams touching a changed letter are rescored; the climb is slower
+but far more likely to reach the right alphabet.
+
+Each climb starts from a random alphabet and applies improving swaps until
+none is left. Climbs from many starting points are run with solve(),
+optionally on a pool of worker processes.
+
+"""
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import random
+import string
+import sys
+
+from purple.compiled import level_permutations
+from purple.machine import (Purple97, Purple97Error, parse_key_sheet,
+        validate_alphabet)
+from purple.ngrams import GARBLE, get_model
+from purple.scoring import ENGLISH, MonogramModel
+from purple.switch import SteppingSwitchError
+
+
+DESC = """Recover the plugboard alphabet of a PURPLE message"""
+
+EPILOG = """\
+The switch settings of the message must be known. Hill climbs are started from
+random alphabets and the best alphabets found are printed, best first, with
+the start of their plaintext.
+"""
+
+LETTERS = string.ascii_uppercase
+LETTER_INDEX = {c: n for n, c in enumerate(LETTERS)}
+SWAPS = tuple(combinations(range(26), 2))
+
+Solution = namedtuple('Solution', 'score alphabet')
+
+
+class PlugboardSolver:
+    """A hill climber for the plugboard alphabet of one message."""
+
+    def __init__(self, ciphertext, switches, model=ENGLISH):
+        """Build a solver for ciphertext, which was enciphered with the given
+        switch settings in key sheet notation, e.g. 9-1,24,6-23. Whitespace is
+        ignored and '-' marks a garble. model is the language model used for
+        scoring.
+
+        """
+        text = ''.join(ciphertext.split())
+        switches_pos, fast_switch, middle_switch = parse_key_sheet(switches)
+        purple = Purple97(switches_pos, fast_switch, middle_switch)
+        perms = level_permutations(purple, len(text))
+
+        # Keep the position of every letter, and its level permutation
+        self.length = len(text)
+        self.positions = []
+        self.cipher = []
+        self.perms = []
+        for i, c in enumerate(text):
+            if c != '-':
+                if c not in LETTER_INDEX:
+                    raise Purple97Error(
+                            "invalid input '{}' to decrypt".format(c))
+                self.positions.append(i)
+                self.cipher.append(LETTER_INDEX[c])
+                self.perms.append(perms[i])
+
+        self.by_cipher = [[] for _ in range(26)]
+        for t, c in enumerate(self.cipher):
+            self.by_cipher[c].append(t)
+        self.model = model
+        if isinstance(model, MonogramModel):
+            self.log_probs = [model.log_probs[c] for c in LETTERS]
+        else:
+            self.log_probs = None
+
+    def decrypt(self, alphabet):
+        """Returns the plaintext of the message under alphabet."""
+        alphabet = validate_alphabet(alphabet)
+        inverse = {c: n for n, c in enumerate(alphabet)}
+        plaintext = ['-'] * self.length
+        for i, c, perm in zip(self.positions, self.cipher, self.perms):
+            plaintext[i] = alphabet[perm[inverse[LETTERS[c]]]]
+        return ''.join(plaintext)
+
+    def score(self, alphabet):
+        """Returns the score of the plaintext under alphabet."""
+        return self.model.score(self.decrypt(alphabet))
+
+    def climb(self, alphabet=None, seed=None, max_passes=1000):
+        """Hill climbs from alphabet, or from a random alphabet drawn with the
+        given seed, and returns the Solution at which no swap of two letters
+        improves the score.
+
+        """
+        rng = random.Random(seed)
+        if alphabet is None:
+            letters = list(range(26))
+            rng.shuffle(letters)
+        else:
+            letters = [LETTER_INDEX[c] for c in validate_alphabet(alphabet)]
+        inverse = [0] * 26
+        for level, c in enumerate(letters):
+            inverse[c] = level
+        if self.log_probs is None:
+            return self._climb_ngrams(letters, inverse, rng, max_passes)
+
+        log_probs = self.log_probs
+        perms = self.perms
+        by_cipher = self.by_cipher
+        out_level = [perm[inverse[c]] for c, perm in zip(self.cipher, perms)]
+        out_count = [0] * 26
+        for level in out_level:
+            out_count[level] += 1
+        total = sum(log_probs[letters[level]] for level in out_level)
+
+        swaps = list(SWAPS)
+        for _ in range(max_passes):
+            rng.shuffle(swaps)
+            improved = False
+            for i, j in swaps:
+                a, b = letters[i], letters[j]
+                lp_a, lp_b = log_probs[a], log_probs[b]
+                swapped = letters[:]
+                swapped[i], swapped[j] = b, a
+
+                # Positions whose ciphertext letter moves to a new level
+                delta = 0.0
+                moved_i = moved_j = 0
+                for c, level in ((a, j), (b, i)):
+                    for t in by_cipher[c]:
+                        old = out_level[t]
+                        if old == i:
+                            moved_i += 1
+                        elif old == j:
+                            moved_j += 1
+                        delta += (log_probs[swapped[perms[t][level]]] -
+                                  log_probs[letters[old]])
+
+                # The rest of the positions showing a now show b, and back
+                delta += ((lp_b - lp_a) * (out_count[i] - moved_i) +
+                          (lp_a - lp_b) * (out_count[j] - moved_j))
+
+                if delta > 1e-9:
+                    for c, level in ((a, j), (b, i)):
+                        for t in by_cipher[c]:
+                            new = perms[t][level]
+                            out_count[out_level[t]] -= 1
+                            out_count[new] += 1
+                            out_level[t] = new
+                    letters = swapped
+                    inverse[a], inverse[b] = j, i
+                    total += delta
+                    improved = True
+            if not improved:
+                break
+
+        return Solution(total, ''.join(LETTERS[c] for c in letters))
+
+    def _climb_ngrams(self, letters, inverse, rng, max_passes):
+        """climb() for an n-gram model. A swap also changes the n-grams
+        around every position showing one of the swapped letters, so these
+        are visited too: the n-grams ending at each changed position and the
+        n - 1 positions after it are rescored before and after the swap.
+
+        """
+        model = self.model
+        n = model.n
+        table = model.table
+        length = self.length
+        positions = self.positions
+        perms = self.perms
+        by_cipher = self.by_cipher
+        out_level = [perm[inverse[c]] for c, perm in zip(self.cipher, perms)]
+        by_out = [set() for _ in range(26)]
+        plain = bytearray([GARBLE]) * length
+        for t, level in enumerate(out_level):
+            by_out[level].add(t)
+            plain[positions[t]] = letters[level]
+        total = model.score_codes(plain)
+
+        def rescore(ends):
+            result = 0.0
+            for k in ends:
+                if k >= n - 1:
+                    index = 0
+                    for c in plain[k - n + 1:k + 1]:
+                        if c == GARBLE:
+                            break
+                        index = index * 26 + c
+                    else:
+                        result += table[index]
+            return result
+
+        swaps = list(SWAPS)
+        for _ in range(max_passes):
+            rng.shuffle(swaps)
+            improved = False
+            for i, j in swaps:
+                a, b = letters[i], letters[j]
+                swapped = letters[:]
+                swapped[i], swapped[j] = b, a
+
+                # Positions whose ciphertext letter moves to a new level,
+                # then those whose output level now shows the other letter
+                moved = [(t, perms[t][j]) for t in by_cipher[a]]
+                moved.extend((t, perms[t][i]) for t in by_cipher[b])
+                moved_set = {t for t, _ in moved}
+                changes = [(positions[t], swapped[level])
+                           for t, level in moved]
+                changes.extend((positions[t], b) for t in by_out[i]
+                               if t not in moved_set)
+                changes.extend((positions[t], a) for t in by_out[j]
+                               if t not in moved_set)
+
+                ends = set()
+                for pos, _ in changes:
+                    ends.update(range(pos, min(pos + n, length)))
+                before = rescore(ends)
+                saved = [(pos, plain[pos]) for pos, _ in changes]
+                for pos, c in changes:
+                    plain[pos] = c
+                delta = rescore(ends) - before
+
+                if delta > 1e-9:
+                    for t, new in moved:
+                        by_out[out_level[t]].discard(t)
+                        by_out[new].add(t)
+                        out_level[t] = new
+                    letters = swapped
+                    inverse[a], inverse[b] = j, i
+                    total += delta
+                    improved = True
+                else:
+                    for pos, c in saved:
+                        plain[pos] = c
+            if not improved:
+                break
+
+        return Solution(total, ''.join(LETTERS[c] for c in letters))
+
+    def solve(self, restarts=100, jobs=1, top=5, seed=0):
+        """Runs restarts climbs from random alphabets, on a pool of jobs
+        worker processes if jobs is not 1 (0 means one per CPU), and returns
+        the top best distinct Solutions, best first.
+
+        """
+        seeds = [(seed, n) for n in range(restarts)]
+        if jobs == 1:
+            solutions = [self.climb(seed=str(s)) for s in seeds]
+        else:
+            with ProcessPoolExecutor(jobs or None) as executor:
+                solutions = list(executor.map(_climb,
+                        [(self, str(s)) for s in seeds]))
+
+        best = {}
+        for solution in solutions:
+            if solution.alphabet not in best:
+                best[solution.alphabet] = solution
+        return sorted(best.values(), reverse=True)[:top]
+
+
+def _climb(args):
+    solver, seed = args
+    return solver.climb(seed=seed)
+
+
+def main(argv=None):
+    """Entry point for the "purple plugboard" command."""
+
+    parser = argparse.ArgumentParser(prog='purple plugboard',
+            description=DESC, epilog=EPILOG)
+    parser.add_argument('input', metavar='FILE',
+        help='file to read the ciphertext from, - for stdin')
+    parser.add_argument('-s', '--switches', required=True,
+        help='switch settings of the message, e.g. 9-1,24,6-23')
+    parser.add_argument('-n', '--restarts', type=int, default=100,
+        metavar='N',
+        help='number of climbs from random alphabets [default: %(default)s]')
+    parser.add_argument('-k', '--top', type=int, default=5, metavar='N',
+        help='report the %(metavar)s best alphabets [default: %(default)s]')
+    parser.add_argument('-j', '--jobs', type=int, default=0, metavar='N',
+        help=('climb on %(metavar)s worker processes; a value of 0 means one '
+              'per CPU [default: %(default)s]'))
+    parser.add_argument('--ngrams', metavar='MODEL',
+        help=('score with the n-gram model in MODEL, built with "purple '
+              'ngrams" [default: English letter frequencies]'))
+    parser.add_argument('--seed', type=int, default=0,
+        help='random seed [default: %(default)s]')
+
+    args = parser.parse_args(args=argv)
+
+    if args.restarts < 1:
+        parser.error("The --restarts option must be 1 or greater")
+    if args.top < 1:
+        parser.error("The --top option must be 1 or greater")
+    if args.jobs < 0:
+        parser.error("The --jobs option must be 0 or greater")
+
+    try:
+        fp = sys.stdin if args.input == '-' else open(args.input, 'r')
+        with fp:
+            model = get_model(args.ngrams) if args.ngrams else ENGLISH
+            solver = PlugboardSolver(fp.read(), args.switches, model)
+        solutions = solver.solve(args.restarts, args.jobs, args.top,
+                                 args.seed)
+    except (Purple97Error, SteppingSwitchError, OSError) as ex:
+        raise SystemExit(str(ex))
+
+    for solution in solutions:
+        print('{:12.2f}  {}  {}'.format(solution.score, solution.alphabet,
+                solver.decrypt(solution.alphabet)[:40]))
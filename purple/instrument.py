@@ -0,0 +1,149 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains optional instrumentation for the PURPLE simulation.
+
+MachineStats counts the letters, garbles, and switch motions processed by a
+Purple97 (or CompiledPurple97) machine. It is enabled by attaching it to a
+machine:
+
+    stats = instrument.attach(purple)
+    purple.decrypt(ciphertext)
+    print(stats.as_dict())
+
+Nothing is counted per letter. Instead, encrypt() and decrypt() note the
+switch positions at the start of each call and hand them to MachineStats at
+the end, which derives the number of fast, middle, and slow switch motions in
+closed form (see purple.machine.motion_counts). A machine without stats
+attached only pays for a single attribute test per call.
+
+PhaseTimer splits the wall clock time of a run between named phases, such as
+the filter, cipher, and format phases of the purple command.
+
+"""
+from contextlib import contextmanager
+import time
+
+from purple.machine import motion_counts
+
+
+class MachineStats:
+    """Counters for the work done by a Purple97 machine."""
+
+    __slots__ = ('calls', 'letters', 'garbles', 'fast_steps', 'middle_steps',
+                 'slow_steps')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Sets all counters to zero."""
+        self.calls = 0
+        self.letters = 0
+        self.garbles = 0
+        self.fast_steps = 0
+        self.middle_steps = 0
+        self.slow_steps = 0
+
+    def record(self, start, motion, letters, garbles, steps=None):
+        """Records one call that processed letters letters, garbles of which
+        were garbles, starting from the switch positions start. motion is the
+        machine's (fast, middle, slow) switch numbers. steps is the number of
+        times the switches stepped, which defaults to letters.
+
+        """
+        if steps is None:
+            steps = letters
+        fast, middle, slow = motion_counts(start, motion[1], steps)
+        self.calls += 1
+        self.letters += letters
+        self.garbles += garbles
+        self.fast_steps += fast
+        self.middle_steps += middle
+        self.slow_steps += slow
+
+    def as_dict(self):
+        """Returns the counters as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def attach(purple, stats=None):
+    """Enables statistics on the machine purple and returns the MachineStats
+    instance that collects them. A new instance is created unless stats is
+    given, which allows several machines to share one.
+
+    """
+    if stats is None:
+        stats = MachineStats()
+    purple.stats = stats
+    return stats
+
+
+def detach(purple):
+    """Disables statistics on the machine purple."""
+    purple.stats = None
+
+
+class PhaseTimer:
+    """This class accumulates wall clock time spent in named phases.
+
+    Exactly one phase is current at a time; time is charged to it until
+    another phase is entered. Phases can be nested, and time spent in an inner
+    phase is not charged to the outer one. Time outside any explicit phase is
+    charged to the 'other' phase.
+
+    """
+    def __init__(self):
+        self.totals = {}
+        self.current = 'other'
+        self.last = self.start = time.perf_counter()
+
+    def _switch(self, phase):
+        """Charges the time since the last switch to the current phase and
+        makes phase current. The previous phase is returned.
+
+        """
+        now = time.perf_counter()
+        self.totals[self.current] = (self.totals.get(self.current, 0.0) +
+                                     now - self.last)
+        self.last = now
+        previous, self.current = self.current, phase
+        return previous
+
+    @contextmanager
+    def phase(self, name):
+        """A context manager that charges the time spent in its body to the
+        phase name.
+
+        """
+        previous = self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(previous)
+
+    def timed(self, name, iterable):
+        """A generator that yields the items of iterable, charging the time
+        spent producing each item to the phase name.
+
+        """
+        iterator = iter(iterable)
+        while True:
+            previous = self._switch(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._switch(previous)
+            yield item
+
+    def elapsed(self):
+        """Returns the wall clock time since the timer was created."""
+        return time.perf_counter() - self.start
+
+    def report(self):
+        """Returns a dictionary of the time spent in each phase so far."""
+        self._switch(self.current)
+        return dict(self.totals)
@@ -0,0 +1,339 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains the IsomorphIndex class, which finds isomorphs and
+candidate depths in a corpus of ciphertext messages, and the "purple
+isomorphs" command that runs it.
+
+Two stretches of text are isomorphs if they have the same pattern of repeated
+letters, e.g. QXRQM and BDABK. A pattern does not change when letters are
+relabeled. At each machine state the plugboard alphabet A conjugates the
+switch permutation S, giving the cipher A S A^-1, so relabeling the alphabet
+with a permutation P relabels the cipher the same way: under the alphabet P A,
+the plaintext P(p) enciphers to P(c). Stretches enciphered at the same machine
+states from plaintexts that are isomorphic under the same relabeling are
+therefore isomorphs, whatever the alphabets; repeated plaintext under the same
+key gives identical, and so isomorphic, ciphertext. Messages that share
+isomorphic windows at a consistent shift are candidates for being in depth.
+
+A pattern is written as the distance from each letter back to the previous
+occurrence of the same letter within the window, or 0 if there is none:
+
+    QXRQM  ->  0 0 0 3 0
+
+Every window of a fixed length is fingerprinted with a polynomial hash of its
+pattern. The hash is rolled along each message, updating only the term of the
+letter leaving the window and of the letter entering it, so fingerprinting is
+O(1) per letter. Windows with too few repeated letters say little and are
+skipped.
+
+To keep memory bounded however large the corpus, messages are streamed through
+the index and their fingerprints are written to partition files on disk,
+split by fingerprint. Matches are then found one partition at a time:
+
+    with IsomorphIndex() as index:
+        for text in messages:
+            index.add(text)
+        for depth in index.depths():
+            print(depth)
+
+"""
+import argparse
+from array import array
+from collections import Counter, namedtuple
+from itertools import combinations
+import os
+import shutil
+import sys
+import tempfile
+
+
+DESC = """Find isomorphs and candidate depths in ciphertext messages"""
+
+EPILOG = """\
+Each non-blank line of the input files is one message. Messages are named by
+file and line number in the output. Every window of the given length with
+enough repeated letters is fingerprinted by its pattern of repeats, so
+isomorphs are found whatever the plugboard alphabets of the messages.
+"""
+
+DEFAULT_WINDOW = 16
+DEFAULT_REPEATS = 4
+
+# Fingerprints are computed modulo a Mersenne prime:
+MODULUS = (1 << 61) - 1
+BASE = 0x5BD1E9955BD1E99
+
+# Fingerprint records buffered per partition before being written:
+BUFFER_SIZE = 8192
+
+Isomorph = namedtuple('Isomorph', 'first first_offset second second_offset')
+
+Depth = namedtuple('Depth', 'first second shift hits')
+
+
+def pattern(text):
+    """Returns the pattern of text as a tuple: for each letter, the distance
+    back to the previous occurrence of the same letter, or 0.
+
+    """
+    last = {}
+    result = []
+    for i, c in enumerate(text):
+        result.append(i - last[c] if c in last else 0)
+        last[c] = i
+    return tuple(result)
+
+
+def fingerprint(text):
+    """Returns the fingerprint of the pattern of text. This is the value
+    computed by fingerprints() for a window equal to text.
+
+    """
+    value = 0
+    for d in pattern(text):
+        value = (value * BASE + d) % MODULUS
+    return value
+
+
+def fingerprints(text, window=DEFAULT_WINDOW, min_repeats=DEFAULT_REPEATS):
+    """A generator yielding (offset, fingerprint) for each window of text
+    containing at least min_repeats repeated letters.
+
+    """
+    n = len(text)
+    if n < window:
+        return
+
+    # prev[i] is the distance back to the previous occurrence of text[i];
+    # nxt[i] is the position of the next occurrence, or n.
+    prev = [0] * n
+    nxt = [n] * n
+    last = {}
+    for i, c in enumerate(text):
+        j = last.get(c)
+        if j is not None:
+            prev[i] = i - j
+            nxt[j] = i
+        last[c] = i
+
+    # power[k] is the weight of the term k places from the end of the window
+    power = [1] * window
+    for k in range(1, window):
+        power[k] = power[k - 1] * BASE % MODULUS
+
+    value = repeats = 0
+    for d in prev[:window]:
+        value = (value * BASE + d) % MODULUS
+        repeats += d > 0
+
+    last_offset = n - window
+    for s in range(last_offset + 1):
+        if repeats >= min_repeats:
+            yield s, value
+        if s == last_offset:
+            break
+        # The next occurrence of text[s] loses its back reference
+        j = nxt[s]
+        if j < s + window:
+            value = (value - (j - s) * power[s + window - 1 - j]) % MODULUS
+            repeats -= 1
+        # Shift in the letter entering the window
+        d = prev[s + window]
+        if d >= window:
+            d = 0
+        value = (value * BASE + d) % MODULUS
+        repeats += d > 0
+
+
+class IsomorphIndex:
+    """A disk backed index of window fingerprints over a stream of
+    messages.
+
+    """
+    def __init__(self, window=DEFAULT_WINDOW, min_repeats=DEFAULT_REPEATS,
+            partitions=64, directory=None):
+        """Build an index of windows of window letters with at least
+        min_repeats repeated letters. Fingerprints are spread over partitions
+        files in a new temporary directory inside directory (by default the
+        system temporary directory), which close() removes. Memory use while
+        matching is proportional to the size of one partition.
+
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2 letters")
+        if not 1 <= partitions <= 4096:
+            raise ValueError("partitions must be between 1 and 4096")
+        self.window = window
+        self.min_repeats = min_repeats
+        self.partitions = partitions
+        self.directory = tempfile.mkdtemp(prefix='purple-iso-', dir=directory)
+        self.buffers = [array('Q') for _ in range(partitions)]
+        self.messages = 0
+        self.windows = 0
+
+    def close(self):
+        """Removes the index files."""
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _path(self, partition):
+        return os.path.join(self.directory, '{:04d}.bin'.format(partition))
+
+    def _flush(self, partition):
+        buffer = self.buffers[partition]
+        if buffer:
+            with open(self._path(partition), 'ab') as fp:
+                buffer.tofile(fp)
+            del buffer[:]
+
+    def add(self, text):
+        """Indexes the windows of one message and returns its message
+        number; messages are numbered from 0 in the order added. Whitespace
+        is ignored.
+
+        """
+        number = self.messages
+        if number >= 1 << 32:
+            raise OverflowError("too many messages for one index")
+        self.messages += 1
+        text = ''.join(text.split())
+
+        partitions = self.partitions
+        buffers = self.buffers
+        tag = number << 32
+        for offset, value in fingerprints(text, self.window,
+                                          self.min_repeats):
+            partition = value % partitions
+            buffer = buffers[partition]
+            buffer.append(value)
+            buffer.append(tag | offset)
+            if len(buffer) >= BUFFER_SIZE:
+                self._flush(partition)
+            self.windows += 1
+        return number
+
+    def isomorphs(self, max_group=64):
+        """A generator yielding an Isomorph for each pair of windows with the
+        same fingerprint, with the first window always from the earlier
+        message (or earlier in the same message). Fingerprints shared by more
+        than max_group windows, such as those of stereotyped padding, are
+        skipped as uninformative.
+
+        """
+        for partition in range(self.partitions):
+            self._flush(partition)
+        for partition in range(self.partitions):
+            records = array('Q')
+            try:
+                with open(self._path(partition), 'rb') as fp:
+                    records.frombytes(fp.read())
+            except FileNotFoundError:
+                continue
+            entries = sorted(zip(records[0::2], records[1::2]))
+            del records
+
+            start = 0
+            n = len(entries)
+            while start < n:
+                value = entries[start][0]
+                end = start + 1
+                while end < n and entries[end][0] == value:
+                    end += 1
+                if 1 < end - start <= max_group:
+                    for (_, a), (_, b) in combinations(entries[start:end], 2):
+                        yield Isomorph(a >> 32, a & 0xFFFFFFFF,
+                                       b >> 32, b & 0xFFFFFFFF)
+                start = end
+
+    def depths(self, min_hits=2, max_group=64):
+        """Returns a list of Depth tuples for each pair of messages sharing at
+        least min_hits isomorphic windows at the same shift, most hits first.
+        shift is first_offset - second_offset: letter i of the second message
+        lines up with letter i + shift of the first.
+
+        """
+        votes = Counter()
+        for iso in self.isomorphs(max_group):
+            if iso.first != iso.second:
+                votes[(iso.first, iso.second,
+                       iso.first_offset - iso.second_offset)] += 1
+        result = [Depth(first, second, shift, hits)
+                  for (first, second, shift), hits in votes.items()
+                  if hits >= min_hits]
+        result.sort(key=lambda depth: (-depth.hits, depth.first,
+                                       depth.second, depth.shift))
+        return result
+
+
+def read_messages(paths):
+    """A generator yielding (name, text) for each non-blank line of the files
+    in paths, where name is "path:line".
+
+    """
+    for path in paths:
+        with open(path, 'r') as fp:
+            for line, text in enumerate(fp, 1):
+                if text.strip():
+                    yield '{}:{}'.format(path, line), text
+
+
+def main(argv=None):
+    """Entry point for the "purple isomorphs" command."""
+
+    parser = argparse.ArgumentParser(prog='purple isomorphs',
+            description=DESC, epilog=EPILOG)
+    parser.add_argument('files', nargs='+', metavar='FILE',
+        help='ciphertext files, one message per line')
+    parser.add_argument('-w', '--window', type=int, default=DEFAULT_WINDOW,
+        metavar='N', help='window length in letters [default: %(default)s]')
+    parser.add_argument('-r', '--repeats', type=int, default=DEFAULT_REPEATS,
+        metavar='N', help=('skip windows with fewer than %(metavar)s repeated '
+                           'letters [default: %(default)s]'))
+    parser.add_argument('-m', '--min-hits', type=int, default=2, metavar='N',
+        help=('report message pairs with at least %(metavar)s isomorphic '
+              'windows at the same shift [default: %(default)s]'))
+    parser.add_argument('-i', '--isomorphs', action='store_true',
+        help='list every isomorphic window pair instead of depths')
+    parser.add_argument('-t', '--tmpdir',
+        help='directory for the temporary index files')
+
+    args = parser.parse_args(args=argv)
+
+    if args.window < 2:
+        parser.error("The --window option must be 2 or greater")
+    if args.repeats < 0:
+        parser.error("The --repeats option must be 0 or greater")
+    if args.min_hits < 1:
+        parser.error("The --min-hits option must be 1 or greater")
+
+    names = []
+    try:
+        with IsomorphIndex(args.window, args.repeats,
+                           directory=args.tmpdir) as index:
+            for name, text in read_messages(args.files):
+                names.append(name)
+                index.add(text)
+
+            if args.isomorphs:
+                for iso in index.isomorphs():
+                    print('{}+{}\t{}+{}'.format(names[iso.first],
+                            iso.first_offset, names[iso.second],
+                            iso.second_offset))
+            else:
+                for depth in index.depths(args.min_hits):
+                    print('{}\t{}\tshift {}\t{} hits'.format(
+                            names[depth.first], names[depth.second],
+                            depth.shift, depth.hits))
+    except (OSError, UnicodeDecodeError) as ex:
+        raise SystemExit(str(ex))
+    print('{} messages, {} windows indexed'.format(index.messages,
+            index.windows), file=sys.stderr)
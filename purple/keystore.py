@@ -0,0 +1,342 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains the KeyStore class, a local SQLite database of named
+key sheet settings, and the "purple keys" command that manages it.
+
+Each key is stored under a name, such as a date ("1941-12-07") or a message
+indicator, together with its switches and alphabet in the usual notation (see
+Purple97.from_key_sheet) and the parsed switch positions and motion order.
+Keys are validated once, when they are added; machines are then built straight
+from the stored settings. Names are the table's primary key, so each lookup is
+an O(log n) B-tree search.
+
+    store = KeyStore('keys.db')
+    store.add('1941-12-07', '9-1,24,6-23', 'NOKTYUXEQLHBRMPDICJASVWGZF')
+    purple = store.machine('1941-12-07')
+
+"purple batch --keystore keys.db" decrypts a manifest whose entries name
+their key with a "key" field.
+
+"""
+import argparse
+from collections import namedtuple
+import csv
+import json
+import pathlib
+import sqlite3
+import sys
+
+from purple.compiled import CompiledPurple97
+from purple.machine import (Purple97, Purple97Error, parse_key_sheet,
+        validate_alphabet)
+from purple.switch import SteppingSwitchError
+
+
+DESC = """Manage a PURPLE key sheet store"""
+
+EPILOG = """\
+Keys are imported from a CSV file with name, switches and alphabet columns, or
+from a JSON Lines file of objects with the same fields.
+"""
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """\
+CREATE TABLE IF NOT EXISTS key_sheet (
+    name TEXT PRIMARY KEY,
+    switches TEXT NOT NULL,
+    alphabet TEXT NOT NULL,
+    sixes INTEGER NOT NULL,
+    twenties_1 INTEGER NOT NULL,
+    twenties_2 INTEGER NOT NULL,
+    twenties_3 INTEGER NOT NULL,
+    fast_switch INTEGER NOT NULL,
+    middle_switch INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+COLUMNS = ('name, switches, alphabet, sixes, twenties_1, twenties_2, '
+           'twenties_3, fast_switch, middle_switch')
+
+# SQLite limits the number of parameters in one statement:
+BATCH_SIZE = 500
+
+
+class KeyStoreError(Purple97Error):
+    """Exception class for key store errors"""
+
+
+KeyRecord = namedtuple('KeyRecord',
+        'name switches alphabet switches_pos fast_switch middle_switch')
+
+
+def make_record(name, switches, alphabet=None):
+    """Validates a key and returns its KeyRecord. A Purple97Error or
+    SteppingSwitchError is raised for invalid settings.
+
+    """
+    switches_pos, fast_switch, middle_switch = parse_key_sheet(switches)
+    if alphabet is None:
+        alphabet = Purple97.STRAIGHT_PLUGBOARD
+    alphabet = validate_alphabet(alphabet)
+    return KeyRecord(name, switches, alphabet, switches_pos, fast_switch,
+                     middle_switch)
+
+
+def _from_row(row):
+    name, switches, alphabet, sixes, t1, t2, t3, fast, middle = row
+    return KeyRecord(name, switches, alphabet, (sixes, t1, t2, t3), fast,
+                     middle)
+
+
+def _to_row(record):
+    return ((record.name, record.switches, record.alphabet) +
+            tuple(record.switches_pos) +
+            (record.fast_switch, record.middle_switch))
+
+
+class KeyStore:
+    """A SQLite backed store of validated key sheet settings."""
+
+    def __init__(self, path, readonly=False):
+        """Opens the key store at path, creating it unless readonly is
+        true. A KeyStoreError is raised if the file cannot be opened or is not
+        a key store.
+
+        """
+        try:
+            if readonly:
+                # A file: URI quotes characters such as '?' and '#' in the
+                # path, which would otherwise end it
+                uri = pathlib.Path(path).resolve().as_uri() + '?mode=ro'
+                self.db = sqlite3.connect(uri, uri=True)
+            else:
+                self.db = sqlite3.connect(path)
+                with self.db:
+                    self.db.execute(SCHEMA)
+                    if self._version() == 0:
+                        self.db.execute('PRAGMA user_version = {}'.format(
+                                SCHEMA_VERSION))
+            if self._version() != SCHEMA_VERSION:
+                raise KeyStoreError('{}: unsupported key store version'.format(
+                        path))
+        except sqlite3.Error as ex:
+            raise KeyStoreError('{}: {}'.format(path, ex))
+        self.cache = {}
+
+    def _version(self):
+        return self.db.execute('PRAGMA user_version').fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM key_sheet').fetchone()[0]
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def add(self, name, switches, alphabet=None):
+        """Validates and stores a key under name, replacing any key with the
+        same name. The KeyRecord is returned.
+
+        """
+        record = make_record(name, switches, alphabet)
+        with self.db:
+            self._insert([record])
+        return record
+
+    def add_many(self, keys):
+        """Validates and stores an iterable of (name, switches, alphabet)
+        tuples in a single transaction. If any key is invalid, nothing is
+        stored and a Purple97Error or SteppingSwitchError naming the key is
+        raised. The number of keys stored is returned.
+
+        """
+        records = []
+        for name, switches, alphabet in keys:
+            try:
+                records.append(make_record(name, switches, alphabet))
+            except (Purple97Error, SteppingSwitchError) as ex:
+                raise type(ex)('{}: {}'.format(name, ex))
+            except (TypeError, AttributeError):
+                # Settings that are not strings, e.g. numbers from JSON
+                raise KeyStoreError('{}: switches and alphabet must be '
+                                    'strings'.format(name))
+        with self.db:
+            self._insert(records)
+        return len(records)
+
+    def _insert(self, records):
+        self.db.executemany(
+                'INSERT OR REPLACE INTO key_sheet ({}) VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?)'.format(COLUMNS),
+                [_to_row(record) for record in records])
+        for record in records:
+            self.cache.pop(record.name, None)
+
+    def remove(self, name):
+        """Removes the key stored under name; returns True if there was
+        one.
+
+        """
+        with self.db:
+            cursor = self.db.execute('DELETE FROM key_sheet WHERE name = ?',
+                                     (name,))
+        self.cache.pop(name, None)
+        return cursor.rowcount > 0
+
+    def get(self, name):
+        """Returns the KeyRecord stored under name, or None. Records are
+        cached, so looking up the same key again does not query the database.
+
+        """
+        record = self.cache.get(name)
+        if record is None:
+            row = self.db.execute(
+                    'SELECT {} FROM key_sheet WHERE name = ?'.format(COLUMNS),
+                    (name,)).fetchone()
+            if row is None:
+                return None
+            record = self.cache[name] = _from_row(row)
+        return record
+
+    def get_many(self, names):
+        """Looks up many keys at once and returns a dictionary mapping each
+        name that was found to its KeyRecord.
+
+        """
+        found = {}
+        missing = []
+        for name in set(names):
+            record = self.cache.get(name)
+            if record is None:
+                missing.append(name)
+            else:
+                found[name] = record
+
+        for i in range(0, len(missing), BATCH_SIZE):
+            batch = missing[i:i + BATCH_SIZE]
+            rows = self.db.execute(
+                    'SELECT {} FROM key_sheet WHERE name IN ({})'.format(
+                            COLUMNS, ', '.join('?' * len(batch))), batch)
+            for row in rows:
+                record = self.cache[row[0]] = _from_row(row)
+                found[record.name] = record
+        return found
+
+    def names(self, prefix=''):
+        """A generator yielding the stored key names in order, optionally only
+        those starting with prefix (e.g. '1941-12').
+
+        """
+        rows = self.db.execute(
+                "SELECT name FROM key_sheet WHERE name >= ? ORDER BY name",
+                (prefix,))
+        for (name,) in rows:
+            if not name.startswith(prefix):
+                break
+            yield name
+
+    def machine(self, name, machine_class=CompiledPurple97):
+        """Builds a machine of machine_class set to the key stored under name.
+        A KeyStoreError is raised if there is no such key.
+
+        """
+        record = self.get(name)
+        if record is None:
+            raise KeyStoreError('unknown key {!r}'.format(name))
+        return machine_class(record.switches_pos, record.fast_switch,
+                             record.middle_switch, record.alphabet)
+
+
+def read_keys(path):
+    """A generator yielding (name, switches, alphabet) tuples from a CSV or
+    JSON Lines key file. The alphabet may be None.
+
+    """
+    with open(path, 'r', newline='') as fp:
+        if path.lower().endswith(('.jsonl', '.json')):
+            for line, text in enumerate(fp, 1):
+                text = text.strip()
+                if not text or text.startswith('#'):
+                    continue
+                try:
+                    row = json.loads(text)
+                except ValueError as ex:
+                    raise KeyStoreError('{}:{}: {}'.format(path, line, ex))
+                yield _key_fields(path, line, row)
+        else:
+            reader = csv.DictReader(fp)
+            for row in reader:
+                yield _key_fields(path, reader.line_num, row)
+
+
+def _key_fields(path, line, row):
+    if not isinstance(row, dict) or not row.get('name') or \
+            not row.get('switches'):
+        raise KeyStoreError('{}:{}: name and switches are required'.format(
+                path, line))
+    for field in ('name', 'switches', 'alphabet'):
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            raise KeyStoreError('{}:{}: {} must be a string, not {!r}'.format(
+                    path, line, field, value))
+    return row['name'], row['switches'], row.get('alphabet') or None
+
+
+def main(argv=None):
+    """Entry point for the "purple keys" command."""
+
+    parser = argparse.ArgumentParser(prog='purple keys', description=DESC,
+            epilog=EPILOG)
+    parser.add_argument('store', help='key store database file')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+
+    add = commands.add_parser('add', help='add or replace one key')
+    add.add_argument('name', help='key name, e.g. a date or indicator')
+    add.add_argument('switches', help='switch settings, e.g. 9-1,24,6-23')
+    add.add_argument('alphabet', nargs='?', help='plugboard alphabet')
+
+    load = commands.add_parser('import',
+            help='add or replace keys from CSV or JSON Lines files')
+    load.add_argument('files', nargs='+', metavar='FILE')
+
+    show = commands.add_parser('list', help='list keys')
+    show.add_argument('prefix', nargs='?', default='',
+            help='only list keys whose names start with PREFIX')
+
+    remove = commands.add_parser('remove', help='remove keys')
+    remove.add_argument('names', nargs='+', metavar='NAME')
+
+    args = parser.parse_args(args=argv)
+
+    try:
+        with KeyStore(args.store, readonly=args.command == 'list') as store:
+            if args.command == 'add':
+                store.add(args.name, args.switches, args.alphabet)
+            elif args.command == 'import':
+                for path in args.files:
+                    count = store.add_many(read_keys(path))
+                    print('{}: {} keys imported'.format(path, count),
+                          file=sys.stderr)
+            elif args.command == 'list':
+                for name in store.names(args.prefix):
+                    record = store.get(name)
+                    print('{}\t{}\t{}'.format(name, record.switches,
+                                              record.alphabet))
+            else:
+                for name in args.names:
+                    if not store.remove(name):
+                        print('{}: no such key'.format(name), file=sys.stderr)
+    except (Purple97Error, SteppingSwitchError, OSError) as ex:
+        raise SystemExit(str(ex))
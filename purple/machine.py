@@ -14,9 +14,10 @@ The paper is also available at:
 https://cryptocellar.org/simula/purple/index.html
 
 """
-from collections import Counter
+from functools import lru_cache
 import string
 
+import purple.fused as fused_tables
 import purple.switch as switch
 
 
@@ -32,8 +33,12 @@ class Purple97:
     VALID_KEYS = set(string.ascii_uppercase)
     STRAIGHT_PLUGBOARD = 'AEIOUYBCDFGHJKLMNPQRSTVWXZ'
 
+    __slots__ = ('sixes', 'twenties', 'fast_switch', 'middle_switch',
+                 'slow_switch', 'motion', 'alphabet', 'plugboard',
+                 'initial_state', 'fused', 'stats')
+
     def __init__(self, switches_pos=None, fast_switch=1, middle_switch=2,
-            alphabet=None):
+            alphabet=None, fused=None):
         """Build a PURPLE (Cipher Machine 97) instance. Initial settings can be
         optionally supplied.
 
@@ -65,6 +70,12 @@ class Purple97:
         All 26 distinct letters must be present or else a Purple97Error
         exception will be raised.
 
+        fused: if not None, the three twenties switch lookups for each letter
+        are replaced by a single lookup in a fused table; see purple.fused.
+        The only mode is 'full', which precomputes the table for every
+        position triple (625 KB shared per process). The output is identical
+        either way.
+
         """
         # If no switch positions are supplied, default to all 0's
         if switches_pos is None:
@@ -87,49 +98,35 @@ class Purple97:
         ]
 
         # Validate fast & middle switch parameters
-        if not (1 <= fast_switch <= 3):
-            raise Purple97Error("fast_switch out of range (1-3)")
-        if not (1 <= middle_switch <= 3):
-            raise Purple97Error("middle_switch out of range (1-3)")
-        if fast_switch == middle_switch:
-            raise Purple97Error("fast & middle switches cannot be the same")
+        _validate_motion(fast_switch, middle_switch)
 
         # Store references to the fast, middle, and slow switches
-        self.fast_switch = self.twenties[fast_switch - 1]
-        self.middle_switch = self.twenties[middle_switch - 1]
-
-        # Pick the remaining switch as the slow switch
-        switches = [1, 2, 3]
-        switches.remove(fast_switch)
-        switches.remove(middle_switch)
-        self.slow_switch = self.twenties[switches[0] - 1]
+        self._set_motion(fast_switch, middle_switch)
 
         # Validate the alphabet
         if alphabet is None:
             alphabet = self.STRAIGHT_PLUGBOARD
+        alphabet = validate_alphabet(alphabet)
 
-        if len(alphabet) != 26:
-            raise Purple97Error("invalid alphabet length")
-        alphabet = alphabet.upper()
-
-        # Count valid letters
-        ctr = Counter(string.ascii_uppercase)
-        for c in alphabet:
-            if c in ctr:
-                ctr[c] += 1
+        self.alphabet = alphabet
+        self.plugboard = _build_plugboard(alphabet)
 
-        # At this point if alphabet is legal, all keys in ctr must have a value
-        # of 2. If any are 1, then alphabet was missing some letters. If any are
-        # greater than 2, we had duplicate letters.
+        if fused is None:
+            self.fused = None
+        else:
+            try:
+                self.fused = fused_tables.get_table(fused)
+            except ValueError:
+                raise Purple97Error("invalid fused table mode")
 
-        if not all(v == 2 for v in ctr.values()):
-            raise Purple97Error("invalid alphabet")
+        # Optional instrumentation; see purple.instrument
+        self.stats = None
 
-        self.alphabet = alphabet
-        self.plugboard = {c : n for n, c in enumerate(alphabet)}
+        # Remember where we started so we can seek relative to it later
+        self.initial_state = self.get_state()
 
     @classmethod
-    def from_key_sheet(cls, switches, alphabet=None):
+    def from_key_sheet(cls, switches, alphabet=None, fused=None):
         """This class method allows one to construct a Purple97 using
         a shorthand notation used by US codebreakers.
 
@@ -148,30 +145,54 @@ class Purple97:
 
         alphabet: the daily alphabet, same format as in the __init__ function
 
+        fused: the fused table mode, as in the __init__ function
+
         """
-        try:
-            sixes, twenties, speed = switches.split('-')
-        except ValueError:
-            raise Purple97Error('invalid switches string (-)')
+        switches_pos, fast_switch, middle_switch = parse_key_sheet(switches)
+        return cls(switches_pos, fast_switch, middle_switch, alphabet, fused)
 
-        twenties = twenties.split(',')
-        if len(twenties) != 3:
-            raise Purple97Error('invalid twenties position')
+    def rekey(self, switches, alphabet=None):
+        """Changes the key of this machine in place, as if it had been built
+        with from_key_sheet(switches, alphabet). The existing switch objects
+        are reused, and parsed key sheets and validated alphabets are cached,
+        so rekeying with a previously seen key allocates nothing. Errors are
+        raised as in from_key_sheet(), before the machine is changed.
 
-        try:
-            switches_pos = [int(s) - 1 for s in [sixes] + twenties]
-        except ValueError:
-            raise Purple97Error('switch positions must be numeric')
+        """
+        switches_pos, fast_switch, middle_switch = parse_key_sheet(switches)
+        if alphabet is None:
+            alphabet = self.STRAIGHT_PLUGBOARD
+        alphabet = validate_alphabet(alphabet)
 
-        if len(speed) != 2:
-            raise Purple97Error('invalid switch speed settings')
+        self.sixes.pos = switches_pos[0]
+        self.twenties[0].pos = switches_pos[1]
+        self.twenties[1].pos = switches_pos[2]
+        self.twenties[2].pos = switches_pos[3]
+        self._set_motion(fast_switch, middle_switch)
+        self.alphabet = alphabet
+        self.plugboard = _build_plugboard(alphabet)
+        self.initial_state = switches_pos
 
-        try:
-            fast_switch, middle_switch = int(speed[0]), int(speed[1])
-        except ValueError:
-            raise Purple97Error('switch speed settings must be numeric')
+    def reset(self):
+        """Returns the switches to the positions the machine was built or
+        last rekeyed with.
 
-        return cls(switches_pos, fast_switch, middle_switch, alphabet)
+        """
+        state = self.initial_state
+        self.sixes.pos = state[0]
+        self.twenties[0].pos = state[1]
+        self.twenties[1].pos = state[2]
+        self.twenties[2].pos = state[3]
+
+    def _set_motion(self, fast_switch, middle_switch):
+        """Assigns the fast, middle, and slow roles to the twenties switches.
+        The switch numbers must already be validated.
+
+        """
+        self.motion = _MOTIONS[fast_switch, middle_switch]
+        self.fast_switch = self.twenties[fast_switch - 1]
+        self.middle_switch = self.twenties[middle_switch - 1]
+        self.slow_switch = self.twenties[self.motion[2] - 1]
 
     def decrypt(self, ciphertext):
         """Decrypts the given ciphertext message and returns the plaintext
@@ -183,13 +204,16 @@ class Purple97:
         the machine is stepped.
 
         """
+        if self.stats is not None:
+            start = self.get_state()
+
         plaintext = []
         for i, c in enumerate(ciphertext):
 
             # Process a garble:
             if c == '-':
                 plaintext.append('-')
-                self.step()
+                self._step()
                 continue
 
             if c not in self.VALID_KEYS:
@@ -203,16 +227,24 @@ class Purple97:
             else:
                 # This input goes to the chain of twenties switches
                 n -= 6
-                x = self.twenties[0].decrypt(self.twenties[1].decrypt(
-                        self.twenties[2].decrypt(n)))
+                if self.fused is None:
+                    x = self.twenties[0].decrypt(self.twenties[1].decrypt(
+                            self.twenties[2].decrypt(n)))
+                else:
+                    t1, t2, t3 = self.twenties
+                    x = self.fused.decrypt(t1.pos, t2.pos, t3.pos, n)
                 x += 6
 
             plaintext.append(self.alphabet[x])
 
             # Now step the switches.
-            self.step()
+            self._step()
 
-        return ''.join(plaintext)
+        plaintext = ''.join(plaintext)
+        if self.stats is not None:
+            self.stats.record(start, self.motion, len(plaintext),
+                    plaintext.count('-'))
+        return plaintext
 
     def encrypt(self, plaintext):
         """Encrypts the given plaintext message and returns the ciphertext
@@ -222,6 +254,9 @@ class Purple97:
         exception is raised.
 
         """
+        if self.stats is not None:
+            start = self.get_state()
+
         ciphertext = []
         for c in plaintext:
             if c not in self.VALID_KEYS:
@@ -235,19 +270,90 @@ class Purple97:
                 # This input goes to the chain of twenties switches in reverse
                 # order compared to decrypt.
                 n -= 6
-                x = self.twenties[2].encrypt(self.twenties[1].encrypt(
-                        self.twenties[0].encrypt(n)))
+                if self.fused is None:
+                    x = self.twenties[2].encrypt(self.twenties[1].encrypt(
+                            self.twenties[0].encrypt(n)))
+                else:
+                    t1, t2, t3 = self.twenties
+                    x = self.fused.encrypt(t1.pos, t2.pos, t3.pos, n)
                 x += 6
 
             ciphertext.append(self.alphabet[x])
 
             # Now step the switches.
-            self.step()
+            self._step()
+
+        ciphertext = ''.join(ciphertext)
+        if self.stats is not None:
+            self.stats.record(start, self.motion, len(ciphertext), 0)
+        return ciphertext
 
-        return ''.join(ciphertext)
+    def encryptor(self):
+        """Returns a Purple97Stream that encrypts a message a chunk at a time
+        using this machine. See Purple97Stream.
+
+        """
+        return Purple97Stream(self.encrypt)
+
+    def decryptor(self):
+        """Returns a Purple97Stream that decrypts a message a chunk at a time
+        using this machine. See Purple97Stream.
+
+        """
+        return Purple97Stream(self.decrypt)
+
+    def get_state(self):
+        """Returns the current switch positions as a 4-tuple of 0-based
+        integers: the sixes position followed by the positions of twenties
+        switches 1 through 3.
+
+        """
+        return (self.sixes.pos, self.twenties[0].pos, self.twenties[1].pos,
+                self.twenties[2].pos)
+
+    def set_state(self, state):
+        """Sets the switch positions from a 4-tuple as returned by
+        get_state(). A SteppingSwitchError is raised if any position is out of
+        range.
+
+        """
+        if len(state) != 4:
+            raise Purple97Error("state must have length of 4")
+        self.sixes.set_pos(state[0])
+        for sw, pos in zip(self.twenties, state[1:]):
+            sw.set_pos(pos)
+
+    def advance(self, n):
+        """Steps the switches as if n letters had been processed. This is
+        equivalent to calling step() n times but takes constant time.
+
+        """
+        self.set_state(advance_positions(self.get_state(), self.motion[0],
+                self.motion[1], n))
+
+    def seek(self, n):
+        """Positions the switches as if n letters had been processed since
+        the machine was constructed with its initial settings.
+
+        """
+        self.set_state(advance_positions(self.initial_state, self.motion[0],
+                self.motion[1], n))
 
     def step(self):
         """Step the stepping switches."""
+        if self.stats is None:
+            self._step()
+        else:
+            start = self.get_state()
+            self._step()
+            self.stats.record(start, self.motion, 0, 0, 1)
+
+    def _step(self):
+        """Steps the switches without recording statistics. encrypt() and
+        decrypt() call this for every letter and record their statistics once
+        per call instead.
+
+        """
         # First read the sixes and middle switch
         # positions before stepping anything. Use these latched values in
         # the decision processes for stepping a twenties. This is crucial!
@@ -275,3 +381,195 @@ class Purple97:
             self.middle_switch.step()
         else:
             self.fast_switch.step()
+
+
+class Purple97Stream:
+    """This class incrementally encrypts or decrypts a message that is supplied
+    in chunks. It is returned by Purple97.encryptor() and Purple97.decryptor().
+
+    The switch state lives in the machine, so it carries over from one chunk to
+    the next; the output of a series of update() calls is identical to
+    processing the concatenated chunks in a single call. Only one chunk is held
+    in memory at a time.
+
+    """
+    __slots__ = ('action', 'count', 'finalized')
+
+    def __init__(self, action):
+        """Build a stream around action, which must be the bound encrypt or
+        decrypt method of a Purple97 instance.
+
+        """
+        self.action = action
+        self.count = 0
+        self.finalized = False
+
+    def update(self, chunk):
+        """Processes the next chunk of input text and returns the output for
+        it. A Purple97Error is raised if the stream has been finalized or if
+        the chunk contains invalid input.
+
+        """
+        if self.finalized:
+            raise Purple97Error("update() called after finalize()")
+        output = self.action(chunk)
+        self.count += len(output)
+        return output
+
+    def finalize(self):
+        """Ends the stream and returns any remaining output. PURPLE enciphers
+        letter for letter so there is never buffered output and this always
+        returns an empty string; it exists so streams can be used like other
+        incremental cipher interfaces.
+
+        """
+        self.finalized = True
+        return ''
+
+
+# The (fast, middle, slow) motion tuple for each valid (fast, middle) pair:
+_MOTIONS = {(f, m): (f, m, 6 - f - m)
+            for f in (1, 2, 3) for m in (1, 2, 3) if f != m}
+
+
+@lru_cache(maxsize=1024)
+def parse_key_sheet(switches):
+    """Parses and validates a switches string in the key sheet notation
+    described in Purple97.from_key_sheet. A 3-tuple is returned:
+
+        (switches_pos, fast_switch, middle_switch)
+
+    where switches_pos is a 4-tuple of 0-based positions. A Purple97Error is
+    raised if the string is malformed, or a SteppingSwitchError if a position
+    is out of range. Results are cached, so they must not be modified.
+
+    """
+    try:
+        sixes, twenties, speed = switches.split('-')
+    except ValueError:
+        raise Purple97Error('invalid switches string (-)')
+
+    twenties = twenties.split(',')
+    if len(twenties) != 3:
+        raise Purple97Error('invalid twenties position')
+
+    try:
+        switches_pos = tuple(int(s) - 1 for s in [sixes] + twenties)
+    except ValueError:
+        raise Purple97Error('switch positions must be numeric')
+
+    if len(speed) != 2:
+        raise Purple97Error('invalid switch speed settings')
+
+    try:
+        fast_switch, middle_switch = int(speed[0]), int(speed[1])
+    except ValueError:
+        raise Purple97Error('switch speed settings must be numeric')
+
+    if not all(0 <= pos < 25 for pos in switches_pos):
+        raise switch.SteppingSwitchError("Illegal switch position")
+    _validate_motion(fast_switch, middle_switch)
+
+    return switches_pos, fast_switch, middle_switch
+
+
+def _validate_motion(fast_switch, middle_switch):
+    """Raises a Purple97Error if the fast and middle switch numbers are not
+    valid.
+
+    """
+    if not (1 <= fast_switch <= 3):
+        raise Purple97Error("fast_switch out of range (1-3)")
+    if not (1 <= middle_switch <= 3):
+        raise Purple97Error("middle_switch out of range (1-3)")
+    if fast_switch == middle_switch:
+        raise Purple97Error("fast & middle switches cannot be the same")
+
+
+@lru_cache(maxsize=256)
+def validate_alphabet(alphabet):
+    """Returns the uppercase form of alphabet, raising a Purple97Error unless
+    it contains all 26 letters exactly once. Results are cached.
+
+    """
+    if len(alphabet) != 26:
+        raise Purple97Error("invalid alphabet length")
+    alphabet = alphabet.upper()
+    if set(alphabet) != Purple97.VALID_KEYS:
+        raise Purple97Error("invalid alphabet")
+    return alphabet
+
+
+@lru_cache(maxsize=256)
+def _build_plugboard(alphabet):
+    """Returns the plugboard mapping of letter to input level for a validated
+    alphabet. Machines with the same alphabet share the same dictionary, which
+    must therefore never be modified.
+
+    """
+    return {c : n for n, c in enumerate(alphabet)}
+
+
+def _count_visits(start, target, n):
+    """Returns how many of the n positions start, start + 1, ... start + n - 1
+    (modulo 25) are equal to target.
+
+    """
+    first = (target - start) % 25
+    return 0 if n <= first else (n - 1 - first) // 25 + 1
+
+
+def advance_positions(switches_pos, fast_switch, middle_switch, n):
+    """Computes the switch positions after n letters have been processed,
+    without stepping a machine. This is a pure function of the starting
+    positions and the motion order and runs in constant time.
+
+    switches_pos is a 4-element sequence of 0-based positions as described in
+    Purple97.__init__. fast_switch and middle_switch name the twenties
+    switches (1-3) as in Purple97.__init__. A 4-tuple of the new positions is
+    returned.
+
+    The derivation follows from the rules in Purple97.step(). During n letters
+    the sixes steps n times. The middle switch steps each time the latched
+    sixes position is 24. The slow switch steps each time the latched sixes
+    position is 23 while the middle switch is at 24; as the middle switch only
+    moves on the letter after each of these sixes positions, its position at
+    the j-th such letter is known in closed form. The fast switch takes all
+    remaining steps.
+
+    """
+    sixes_pos = switches_pos[0]
+    twenties_pos = list(switches_pos[1:])
+    slow_switch = 6 - fast_switch - middle_switch
+    fast_steps, middle_steps, slow_steps = motion_counts(switches_pos,
+            middle_switch, n)
+
+    for sw, steps in ((fast_switch, fast_steps),
+                      (middle_switch, middle_steps),
+                      (slow_switch, slow_steps)):
+        twenties_pos[sw - 1] = (twenties_pos[sw - 1] + steps) % 25
+
+    return ((sixes_pos + n) % 25,) + tuple(twenties_pos)
+
+
+def motion_counts(switches_pos, middle_switch, n):
+    """Returns how many times the fast, middle, and slow switches step while n
+    letters are processed from the starting positions switches_pos, as a
+    3-tuple. See advance_positions() for the arguments and the derivation.
+
+    """
+    if n < 0:
+        raise Purple97Error("cannot advance a negative number of letters")
+
+    sixes_pos = switches_pos[0]
+    middle_pos = switches_pos[middle_switch]
+
+    middle_steps = _count_visits(sixes_pos, 24, n)
+    sixes_23 = _count_visits(sixes_pos, 23, n)
+
+    # The middle switch steps before the first sixes 23 only when we start
+    # from sixes position 24.
+    first = (24 - middle_pos - (1 if sixes_pos == 24 else 0)) % 25
+    slow_steps = 0 if sixes_23 <= first else (sixes_23 - 1 - first) // 25 + 1
+
+    return n - middle_steps - slow_steps, middle_steps, slow_steps
@@ -5,7 +5,11 @@
 """This file contains the main routine for the command-line purple97 program."""
 
 import argparse
+import bisect
+import importlib
+import itertools
 import os
+import re
 import string
 import sys
 import textwrap
@@ -17,16 +21,49 @@ from purple.switch import SteppingSwitchError
 DESC = """PURPLE cipher machine simulator"""
 
 EPILOG = """\
-Supply either -e or -d, but not both, to perform either an encrypt or decrypt. If
-the -s option is not supplied, the value of the environment variable
+Supply either -e or -d, but not both, to perform either an encrypt or decrypt.
+If the -s option is not supplied, the value of the environment variable
 PURPLE97_SWITCHES will be used. If the -a option is not supplied, the value of
 the environment variable PURPLE97_ALPHABET will be used. Input text is supplied
 either by the -t or by the -f options, but not both.
+
+Other commands (see "purple COMMAND -h"):
+  batch      process many messages listed in a manifest file
+  serve      run a TCP encrypt/decrypt service
+  keys       manage a store of named key sheet settings
+  stats      report ciphertext letter statistics
+  isomorphs  find isomorphs and messages in depth
+  search     search for the twenties settings of a message
+  plugboard  recover the plugboard alphabet of a message
+  crib       find the plugboard alphabets consistent with a crib
+  motion     estimate the sixes position and motion order of a message
+  ngrams     build an n-gram language model for the solvers
 """
 
+# The module implementing each command, whose main() is given the rest of
+# the command line:
+SUBCOMMANDS = {
+    'batch': 'purple.manifest',
+    'serve': 'purple.service',
+    'keys': 'purple.keystore',
+    'stats': 'purple.textstats',
+    'isomorphs': 'purple.isomorph',
+    'search': 'purple.search',
+    'plugboard': 'purple.hillclimb',
+    'crib': 'purple.crib',
+    'motion': 'purple.motion',
+    'ngrams': 'purple.ngrams',
+}
+
 DEFAULT_SWITCHES = '1-1,1,1-12'
 DEFAULT_ALPHABET = Purple97.STRAIGHT_PLUGBOARD
 
+CHUNK_SIZE = 64 * 1024
+
+# How many characters textwrap looks at before and after a point to decide
+# whether it may break a line there:
+WRAP_CONTEXT = 4
+
 LOWERCASE = set(string.ascii_lowercase)
 DIGITS = {
     '0': 'ZERO',
@@ -41,6 +78,10 @@ DIGITS = {
     '9': 'NINE',
 }
 
+NOT_PLAINTEXT = re.compile('[^A-Za-z0-9]+')
+PLAINTEXT_TABLE = str.maketrans(dict(
+        [(c, c.upper()) for c in LOWERCASE] + list(DIGITS.items())))
+
 
 def filter_plaintext(source):
     """A generator to filter plaintext to ensure only valid input is fed to
@@ -51,31 +92,30 @@ def filter_plaintext(source):
         * Digits are converted to words; e.g. 1 => ONE
         * All other input is ignored (filtered out)
 
-    source can be anything that yields a line of text at a time.
+    source can be anything that yields a line or chunk of text at a time. The
+    filtered text is yielded a chunk at a time.
 
     """
-    for line in source:
-        for c in line:
-            if c in Purple97.VALID_KEYS:
-                yield c
-            elif c in LOWERCASE:
-                yield c.upper()
-            else:
-                digit_name = DIGITS.get(c)
-                if digit_name:
-                    for d in digit_name:
-                        yield d
+    for chunk in source:
+        yield NOT_PLAINTEXT.sub('', chunk).translate(PLAINTEXT_TABLE)
 
 
 def filter_whitespace(source):
     """A generator to filter out whitespace from text read from
-    a file-like source.
+    a file-like source. The filtered text is yielded a chunk at a time.
 
     """
-    for line in source:
-        for c in line:
-            if not c.isspace():
-                yield c
+    for chunk in source:
+        yield ''.join(chunk.split())
+
+
+def read_chunks(fp, size=CHUNK_SIZE):
+    """A generator that reads a file-like object size characters at a time."""
+    while True:
+        chunk = fp.read(size)
+        if not chunk:
+            break
+        yield chunk
 
 
 def group_text(text, n=5):
@@ -84,10 +124,227 @@ def group_text(text, n=5):
     return ' '.join(text[i:i+n] for i in range(0, len(text), n))
 
 
+class OutputFormatter:
+    """This class groups and wraps output text incrementally as it is
+    written, producing the same result as group_text() followed by
+    textwrap.fill() over the whole text, without holding the whole text in
+    memory.
+
+    Wrapping is done by re-wrapping only the last, incomplete line together
+    with any new text. Every line before the last one is final and is written
+    to the output file as soon as it is known. Text without garbles takes a
+    fast path that finds the same line breaks without textwrap.
+
+    """
+    def __init__(self, fp, group=5, width=70):
+        """Build a formatter writing to the file-like object fp. group and
+        width have the same meaning as the -g and -w command-line options.
+
+        """
+        self.fp = fp
+        self.group = group
+        self.partial_group = ''
+        self.started = False
+        self.pending = ''
+        self.context = ''
+        self.head = 0
+        self.width = width
+        self.wrapper = None
+        if width != 0:
+            # Never break groups when grouping
+            self.wrapper = textwrap.TextWrapper(width=width,
+                    expand_tabs=False, replace_whitespace=False,
+                    drop_whitespace=False, break_long_words=group == 0)
+
+    def write(self, text):
+        """Adds text to the output."""
+        if self.group != 0:
+            text = self.partial_group + text
+            n = len(text) - len(text) % self.group
+            self.partial_group = text[n:]
+            text = self._separate(group_text(text[:n], self.group))
+        self._emit(text)
+
+    def close(self):
+        """Writes out any remaining text followed by a newline."""
+        if self.partial_group:
+            self._emit(self._separate(self.partial_group))
+            self.partial_group = ''
+        if self.group == 0 and '-' in self.pending:
+            self._emit_garbled(self.pending, final=True)
+        self.fp.write(self.pending + '\n')
+        self.pending = ''
+
+    def _separate(self, text):
+        """Prefixes text with a group separator unless it is the first text."""
+        if not text:
+            return text
+        if self.started:
+            return ' ' + text
+        self.started = True
+        return text
+
+    def _emit(self, text):
+        if self.width == 0:
+            self.fp.write(text)
+            return
+        text = self.pending + text
+        if self.group == 0:
+            if '-' in text:
+                self._emit_garbled(text)
+            else:
+                self._emit_letters(text)
+            return
+        if self.group <= self.width and '-' not in text:
+            self._emit_groups(text)
+            return
+        lines = self.wrapper.wrap(text)
+        if lines:
+            for line in lines[:-1]:
+                self.fp.write(line + '\n')
+            self.pending = lines[-1]
+
+    def _emit_letters(self, text):
+        """A fast path for wrapping ungrouped text without garbles, which
+        textwrap breaks every width letters.
+
+        """
+        n = (len(text) - 1) // self.width * self.width
+        for i in range(0, n, self.width):
+            self.fp.write(text[i:i + self.width] + '\n')
+        self.context = (self.context + text[:n])[-WRAP_CONTEXT:]
+        self.pending = text[n:]
+        self.head = 0
+
+    def _emit_garbled(self, text, final=False):
+        """Wraps ungrouped text with garbles, which textwrap may also break
+        after a '-'. Whether it does depends on the characters on either side,
+        so the text is split into textwrap's chunks here, looking back into
+        the text already written, and a line is only written once the chunks
+        it depends on can no longer change. If final is true, all of the text
+        is wrapped.
+
+        """
+        buf = self.context + text
+        start = len(self.context) + self.head
+        end = len(buf)
+        if not final:
+            end = min(end - WRAP_CONTEXT, len(buf.rstrip('-')))
+        # The rest of a word textwrap broke at the end of the last line is
+        # one chunk
+        chunks = [buf[len(self.context):start]] if self.head else []
+        for match in self.wrapper.wordsep_re.finditer(buf, start):
+            if match.end() > end:
+                break
+            chunks.append(match.group())
+        ends = list(itertools.accumulate(len(chunk) for chunk in chunks))
+        # The last line is left pending; unless final, it may still grow
+        lines = self.wrapper._wrap_chunks(chunks)[:-1]
+        n = sum(len(line) for line in lines)
+        self.pending = text[n:]
+        if not n:
+            return
+        for line in lines:
+            self.fp.write(line + '\n')
+        self.context = (self.context + text[:n])[-WRAP_CONTEXT:]
+        i = bisect.bisect_right(ends, n)
+        if i < len(ends) and (ends[i - 1] if i else 0) != n:
+            self.head = ends[i] - n
+        else:
+            self.head = 0
+
+    def _emit_groups(self, text):
+        """A fast path for wrapping grouped text without garbles. Every chunk
+        textwrap sees is then either a group or a single space, none longer
+        than the width, so its greedy fill simply ends each line at the last
+        chunk boundary that fits.
+
+        """
+        width = self.width
+        start = 0
+        end = start + width
+        while end < len(text):
+            if text[end - 1] != ' ' and text[end] != ' ':
+                # The line would end in the middle of a group
+                end = text.rfind(' ', start, end) + 1
+            self.fp.write(text[start:end] + '\n')
+            start = end
+            end = start + width
+        self.pending = text[start:]
+
+
+def process(purple, source, action, jobs=1):
+    """A generator that enciphers the chunks of text from source with the
+    Purple97 instance purple and yields the output a chunk at a time. action
+    must be 'encrypt' or 'decrypt'.
+
+    If jobs is not 1, the text is enciphered on a pool of jobs worker processes
+    (0 means one per CPU); see purple.parallel.
+
+    """
+    if jobs == 1:
+        stream = (purple.encryptor() if action == 'encrypt' else
+                  purple.decryptor())
+        for chunk in source:
+            yield stream.update(chunk)
+        yield stream.finalize()
+    else:
+        # Imported here, like the other modules only some options need, to
+        # keep the start up of a plain encrypt or decrypt fast
+        from concurrent.futures import ProcessPoolExecutor
+        import purple.parallel as parallel
+
+        jobs = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(jobs) as executor:
+            for output in parallel.imap(purple, source, action, executor,
+                                        jobs):
+                yield output
+
+
+def process_resync(purple, source, fp):
+    """A generator that decrypts the text from source with the Purple97
+    instance purple, correcting for dropped and extra letters, and yields the
+    plaintext. Each correction is reported to fp as it is found. The text is
+    processed a chunk at a time, holding back only the few windows of text a
+    correction may still change. See purple.resync.
+
+    """
+    from purple.resync import Resynchronizer
+
+    resync = Resynchronizer(purple)
+
+    def steps():
+        for chunk in source:
+            yield resync.update(chunk)
+        yield resync.finalize()
+
+    corrections = unresolved = 0
+    for plaintext in steps():
+        for correction in resync.corrections[corrections:]:
+            print('purple: {} {} letter(s) at position {}'.format(
+                    correction.kind, correction.count, correction.position),
+                  file=fp)
+        for position in resync.unresolved[unresolved:]:
+            print('purple: unreadable text at position {}'.format(position),
+                  file=fp)
+        corrections = len(resync.corrections)
+        unresolved = len(resync.unresolved)
+        yield plaintext
+
+
 def main(argv=None):
     """Entry point for the command-line purple97 simulation."""
 
-    parser = argparse.ArgumentParser(description=DESC, epilog=EPILOG)
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS:
+        # Imported here as the commands are only needed when run, and some,
+        # such as purple.manifest, build on this module
+        module = importlib.import_module(SUBCOMMANDS[argv[0]])
+        return module.main(argv[1:])
+
+    parser = argparse.ArgumentParser(description=DESC, epilog=EPILOG,
+            formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument('-e', '--encrypt', action='store_true',
         help='perform an encrypt operation')
     parser.add_argument('-d', '--decrypt', action='store_true',
@@ -105,10 +362,17 @@ def main(argv=None):
     parser.add_argument('-g', '--group', type=int, default=5, metavar='N',
         help=('if non-zero, group output in %(metavar)s-letter groups '
               '[default: %(default)s]'))
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+        help=('encipher using %(metavar)s worker processes; a value of 0 '
+              'means one per CPU [default: %(default)s]'))
     parser.add_argument('-w', '--width', type=int, default=70, metavar='N',
         help=("wrap output text to %(metavar)s letters; "
               "a value of 0 means do not wrap "
               "[default: %(default)s]"))
+    parser.add_argument('-r', '--resync', action='store_true',
+        help='decrypt correcting for dropped or extra ciphertext letters')
+    parser.add_argument('--stats', action='store_true',
+        help='print letter counts, throughput and phase timings to stderr')
 
     args = parser.parse_args(args=argv)
 
@@ -121,6 +385,10 @@ def main(argv=None):
         parser.error("Please supply either -t or -i, not both")
     if args.decrypt and args.filter:
         parser.error("The -f option only works with -e (encrypt)")
+    if args.resync and not args.decrypt:
+        parser.error("The -r option only works with -d (decrypt)")
+    if args.resync and args.jobs != 1:
+        parser.error("The -r option cannot be used with -j")
 
     # Get key settings
     if args.switches:
@@ -137,6 +405,8 @@ def main(argv=None):
         parser.error("The --group option must be 0 or greater")
     if args.width < 0:
         parser.error("The --width option must be 0 or greater")
+    if args.jobs < 0:
+        parser.error("The --jobs option must be 0 or greater")
 
     # Create purple cipher machine object
     try:
@@ -151,33 +421,60 @@ def main(argv=None):
         except IOError as ex:
             raise SystemExit(str(ex))
 
-    if args.encrypt:
-        action = purple.encrypt
+    timer = None
+    if args.stats:
+        import purple.instrument as instrument
+
+        timer = instrument.PhaseTimer()
+        stats = instrument.attach(purple)
 
-        source = [args.text] if args.text else fp
+    def timed(phase, iterable):
+        return iterable if timer is None else timer.timed(phase, iterable)
+
+    source = [args.text] if args.text else timed('read', read_chunks(fp))
+    if args.encrypt:
+        action = 'encrypt'
         source = (filter_plaintext(source) if args.filter else
                                     filter_whitespace(source))
     else:
-        action = purple.decrypt
-        source = [args.text] if args.text else fp
+        action = 'decrypt'
         source = filter_whitespace(source)
+    source = timed('filter', source)
 
+    if args.resync:
+        outputs = process_resync(purple, source, sys.stderr)
+    else:
+        outputs = process(purple, source, action, args.jobs)
+
+    formatter = OutputFormatter(sys.stdout, args.group, args.width)
     try:
-        result = action(source)
+        for output in timed('cipher', outputs):
+            if timer is None:
+                formatter.write(output)
+            else:
+                with timer.phase('format'):
+                    formatter.write(output)
     except (Purple97Error, SteppingSwitchError) as ex:
         parser.error(str(ex))
 
-    if args.group != 0:
-        result = group_text(result, args.group)
+    formatter.close()
+
+    if timer is not None:
+        print_stats(stats, timer, sys.stderr)
 
-    if args.width != 0:
-        # Never break groups when grouping
-        break_long_words = args.group == 0
-        result = textwrap.fill(result, width=args.width, expand_tabs=False,
-                replace_whitespace=False, drop_whitespace=False,
-                break_long_words=break_long_words)
 
-    print(result)
+def print_stats(stats, timer, fp):
+    """Writes the statistics gathered by the --stats option to fp."""
+    elapsed = timer.elapsed()
+    phases = timer.report()
+    rate = stats.letters / elapsed if elapsed else 0.0
+    print('purple: {} letters ({} garbles) in {:.3f} s, {:.0f} letters/s'.format(
+            stats.letters, stats.garbles, elapsed, rate), file=fp)
+    print('purple: switch motions: fast {}, middle {}, slow {}'.format(
+            stats.fast_steps, stats.middle_steps, stats.slow_steps), file=fp)
+    print('purple: ' + ', '.join('{} {:.3f} s'.format(name, phases[name])
+            for name in ('read', 'filter', 'cipher', 'format', 'other')
+            if name in phases), file=fp)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,333 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module processes many messages, each with its own key, as listed in
+a manifest file. It is used by the "purple batch" command.
+
+A manifest is either a JSON Lines file (one JSON object per line) or a CSV file
+with a header row. Each entry has the following fields:
+
+    input      path of the message to encrypt or decrypt
+    switches   switch settings, e.g. 9-1,24,6-23
+    alphabet   plugboard alphabet, e.g. NOKTYUXEQLHBRMPDICJASVWGZF
+    direction  either encrypt or decrypt (or e or d)
+    output     optional path to write the result to; by default the input
+               path with a .enc or .dec suffix is used
+    key        optional name of a key in a key store (see purple.keystore),
+               used instead of switches and alphabet
+
+Relative paths are taken relative to the directory containing the manifest.
+Blank lines, and lines starting with '#' in JSON Lines files, are ignored.
+
+"""
+import argparse
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import json
+import os
+import sys
+
+from purple.compiled import CompiledPurple97
+from purple.machine import Purple97Error
+from purple.main import (DEFAULT_ALPHABET, DEFAULT_SWITCHES, OutputFormatter,
+        filter_plaintext, filter_whitespace, read_chunks)
+from purple.switch import SteppingSwitchError
+
+
+DESC = """Process a batch of PURPLE messages listed in a manifest"""
+
+EPILOG = """\
+Each manifest entry names an input file, its switch settings, alphabet, and
+direction (encrypt or decrypt), and optionally an output file. Entries without
+switches or an alphabet use the PURPLE97_SWITCHES and PURPLE97_ALPHABET
+environment variables. Errors are reported per entry; the exit status is 1 if
+any entry failed. Entries with a key field take their settings from the key
+store given with --keystore.
+"""
+
+
+DIRECTIONS = {
+    'encrypt': 'encrypt',
+    'e': 'encrypt',
+    'decrypt': 'decrypt',
+    'd': 'decrypt',
+}
+
+SUFFIXES = {
+    'encrypt': '.enc',
+    'decrypt': '.dec',
+}
+
+
+class ManifestError(Exception):
+    """Exception class for malformed manifest entries"""
+
+
+Entry = namedtuple('Entry', 'line input switches alphabet direction output')
+
+Result = namedtuple('Result', 'entry error letters')
+
+
+def read_manifest(path, switches=None, alphabet=None, keystore=None):
+    """A generator that reads the manifest at path and yields an Entry for each
+    message, or a ManifestError (as a value, not raised) for each entry that
+    could not be parsed, so that one bad line does not stop a batch.
+
+    switches and alphabet supply defaults for entries that leave them blank.
+    keystore is a KeyStore used to look up entries with a key field.
+
+    """
+    base = os.path.dirname(path)
+    with open(path, 'r', newline='') as fp:
+        if _is_json_lines(path, fp):
+            rows = _json_rows(fp)
+        else:
+            rows = _csv_rows(fp)
+
+        for line, row in rows:
+            if isinstance(row, ManifestError):
+                yield row
+                continue
+            try:
+                yield _make_entry(line, row, base, switches, alphabet,
+                                  keystore)
+            except ManifestError as ex:
+                yield ex
+
+
+def process_entry(entry, group=5, width=70, filter_input=False):
+    """Encrypts or decrypts one manifest entry, writing the result to its
+    output file. A Result is returned; its error attribute is None on success
+    or an error message string.
+
+    This function is run in the worker processes. The message is streamed from
+    the input file to the output file, so memory use does not depend on the
+    message size.
+
+    """
+    written = False
+    try:
+        purple = CompiledPurple97.from_key_sheet(entry.switches, entry.alphabet)
+        if entry.direction == 'encrypt':
+            stream = purple.encryptor()
+            filter_func = (filter_plaintext if filter_input else
+                           filter_whitespace)
+        else:
+            stream = purple.decryptor()
+            filter_func = filter_whitespace
+
+        with open(entry.input, 'r') as infile, \
+                open(entry.output, 'w') as outfile:
+            written = True
+            formatter = OutputFormatter(outfile, group, width)
+            for chunk in filter_func(read_chunks(infile)):
+                formatter.write(stream.update(chunk))
+            formatter.write(stream.finalize())
+            formatter.close()
+
+    except (Purple97Error, SteppingSwitchError, OSError,
+            UnicodeDecodeError) as ex:
+        # Don't leave a partial result behind
+        if written:
+            try:
+                os.remove(entry.output)
+            except OSError:
+                pass
+        return Result(entry, str(ex), 0)
+
+    return Result(entry, None, stream.count)
+
+
+def run(entries, jobs=1, group=5, width=70, filter_input=False):
+    """A generator that processes the given entries and yields a Result for
+    each one, in order. ManifestError values from read_manifest() are passed
+    through as failed Results with an entry of None.
+
+    If jobs is not 1, entries are processed on a pool of jobs worker
+    processes (0 means one per CPU). A bounded number of entries is in flight
+    at a time, so manifests of any size can be processed.
+
+    """
+    if jobs == 1:
+        for entry in entries:
+            if isinstance(entry, ManifestError):
+                yield Result(None, str(entry), 0)
+            else:
+                yield process_entry(entry, group, width, filter_input)
+        return
+
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(jobs) as executor:
+        window = 4 * jobs
+        pending = deque()
+        for entry in entries:
+            if isinstance(entry, ManifestError):
+                pending.append(Result(None, str(entry), 0))
+            else:
+                pending.append(executor.submit(process_entry, entry, group,
+                        width, filter_input))
+
+            while len(pending) >= window:
+                yield _result(pending.popleft())
+
+        while pending:
+            yield _result(pending.popleft())
+
+
+def main(argv=None):
+    """Entry point for the "purple batch" command."""
+
+    parser = argparse.ArgumentParser(prog='purple batch', description=DESC,
+            epilog=EPILOG)
+    parser.add_argument('manifest',
+        help='JSON Lines or CSV manifest listing the messages to process')
+    parser.add_argument('-f', '--filter', action='store_true',
+        help='filter plaintext and provide useful substitutions')
+    parser.add_argument('-g', '--group', type=int, default=5, metavar='N',
+        help=('if non-zero, group output in %(metavar)s-letter groups '
+              '[default: %(default)s]'))
+    parser.add_argument('-j', '--jobs', type=int, default=0, metavar='N',
+        help=('process entries on %(metavar)s worker processes; a value of 0 '
+              'means one per CPU [default: %(default)s]'))
+    parser.add_argument('-w', '--width', type=int, default=70, metavar='N',
+        help=("wrap output text to %(metavar)s letters; "
+              "a value of 0 means do not wrap "
+              "[default: %(default)s]"))
+    parser.add_argument('-k', '--keystore', metavar='PATH',
+        help='look up the key fields of entries in the key store at PATH')
+
+    args = parser.parse_args(args=argv)
+
+    if args.group < 0:
+        parser.error("The --group option must be 0 or greater")
+    if args.width < 0:
+        parser.error("The --width option must be 0 or greater")
+    if args.jobs < 0:
+        parser.error("The --jobs option must be 0 or greater")
+
+    switches = os.environ.get('PURPLE97_SWITCHES', DEFAULT_SWITCHES)
+    alphabet = os.environ.get('PURPLE97_ALPHABET', DEFAULT_ALPHABET)
+
+    keystore = None
+    try:
+        if args.keystore:
+            # Imported here as purple.keystore is only needed with this option
+            from purple.keystore import KeyStore
+            keystore = KeyStore(args.keystore, readonly=True)
+        entries = read_manifest(args.manifest, switches, alphabet, keystore)
+        results = run(entries, args.jobs, args.group, args.width, args.filter)
+        total = failed = 0
+        for result in results:
+            total += 1
+            if result.error is not None:
+                failed += 1
+                if result.entry is None:
+                    where = args.manifest
+                else:
+                    where = '{}:{}: {}'.format(args.manifest,
+                            result.entry.line, result.entry.input)
+                print('{}: {}'.format(where, result.error), file=sys.stderr)
+    except (OSError, Purple97Error) as ex:
+        raise SystemExit(str(ex))
+    finally:
+        if keystore is not None:
+            keystore.close()
+
+    print('{} entries processed, {} failed'.format(total, failed),
+            file=sys.stderr)
+    if failed:
+        raise SystemExit(1)
+
+
+def _result(item):
+    return item if isinstance(item, Result) else item.result()
+
+
+def _is_json_lines(path, fp):
+    """Decides whether the manifest is JSON Lines or CSV."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jsonl', '.json'):
+        return True
+    if ext == '.csv':
+        return False
+
+    for line in fp:
+        if line.strip():
+            fp.seek(0)
+            return line.lstrip().startswith('{')
+    fp.seek(0)
+    return False
+
+
+def _json_rows(fp):
+    for line, text in enumerate(fp, 1):
+        text = text.strip()
+        if not text or text.startswith('#'):
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as ex:
+            yield line, ManifestError('line {}: {}'.format(line, ex))
+            continue
+        if not isinstance(row, dict):
+            yield line, ManifestError('line {}: not a JSON object'.format(line))
+            continue
+        yield line, row
+
+
+def _csv_rows(fp):
+    reader = csv.DictReader(fp)
+    for row in reader:
+        if not any(v and v.strip() for v in row.values() if
+                   isinstance(v, str)):
+            continue
+        yield reader.line_num, row
+
+
+def _make_entry(line, row, base, switches, alphabet, keystore=None):
+    """Builds an Entry from a parsed manifest row. A ManifestError is raised
+    if a field is missing, invalid, or not a string.
+
+    """
+    def field(name):
+        value = row.get(name)
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            raise ManifestError('line {}: {} must be a string, not {!r}'
+                    .format(line, name, value))
+        return value.strip()
+
+    input_path = field('input')
+    if not input_path:
+        raise ManifestError('line {}: missing input'.format(line))
+
+    direction = DIRECTIONS.get((field('direction') or '').lower())
+    if direction is None:
+        raise ManifestError('line {}: {}: invalid direction {!r}'.format(line,
+                input_path, row.get('direction')))
+
+    output_path = field('output') or input_path + SUFFIXES[direction]
+
+    key = field('key')
+    if key:
+        if keystore is None:
+            raise ManifestError('line {}: {}: key {!r} given without a key '
+                    'store'.format(line, input_path, key))
+        record = keystore.get(key)
+        if record is None:
+            raise ManifestError('line {}: {}: unknown key {!r}'.format(line,
+                    input_path, key))
+        switches, alphabet = record.switches, record.alphabet
+    else:
+        switches = field('switches') or switches
+        alphabet = field('alphabet') or alphabet
+
+    return Entry(line=line,
+                 input=os.path.join(base, input_path),
+                 switches=switches,
+                 alphabet=alphabet,
+                 direction=direction,
+                 output=os.path.join(base, output_path))
@@ -0,0 +1,267 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module estimates the sixes starting position and the motion order of
+a message from its ciphertext, narrowing the settings a key search has to
+try, and contains the "purple motion" command that runs it.
+
+NumPy is an optional dependency of purple; it is required by this module.
+
+The sixes switch steps on every letter, so the sixes permutation used for the
+j-th letter depends only on (sixes + j) mod 25. Deciphering the sixes letters
+of a message, the six letters wired to the sixes switch, with the right
+starting position turns them into plaintext letters, whose frequencies are
+uneven; any other starting position mixes them into nearly flat frequencies.
+Each of the 25 positions is scored by the coincidence rate (the chance that
+two letters drawn from the result are equal) of the deciphered sixes letters.
+
+This needs the plugboard levels of the sixes letters, i.e. the first six
+letters of the alphabet. If they are not known, they are estimated: a sixes
+letter's frequency follows the 25 letter sixes cycle, while the twenties
+letters' does not, so the six letters whose counts vary most with the
+position modulo 25 are taken. Every one of their 720 orders is then scored
+with every starting position. Short messages may not give the right six.
+
+The motion order needs the whole alphabet. When ciphertext is deciphered the
+twenties letters pass through switch 3 first, then switch 2, then switch 1.
+For a guessed motion order and starting positions of switches 3 and 2, both
+are undone letter by letter, leaving letters enciphered by switch 1 alone.
+Switch 1 only changes position at steps the motion order dictates, so the
+remaining letters fall into groups sharing its position, each group a simple
+substitution of plaintext with an uneven coincidence rate. Wrong guesses
+leave the letters nearly random. All 6 * 625 guesses are scored with
+vectorized counts, and the best leave only the position of switch 1, 25
+settings, to a key search.
+
+The slow switch steps when the middle switch is at 24, so when switch 1 is
+the middle switch, whose position is not guessed, the slow switch is stepped
+at a wrong point and the scores of those motion orders suffer in messages
+long enough to contain a slow step (up to 625 letters). Scores are only
+meaningful with a few hundred letters or more.
+
+"""
+import argparse
+from collections import namedtuple
+from itertools import permutations
+import string
+import sys
+
+import numpy as np
+
+from purple.machine import Purple97Error, validate_alphabet
+from purple.switch import SteppingSwitchError
+import purple.vectorized as vectorized
+
+
+DESC = """Estimate the sixes position and motion order of a PURPLE message"""
+
+EPILOG = """\
+Prints the most likely sixes starting positions and, when the alphabet is
+given with -a, the most likely motion orders with the starting positions of
+twenties switches 2 and 3, as key sheet settings with ? for the position left
+to search. Without -a the sixes letters are estimated from the ciphertext, or
+may be given with -l. Positions are 1-based as in key sheets.
+"""
+
+LETTERS = set(string.ascii_uppercase)
+NUM_POSITIONS = 25
+MOTIONS = ((1, 2), (1, 3), (2, 1), (2, 3), (3, 1), (3, 2))
+
+SixesCandidate = namedtuple('SixesCandidate', 'score position letters')
+
+MotionCandidate = namedtuple('MotionCandidate', 'score fast middle positions')
+
+
+def _encode(ciphertext):
+    """Returns the letter codes of ciphertext and the message position of
+    each, leaving out garbles. Whitespace is ignored.
+
+    """
+    text = ''.join(ciphertext.split())
+    codes = vectorized.encode([text])[0][0]
+    letters = codes != vectorized.GARBLE
+    return codes[letters].astype(np.intp), np.flatnonzero(letters)
+
+
+def _levels(alphabet):
+    """Returns an array mapping each letter code to its plugboard level."""
+    codes = vectorized.encode([validate_alphabet(alphabet)])[0][0]
+    levels = np.empty(26, dtype=np.intp)
+    levels[codes] = np.arange(26)
+    return levels
+
+
+def _coincidences(counts):
+    """Returns the number of pairs of equal letters for each row of counts."""
+    return (counts * (counts - 1)).sum(axis=-1)
+
+
+def sixes_letters(ciphertext):
+    """Estimates the six letters wired to the sixes switch as those whose
+    counts vary most with the message position modulo 25, and returns them
+    as a string, most varying first.
+
+    """
+    codes, where = _encode(ciphertext)
+    counts = np.zeros((26, NUM_POSITIONS))
+    np.add.at(counts, (codes, where % NUM_POSITIONS), 1)
+    expected = np.maximum(counts.mean(axis=1, keepdims=True), 1e-9)
+    chi2 = ((counts - expected) ** 2 / expected).sum(axis=1)
+    order = np.argsort(-chi2, kind='stable')[:6]
+    return ''.join(chr(ord('A') + c) for c in order)
+
+
+def sixes_candidates(ciphertext, alphabet=None, letters=None, top=5):
+    """Returns a list of the top most likely SixesCandidates for the sixes
+    starting position of ciphertext, best first.
+
+    With alphabet, the levels of the sixes letters are taken from it and each
+    position is scored once. Otherwise the sixes letters are letters, or as
+    estimated by sixes_letters(), and each of their orders is scored with
+    each position; the letters of a candidate are its sixes letters in level
+    order, the first six letters of the alphabet. position is 0-based. score
+    is the coincidence rate of the deciphered sixes letters.
+
+    """
+    codes, where = _encode(ciphertext)
+    if alphabet is not None:
+        alphabet = validate_alphabet(alphabet)
+        orders = [alphabet[:6]]
+    else:
+        letters = sixes_letters(ciphertext) if letters is None else letters
+        letters = letters.upper()
+        if len(set(letters)) != 6 or not set(letters) <= LETTERS:
+            raise Purple97Error("sixes letters must be 6 different letters")
+        orders = [''.join(order) for order in permutations(sorted(letters))]
+
+    # levels[k, c] is the level of letter code c under order k
+    levels = np.full((len(orders), 26), -1, dtype=np.intp)
+    for k, order in enumerate(orders):
+        for level, c in enumerate(order):
+            levels[k, ord(c) - ord('A')] = level
+    sixes = levels[0, codes] >= 0
+    codes, where = codes[sixes], where[sixes]
+    pairs = max(len(codes) * (len(codes) - 1), 1)
+
+    rows = np.arange(len(orders))[:, np.newaxis]
+    input_levels = levels[:, codes]
+    scores = np.empty((NUM_POSITIONS, len(orders)))
+    for position in range(NUM_POSITIONS):
+        output = vectorized.SIXES_DECRYPT[(position + where) % NUM_POSITIONS,
+                                          input_levels]
+        counts = np.bincount((output + rows * 6).ravel(),
+                             minlength=len(orders) * 6)
+        scores[position] = _coincidences(counts.reshape(-1, 6)) / pairs
+
+    best = np.argsort(-scores, axis=None, kind='stable')[:top]
+    return [SixesCandidate(float(scores.flat[n]), int(n // len(orders)),
+                           orders[n % len(orders)]) for n in best]
+
+
+def motion_candidates(ciphertext, alphabet, sixes, top=5):
+    """Returns a list of the top most likely MotionCandidates for ciphertext,
+    best first, given its plugboard alphabet and 0-based sixes starting
+    position. fast and middle are the fast and middle switch numbers (1-3),
+    positions is a 2-tuple of the 0-based starting positions of twenties
+    switches 2 and 3, and score is the coincidence rate of the letters left
+    enciphered by switch 1 alone, within groups sharing its position.
+
+    """
+    if not 0 <= sixes < NUM_POSITIONS:
+        raise Purple97Error("sixes position out of range (0-24)")
+    codes, where = _encode(ciphertext)
+    levels = _levels(alphabet)[codes]
+    twenties = levels >= 6
+    levels, where = levels[twenties] - 6, where[twenties]
+    n = int(where[-1]) + 1 if len(where) else 0
+
+    switch_2, switch_3 = (vectorized.TWENTIES_DECRYPT[1],
+                          vectorized.TWENTIES_DECRYPT[2])
+    # Each batch is one motion order and position of switch 3, with every
+    # position of switch 2; switch 1 starts at 0, as only its steps matter.
+    guesses = NUM_POSITIONS
+    starts = np.zeros((guesses, 4), dtype=np.intp)
+    starts[:, 0] = sixes
+    starts[:, 2] = np.arange(NUM_POSITIONS)
+    offsets = np.arange(guesses)[:, np.newaxis] * NUM_POSITIONS * 20
+
+    results = []
+    for fast, middle in MOTIONS:
+        motions = np.tile((fast, middle), (guesses, 1))
+        for position_3 in range(NUM_POSITIONS):
+            starts[:, 3] = position_3
+            pos = vectorized.positions(starts, motions, n)[:, where, :]
+            output = switch_3[pos[:, :, 3], levels[np.newaxis, :]]
+            output = switch_2[pos[:, :, 2], output]
+            keys = pos[:, :, 1] * 20 + output + offsets
+            counts = np.bincount(keys.ravel(),
+                    minlength=guesses * NUM_POSITIONS * 20)
+            counts = counts.reshape(guesses, NUM_POSITIONS, 20)
+            pairs = _coincidences(counts.sum(axis=2))
+            scores = _coincidences(counts).sum(axis=1) / np.maximum(pairs, 1)
+            for position_2, score in enumerate(scores):
+                results.append(MotionCandidate(float(score), fast, middle,
+                                               (position_2, position_3)))
+
+    results.sort(key=lambda candidate: -candidate.score)
+    return results[:top]
+
+
+def key_sheet(sixes, candidate):
+    """Returns the key sheet settings of a MotionCandidate with the given
+    0-based sixes position, with ? for the position of switch 1.
+
+    """
+    position_2, position_3 = candidate.positions
+    return '{}-?,{},{}-{}{}'.format(sixes + 1, position_2 + 1,
+            position_3 + 1, candidate.fast, candidate.middle)
+
+
+def main(argv=None):
+    """Entry point for the "purple motion" command."""
+
+    parser = argparse.ArgumentParser(prog='purple motion',
+            description=DESC, epilog=EPILOG)
+    parser.add_argument('input', metavar='FILE',
+        help='file to read the ciphertext from, - for stdin')
+    parser.add_argument('-a', '--alphabet',
+        help='plugboard alphabet of the message, if known')
+    parser.add_argument('-l', '--letters',
+        help='the six sixes letters, if known and the alphabet is not')
+    parser.add_argument('-x', '--sixes', type=int, metavar='N',
+        help='1-based sixes position, if known')
+    parser.add_argument('-k', '--top', type=int, default=5, metavar='N',
+        help='print the %(metavar)s best candidates [default: %(default)s]')
+
+    args = parser.parse_args(args=argv)
+
+    if args.top < 1:
+        parser.error("The --top option must be 1 or greater")
+    if args.sixes is not None and not 1 <= args.sixes <= NUM_POSITIONS:
+        parser.error("The --sixes option must be between 1 and 25")
+
+    try:
+        fp = sys.stdin if args.input == '-' else open(args.input, 'r')
+        with fp:
+            ciphertext = fp.read()
+
+        if args.sixes is None:
+            candidates = sixes_candidates(ciphertext, args.alphabet,
+                                          args.letters, args.top)
+            print('sixes')
+            for candidate in candidates:
+                print('{:8.4f}  {:2d}  {}'.format(candidate.score,
+                        candidate.position + 1, candidate.letters))
+            sixes = candidates[0].position
+        else:
+            sixes = args.sixes - 1
+
+        if args.alphabet is not None:
+            print('motion')
+            for candidate in motion_candidates(ciphertext, args.alphabet,
+                                               sixes, args.top):
+                print('{:8.4f}  {}'.format(candidate.score,
+                        key_sheet(sixes, candidate)))
+    except (Purple97Error, SteppingSwitchError, OSError) as ex:
+        raise SystemExit(str(ex))
@@ -0,0 +1,318 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains NgramModel, a language model scoring text by its
+n-grams (quadgrams by default), and the "purple ngrams" command that builds
+one from a text corpus.
+
+An n-gram model is much better than a monogram model (see purple.scoring) at
+telling plaintext from the near-random text of a wrong key, and is what the
+solvers need once a key is partly right. Its table has 26^n entries, one per
+n-gram, so rather than being held in a dictionary built in each worker process
+it is kept in a flat binary file of float32 log10 probabilities:
+
+    header:  magic, byte order, n, and the model's mean, std, and random_mean
+    table:   26^n float32 values, indexed by the letter codes (A=0) of an
+             n-gram read as a base 26 number
+
+The file is memory-mapped, so loading a model is nearly free and its pages are
+shared by every process using it. Models are loaded once per process with
+get_model(), and a model is pickled as its path, so a model passed to worker
+processes is mapped by them rather than copied.
+
+A model is a drop-in replacement for a MonogramModel: the score of text is the
+sum of the scores of its n-grams, and the mean, std, random_mean and threshold
+values describe the score per letter, each letter scoring the n-gram it ends.
+Garbles and other non-letters break the text; no n-gram spans them.
+score_codes() scores an array of letter codes directly, and a SlidingWindow
+keeps the score of the last letters of a stream up to date a letter at a time.
+
+"""
+import argparse
+from array import array
+from collections import Counter
+from functools import lru_cache
+import math
+import mmap
+import os
+import string
+import struct
+import sys
+import tempfile
+
+from purple.machine import Purple97Error
+
+
+DESC = """Build an n-gram language model from a text corpus"""
+
+EPILOG = """\
+The corpus files are read as text; letters are upper-cased and everything else
+is dropped, joining the words. The model is written to MODEL, which can then
+be given to the --ngrams option of "purple search" and "purple plugboard".
+"""
+
+MAGIC = b'PRPLNG01'
+HEADER = struct.Struct('<8s2sBxxxxxddd')
+
+# The probability given to n-grams missing from the corpus, as a fraction of
+# the probability of an n-gram seen once:
+FLOOR = 0.01
+
+GARBLE = 26
+LETTER_CODES = bytes(c - ord('A') if ord('A') <= c <= ord('Z') else GARBLE
+                     for c in range(256))
+
+_BYTEORDER = b'LE' if sys.byteorder == 'little' else b'BE'
+
+
+class NgramError(Purple97Error):
+    """Exception class for n-gram model errors"""
+
+
+def encode(text):
+    """Returns text as bytes of letter codes, A-Z as 0-25 and anything else as
+    GARBLE.
+
+    """
+    return text.encode('ascii', 'replace').translate(LETTER_CODES)
+
+
+class NgramModel:
+    """A language model scoring each n-gram by its log10 probability, backed
+    by a memory-mapped table file.
+
+    """
+    def __init__(self, path, use_mmap=True):
+        """Loads the model file at path, written by build(). If use_mmap is
+        true the file is memory-mapped rather than read. An NgramError is
+        raised if the file is not a valid model for this platform.
+
+        """
+        with open(path, 'rb') as fp:
+            # mmap cannot map an empty file
+            if os.fstat(fp.fileno()).st_size < HEADER.size:
+                raise NgramError("truncated n-gram model file")
+            if use_mmap:
+                data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = fp.read()
+
+        magic, byteorder, n, mean, std, random_mean = HEADER.unpack_from(data)
+        if magic != MAGIC or byteorder != _BYTEORDER or not 1 <= n <= 6:
+            raise NgramError("not an n-gram model file for this platform")
+        size = 26 ** n
+        if len(data) != HEADER.size + size * 4:
+            raise NgramError("truncated n-gram model file")
+
+        self.path = path
+        self.n = n
+        self.table = memoryview(data)[HEADER.size:].cast('f')
+        self.mean = mean
+        self.std = std
+        self.random_mean = random_mean
+        self.threshold = (mean + random_mean) / 2
+
+    def __reduce__(self):
+        return (get_model, (self.path,))
+
+    def score_codes(self, codes):
+        """Returns the total score of the n-grams of codes, a sequence of
+        letter codes such as bytes from encode(); GARBLE and any other code
+        above 25 breaks the text.
+
+        """
+        table = self.table
+        n = self.n
+        size = 26 ** (n - 1)
+        total = 0.0
+        index = run = 0
+        for c in codes:
+            if c < 26:
+                index = index % size * 26 + c
+                run += 1
+                if run >= n:
+                    total += table[index]
+            else:
+                run = 0
+        return total
+
+    def score(self, text):
+        """Returns the total score of the n-grams of the letters A-Z in text;
+        other characters break the text.
+
+        """
+        return self.score_codes(encode(text))
+
+    def letter_scores(self, text):
+        """Returns a list of the score of each character of text: the score
+        of the n-gram it ends. Characters that end no n-gram, such as the
+        first n - 1 letters and garbles, are given the threshold score so that
+        they count neither for nor against the text.
+
+        """
+        table = self.table
+        n = self.n
+        size = 26 ** (n - 1)
+        threshold = self.threshold
+        scores = []
+        index = run = 0
+        for c in encode(text):
+            if c < 26:
+                index = index % size * 26 + c
+                run += 1
+                scores.append(table[index] if run >= n else threshold)
+            else:
+                run = 0
+                scores.append(threshold)
+        return scores
+
+    def window(self, size):
+        """Returns a new SlidingWindow of size letters scored with this
+        model.
+
+        """
+        return SlidingWindow(self, size)
+
+
+class SlidingWindow:
+    """The score of the last letters of a stream under an NgramModel, updated
+    in constant time per letter. Only n-grams lying wholly inside the window
+    count.
+
+    """
+    def __init__(self, model, size):
+        if size < model.n:
+            raise NgramError("window must be at least {} letters".format(
+                             model.n))
+        self.model = model
+        self.size = size
+        self.score = 0.0
+        self._scores = [None] * size
+        self._pos = 0
+        self._index = self._run = 0
+
+    def push(self, code):
+        """Adds one letter code (GARBLE for a garble) to the window, dropping
+        the oldest, and returns the score of the window.
+
+        """
+        model = self.model
+        n = model.n
+        # The n-gram starting at the dropped letter leaves with it; it was
+        # scored when its last letter, n - 1 letters later, was pushed.
+        leaving = (self._pos + n - 1) % self.size
+        old = self._scores[leaving]
+        if old is not None:
+            self.score -= old
+            self._scores[leaving] = None
+
+        value = None
+        if code < 26:
+            self._index = self._index % 26 ** (n - 1) * 26 + code
+            self._run += 1
+            if self._run >= n:
+                value = model.table[self._index]
+                self.score += value
+        else:
+            self._run = 0
+        self._scores[self._pos] = value
+        self._pos = (self._pos + 1) % self.size
+        return self.score
+
+
+def count_ngrams(paths, n=4):
+    """Returns a Counter of the n-grams of the letters in the text files at
+    paths, read a chunk at a time.
+
+    """
+    counts = Counter()
+    chunk_size = 1 << 20
+    letters = set(string.ascii_uppercase)
+    for path in paths:
+        tail = ''
+        with open(path, 'r', errors='replace') as fp:
+            while True:
+                chunk = fp.read(chunk_size)
+                if not chunk:
+                    break
+                text = tail + ''.join(c for c in chunk.upper()
+                                      if c in letters)
+                counts.update(text[i:i + n]
+                              for i in range(len(text) - n + 1))
+                tail = text[-(n - 1):] if n > 1 else ''
+    return counts
+
+
+def build(paths, output, n=4):
+    """Builds an n-gram model from the text files at paths and writes it to
+    output, atomically replacing any existing file. Returns the number of
+    n-grams counted.
+
+    """
+    if not 1 <= n <= 6:
+        raise NgramError("n must be between 1 and 6")
+    counts = count_ngrams(paths, n)
+    total = sum(counts.values())
+    if not total:
+        raise NgramError("no {}-grams in the corpus".format(n))
+
+    floor = math.log10(FLOOR / total)
+    table = array('f', [floor]) * 26 ** n
+    mean = square = 0.0
+    for gram, count in counts.items():
+        index = 0
+        for c in gram:
+            index = index * 26 + ord(c) - ord('A')
+        p = count / total
+        table[index] = log_p = math.log10(p)
+        mean += p * log_p
+        square += p * log_p * log_p
+    std = math.sqrt(max(square - mean * mean, 0.0))
+    random_mean = math.fsum(table) / len(table)
+
+    directory = os.path.dirname(output) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(HEADER.pack(MAGIC, _BYTEORDER, n, mean, std,
+                                 random_mean))
+            table.tofile(fp)
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    get_model.cache_clear()
+    return total
+
+
+@lru_cache(maxsize=None)
+def get_model(path):
+    """Returns the model at path, loaded once per process."""
+    return NgramModel(path)
+
+
+def main(argv=None):
+    """Entry point for the "purple ngrams" command."""
+
+    parser = argparse.ArgumentParser(prog='purple ngrams',
+            description=DESC, epilog=EPILOG)
+    parser.add_argument('model', metavar='MODEL',
+        help='file to write the model to')
+    parser.add_argument('corpus', nargs='+', metavar='CORPUS',
+        help='text files to count n-grams in')
+    parser.add_argument('-n', type=int, default=4,
+        help='n-gram length, 1 to 6 [default: %(default)s]')
+
+    args = parser.parse_args(args=argv)
+
+    if not 1 <= args.n <= 6:
+        parser.error("The -n option must be between 1 and 6")
+
+    try:
+        total = build(args.corpus, args.model, args.n)
+        model = get_model(args.model)
+    except (NgramError, OSError) as ex:
+        raise SystemExit(str(ex))
+    print('{} {}-grams counted; mean {:.3f}, random mean {:.3f} per letter'
+          .format(total, model.n, model.mean, model.random_mean))
@@ -0,0 +1,122 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module enciphers a single long message on several processes at once.
+
+Because the switch positions after n letters are a pure function of the
+starting positions and n (see purple.machine.advance_positions), a message can
+be cut into segments and the starting positions of every segment computed
+directly. Each segment is then enciphered independently in a worker process,
+using the compiled engine, and the results are stitched back together in
+order. The output is identical to the serial Purple97 engine.
+
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from purple.compiled import CompiledPurple97
+from purple.machine import advance_positions
+
+
+# Segments smaller than this are not worth shipping to another process:
+MIN_SEGMENT_SIZE = 16 * 1024
+
+# Default segment size when processing a stream of chunks:
+SEGMENT_SIZE = 128 * 1024
+
+
+def encrypt(purple, plaintext, jobs=None, executor=None):
+    """Encrypts plaintext with the Purple97 instance purple using up to jobs
+    worker processes (default: one per CPU) and returns the ciphertext. If
+    executor is supplied it is used instead of creating a new process pool.
+
+    The machine is left stepped past the end of the message, exactly as if
+    purple.encrypt(plaintext) had been called.
+
+    """
+    return _run(purple, plaintext, 'encrypt', jobs, executor)
+
+
+def decrypt(purple, ciphertext, jobs=None, executor=None):
+    """Decrypts ciphertext with the Purple97 instance purple using up to jobs
+    worker processes and returns the plaintext. See encrypt().
+
+    """
+    return _run(purple, ciphertext, 'decrypt', jobs, executor)
+
+
+def imap(purple, chunks, action, executor, jobs, segment_size=SEGMENT_SIZE,
+        window=None):
+    """A generator that enciphers an iterable of text chunks on executor, which
+    has jobs workers, and yields the output segment by segment, in order.
+
+    action must be either 'encrypt' or 'decrypt'. Chunks are cut into segments
+    of at most segment_size letters. Up to window segments (default: 2 * jobs)
+    are in flight at once, so reading, enciphering and consuming the output
+    overlap while memory use stays bounded.
+
+    The machine is stepped past all processed letters once the generator is
+    exhausted, and its statistics, if any, are updated then.
+
+    """
+    if action not in ('encrypt', 'decrypt'):
+        raise ValueError("illegal action")
+    if window is None:
+        window = 2 * jobs
+
+    start = purple.get_state()
+    fast_switch, middle_switch = purple.motion[:2]
+    offset = 0
+    garbles = 0
+    pending = deque()
+
+    for chunk in chunks:
+        for i in range(0, len(chunk), segment_size):
+            segment = chunk[i:i + segment_size]
+            switches_pos = advance_positions(start, fast_switch,
+                    middle_switch, offset)
+            pending.append(executor.submit(_run_segment, switches_pos,
+                    fast_switch, middle_switch, purple.alphabet, action,
+                    segment))
+            offset += len(segment)
+            if purple.stats is not None:
+                garbles += segment.count('-')
+
+            while len(pending) >= window:
+                yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+    purple.set_state(advance_positions(start, fast_switch, middle_switch,
+            offset))
+    if purple.stats is not None:
+        purple.stats.record(start, purple.motion, offset, garbles)
+
+
+def _run(purple, text, action, jobs, executor):
+    """Enciphers all of text; see encrypt() and decrypt()."""
+    if not isinstance(text, str):
+        text = ''.join(text)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(text) < 2 * MIN_SEGMENT_SIZE:
+        return getattr(purple, action)(text)
+
+    if executor is None:
+        with ProcessPoolExecutor(jobs) as executor:
+            return _run(purple, text, action, jobs, executor)
+
+    segment_size = max(MIN_SEGMENT_SIZE, -(-len(text) // jobs))
+    return ''.join(imap(purple, [text], action, executor, jobs,
+                        segment_size))
+
+
+def _run_segment(switches_pos, fast_switch, middle_switch, alphabet, action,
+        segment):
+    """Worker function: enciphers one segment from the given positions."""
+    machine = CompiledPurple97(switches_pos, fast_switch, middle_switch,
+            alphabet)
+    return getattr(machine, action)(segment)
@@ -0,0 +1,333 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module decrypts ciphertext that has lost letters or gained extra ones
+in transmission, which Purple97.decrypt() cannot do: only garbles marked with
+'-' keep the switches in step, and after an unmarked dropped or inserted letter
+the rest of the plaintext is junk.
+
+A Resynchronizer decrypts a message a chunk at a time and scores the plaintext
+with a language model (see purple.scoring). When a window of the plaintext
+scores like random text, the machine has lost step somewhere near it, and a
+small search finds where and why. The alignment between ciphertext letters and
+machine states is tracked as an offset, delta: ciphertext letter i is
+deciphered with the switches positioned for letter i + delta. Dropping k
+letters adds k to delta from the point of loss, while k extra letters are
+skipped and subtract k.
+
+Every letter is deciphered once under the current offset, and the score of the
+window ahead of the scan is kept up to date a letter at a time. Only the region
+around a bad window, a few windows long, is decrypted again: once under each
+candidate offset, from delta - max_shift to delta + max_shift, positioning the
+machine directly with Purple97.seek(). Prefix sums of the letter scores then
+rate every combination of position and correction in constant time: the text
+before the position under the old offset plus the text after it under the new
+one. So the work is linear in the length of the message, and only the
+ciphertext and plaintext of the region in reach of a search is held in memory.
+
+The best combination is accepted only if it is clearly better than the current
+offset: it must gain at least what turning a whole window of random text into
+plaintext is expected to, and the window after the correction must read as
+plaintext under the new offset. If the window before the correction does not
+read as plaintext either, as when the step was lost in a stretch the model
+does not recognize, twice the gain and two windows of plaintext are required.
+Random text, which fails nearly every window, is therefore left alone rather
+than "corrected" wherever chance favors a shift.
+
+Dropped letters are shown as garbles ('-') in the plaintext and extra letters
+are left out. Every correction is reported, as is every bad window that no
+correction explains (e.g. a stretch of corrupted letters, or of plaintext the
+model does not recognize). Errors less than about a window apart are found as
+one region and may not be resolved, as may errors within a window or so of the
+end of the message, where there is too little text after them to confirm a
+correction.
+
+"""
+from collections import namedtuple
+from itertools import accumulate
+
+from purple.machine import Purple97Error
+from purple.scoring import ENGLISH
+
+
+DEFAULT_WINDOW = 40
+DEFAULT_MAX_SHIFT = 3
+
+# Letters deciphered ahead of the scan at a time:
+BATCH_SIZE = 1024
+
+Correction = namedtuple('Correction', 'position kind count')
+
+ResyncResult = namedtuple('ResyncResult', 'plaintext corrections unresolved')
+
+
+def _prefix_sums(scores, threshold):
+    """Returns prefix sums of the scores less threshold, so that text scoring
+    like plaintext sums positive and random text negative.
+
+    """
+    return [0.0] + list(accumulate(s - threshold for s in scores))
+
+
+class Resynchronizer:
+    """This class decrypts a message supplied in chunks, correcting for
+    dropped and extra letters as it goes; see the module docstring.
+
+    Plaintext is returned by update() once it is out of reach of any later
+    correction, about two windows behind the input. corrections and
+    unresolved are lists of the Correction tuples and the ciphertext positions
+    of the unexplained bad windows found so far.
+
+    """
+    def __init__(self, purple, model=ENGLISH, window=DEFAULT_WINDOW,
+            max_shift=DEFAULT_MAX_SHIFT):
+        """Build a Resynchronizer decrypting with the machine purple, which
+        may be any Purple97 instance; it is positioned with seek(), so the
+        ciphertext is taken to start at the machine's initial settings.
+
+        model is the language model scoring the plaintext. window is the
+        number of letters scored to detect and confirm a loss of step;
+        shorter windows react sooner but are more easily fooled. Up to
+        max_shift dropped or extra letters at a time are corrected.
+
+        """
+        if window < 1:
+            raise Purple97Error("window must be at least 1 letter")
+        if max_shift < 0:
+            raise Purple97Error("max_shift must not be negative")
+        self.purple = purple
+        self.model = model
+        self.window = window
+        self.max_shift = max_shift
+        self.corrections = []
+        self.unresolved = []
+        self.finalized = False
+
+        # A correction must gain what a real one is expected to: a window of
+        # random text turned into plaintext.
+        self._margin = window * (model.mean - model.random_mean)
+        self._context = getattr(model, 'n', 1) - 1
+        # A region search needs this much ciphertext past the bad window:
+        self._reach = 3 * window + max_shift
+
+        # The buffered ciphertext, from position _text_start
+        self._text = ''
+        self._text_start = 0
+        # The plaintext and letter scores under the current offset, from
+        # position _plain_start; deciphered up to _plain_start + len(_plain)
+        self._plain = []
+        self._scores = []
+        self._plain_start = 0
+        self._output = []
+
+        self._delta = 0
+        self._first = 0     # the earliest position a correction may be at
+        self._scan = 0      # windows starting before here read as plaintext
+        self._run = None    # the score of the window at _scan, less threshold
+
+    def update(self, chunk):
+        """Processes the next chunk of ciphertext, in which whitespace is
+        ignored, and returns the plaintext that is now final. A Purple97Error
+        is raised if the stream has been finalized.
+
+        """
+        if self.finalized:
+            raise Purple97Error("update() called after finalize()")
+        self._text += ''.join(chunk.split())
+        self._advance(final=False)
+        self._release(self._scan - 2 * self.window)
+        return self._take()
+
+    def finalize(self):
+        """Ends the message and returns the rest of the plaintext."""
+        if self.finalized:
+            raise Purple97Error("finalize() called twice")
+        self.finalized = True
+        self._advance(final=True)
+        self._decipher(self._text_end())
+        self._release(self._plain_end())
+        return self._take()
+
+    def _text_end(self):
+        return self._text_start + len(self._text)
+
+    def _plain_end(self):
+        return self._plain_start + len(self._plain)
+
+    def _decipher(self, end):
+        """Deciphers the buffered ciphertext up to position end under the
+        current offset and scores it.
+
+        """
+        start = self._plain_end()
+        if end <= start:
+            return
+        self.purple.seek(start + self._delta)
+        plain = self.purple.decrypt(
+                self._text[start - self._text_start:end - self._text_start])
+        # Give an n-gram model the letters before the new ones as context
+        context = ''.join(self._plain[max(len(self._plain) - self._context,
+                                          0):] if self._context else ())
+        scores = self.model.letter_scores(context + plain)
+        self._plain.extend(plain)
+        self._scores.extend(scores[len(context):])
+
+    def _restart(self, pos):
+        """Starts scanning afresh at position pos."""
+        self._scan = pos
+        self._first = max(self._first, pos)
+        self._run = None
+
+    def _advance(self, final):
+        """Scans the windows that can be judged with the ciphertext buffered,
+        searching for a correction at each bad one.
+
+        """
+        window = self.window
+        threshold = self.model.threshold
+        text_end = self._text_end()
+        while True:
+            scan = self._scan
+            if scan + window > text_end:
+                break
+            if not final and scan + self._reach > text_end:
+                break
+            if self._plain_end() < scan + window:
+                self._decipher(min(text_end, scan + window + BATCH_SIZE))
+
+            scores = self._scores
+            j = scan - self._plain_start
+            if self._run is None:
+                self._run = sum(scores[j:j + window]) - threshold * window
+            if self._run >= 0.0:
+                # Slide the window on by one letter
+                if scan + window < self._plain_end():
+                    self._run += scores[j + window] - scores[j]
+                else:
+                    self._run = None
+                self._scan = scan + 1
+                continue
+
+            if not self._search(scan, text_end):
+                # Nothing explains the bad window; keep it and carry on
+                # after it
+                self.unresolved.append(scan)
+                self._restart(scan + window)
+
+    def _search(self, bad, text_end):
+        """Searches the region around the bad window at position bad for a
+        correction, and makes it if one is found. Returns True if so.
+
+        """
+        window = self.window
+        max_shift = self.max_shift
+        threshold = self.model.threshold
+        delta = self._delta
+        text = self._text
+        text_start = self._text_start
+
+        lo = max(self._first, bad - 2 * window)
+        hi = min(text_end, bad + 3 * window + max_shift)
+        first = max(self._first, bad - window)
+        last = min(hi, bad + window)
+
+        # Decrypt the region under every offset
+        regions = {}
+        for shift in range(-max_shift, max_shift + 1):
+            if lo + delta + shift >= 0:
+                self.purple.seek(lo + delta + shift)
+                plain = self.purple.decrypt(
+                        text[lo - text_start:hi - text_start])
+                regions[shift] = _prefix_sums(self.model.letter_scores(plain),
+                                              threshold)
+        base = regions[0]
+
+        # Score the whole region for each position and correction: the text
+        # before the position under the old offset and the rest under the
+        # new one. Extra letters are left out.
+        best = None
+        best_value = base[-1]
+        for i in range(first, last + 1):
+            before = base[i - lo]
+            for k in range(1, max_shift + 1):
+                for kind, shift, resume in (('dropped', k, i),
+                                            ('extra', -k, i + k)):
+                    if shift not in regions or resume > hi:
+                        continue
+                    region = regions[shift]
+                    value = before + region[-1] - region[resume - lo]
+                    if value > best_value:
+                        best_value = value
+                        best = (i, kind, k, shift, resume)
+
+        if best is None:
+            return False
+        i, kind, k, shift, resume = best
+        region = regions[shift]
+        # The corrected text must itself read as plaintext over a window, or
+        # over two if the text before the correction does not, as when the
+        # step was lost in a stretch the model does not recognize; the gain
+        # required grows to match.
+        windows = 1
+        start = i - window
+        if start < lo or base[i - lo] < base[start - lo]:
+            windows = 2
+        if best_value - base[-1] < windows * self._margin:
+            return False
+        for start in range(resume, resume + windows * window, window):
+            end = start + window
+            if end > hi or region[end - lo] < region[start - lo]:
+                return False
+
+        self._release(i)
+        if kind == 'dropped':
+            self._output.append('-' * k)
+        self.corrections.append(Correction(i, kind, k))
+        self._delta = delta + shift
+        self._plain = []
+        self._scores = []
+        self._plain_start = resume
+        self._first = resume
+        self._restart(resume)
+        return True
+
+    def _release(self, end):
+        """Moves the plaintext before position end to the output and drops
+        the ciphertext no longer needed.
+
+        """
+        count = min(end, self._plain_end()) - self._plain_start
+        if count > 0:
+            self._output.append(''.join(self._plain[:count]))
+            del self._plain[:count]
+            del self._scores[:count]
+            self._plain_start += count
+
+        unused = min(self._plain_start, self._first) - self._text_start
+        if unused > 0:
+            self._text = self._text[unused:]
+            self._text_start += unused
+
+    def _take(self):
+        """Returns the output so far and clears it."""
+        output = ''.join(self._output)
+        self._output = []
+        return output
+
+
+def resync_decrypt(purple, ciphertext, model=ENGLISH,
+        window=DEFAULT_WINDOW, max_shift=DEFAULT_MAX_SHIFT):
+    """Decrypts ciphertext with the machine purple, correcting for up to
+    max_shift dropped or extra letters at a time, and returns a ResyncResult.
+    See Resynchronizer for the arguments.
+
+    plaintext is the corrected plaintext. corrections is a list of Correction
+    tuples, each giving the ciphertext position of the error, its kind
+    ('dropped' or 'extra'), and the number of letters. unresolved is a list of
+    the ciphertext positions of bad windows that no correction explained.
+
+    """
+    resync = Resynchronizer(purple, model, window, max_shift)
+    plaintext = resync.update(ciphertext) + resync.finalize()
+    return ResyncResult(plaintext, resync.corrections, resync.unresolved)
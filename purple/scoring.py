@@ -0,0 +1,103 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains language models for scoring candidate plaintext, as
+needed by the resynchronization and key search tools.
+
+A model gives every letter a log10 probability. Scores are sums of these, so
+longer and more language-like text scores higher, and the score of text that
+is a concatenation of pieces is the sum of the scores of the pieces. These
+values describe what to expect per letter:
+
+    mean         the average score per letter of text drawn from the model
+    std          the standard deviation of the score per letter of that text
+    random_mean  the average score per letter of uniformly random text
+
+Text produced by decrypting with the wrong key or from the wrong machine state
+looks nearly random, so a stretch averaging below threshold, halfway between
+mean and random_mean, is probably not plaintext.
+
+ENGLISH is a monogram model of English letter frequencies. Models for other
+plaintext, such as romanized Japanese, can be trained with
+MonogramModel.from_text(). The n-gram models of purple.ngrams, built from a
+text corpus, provide the same interface and tell plaintext from random text
+much more sharply.
+
+"""
+from collections import Counter
+import math
+import string
+
+
+LETTERS = string.ascii_uppercase
+
+# Relative frequencies of English letters, in percent
+ENGLISH_FREQUENCIES = {
+    'A': 8.167, 'B': 1.492, 'C': 2.782, 'D': 4.253, 'E': 12.702,
+    'F': 2.228, 'G': 2.015, 'H': 6.094, 'I': 6.966, 'J': 0.153,
+    'K': 0.772, 'L': 4.025, 'M': 2.406, 'N': 6.749, 'O': 7.507,
+    'P': 1.929, 'Q': 0.095, 'R': 5.987, 'S': 6.327, 'T': 9.056,
+    'U': 2.758, 'V': 0.978, 'W': 2.360, 'X': 0.150, 'Y': 1.974,
+    'Z': 0.074,
+}
+
+
+class MonogramModel:
+    """A language model scoring each letter by its own log10 probability."""
+
+    def __init__(self, frequencies):
+        """Build a model from a mapping of each letter A-Z to its relative
+        frequency, in any units. Letters that are missing or have a frequency
+        of 0 are given a small floor probability.
+
+        """
+        total = sum(frequencies.get(c, 0) for c in LETTERS)
+        if total <= 0:
+            raise ValueError("frequencies must not all be zero")
+        floor = total / 100000
+        weights = [max(frequencies.get(c, 0), floor) for c in LETTERS]
+        total = sum(weights)
+        probs = [w / total for w in weights]
+
+        self.log_probs = {c: math.log10(p) for c, p in zip(LETTERS, probs)}
+        self.mean = sum(p * math.log10(p) for p in probs)
+        self.std = math.sqrt(sum(p * (math.log10(p) - self.mean) ** 2
+                                 for p in probs))
+        self.random_mean = sum(self.log_probs.values()) / len(LETTERS)
+        self.threshold = (self.mean + self.random_mean) / 2
+
+    @classmethod
+    def from_text(cls, text):
+        """Builds a model from the letter counts of a sample text; anything
+        but the uppercase letters A-Z is ignored.
+
+        """
+        return cls(Counter(text))
+
+    def score(self, text):
+        """Returns the total score of the letters A-Z in text; garbles and
+        other characters score nothing.
+
+        """
+        log_probs = self.log_probs
+        return sum(log_probs[c] * n for c, n in Counter(text).items()
+                   if c in log_probs)
+
+    def letter_scores(self, text):
+        """Returns a list of the score of each character of text. Characters
+        other than A-Z, such as garbles, are given the threshold score so that
+        they count neither for nor against the text.
+
+        """
+        get = self.log_probs.get
+        threshold = self.threshold
+        return [get(c, threshold) for c in text]
+
+
+ENGLISH = MonogramModel(ENGLISH_FREQUENCIES)
+
+
+def score(text, model=ENGLISH):
+    """Returns the score of text under model; see MonogramModel.score()."""
+    return model.score(text)
@@ -0,0 +1,436 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains the KeySearch class, which searches the twenties
+switch settings of a message whose plugboard alphabet and sixes position are
+known, and the "purple search" command that runs it.
+
+That leaves 25 ** 3 starting positions of the twenties switches under each of
+the 6 motion orders, 93,750 settings in all. They are numbered
+
+    index = motion * 15625 + (t1 * 625 + t2 * 25 + t3)
+
+where motion indexes MOTIONS, and searched in chunks of consecutive indexes,
+optionally on a pool of worker processes. Each worker keeps one
+CompiledPurple97 per motion order and moves its switches with set_state(), so
+no machine is built per setting.
+
+Every setting decrypts the message and is scored by a language model (see
+purple.scoring and purple.ngrams), and the best settings are kept in a top-K
+heap. Most settings are rejected early: only the first probe letters are
+decrypted, and the rest only if the probe could be plaintext, i.e. its score is
+no more than abort_sigmas standard deviations below the score the model
+expects of probe letters of plaintext. The true setting decrypts the probe to
+plaintext and passes (with 2 sigmas, about 49 times in 50); the others decrypt
+it to text scoring well below plaintext and stop there. The cutoff depends
+only on the model, so it rejects as much in the first chunk as in the last, and
+in every worker alike. It does assume that the message starts with plaintext
+the model recognizes; a message opening with a header in another language or
+with many garbles should be searched with abort_sigmas=None, which decrypts
+every setting in full.
+
+If a checkpoint file is given, the completed chunks and the heap are saved to
+it as the search runs, and a search started with the same file and parameters
+resumes where the last one stopped.
+
+"""
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections import namedtuple
+import hashlib
+import heapq
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+from purple.compiled import CompiledPurple97
+from purple.machine import Purple97Error, validate_alphabet
+from purple.ngrams import get_model
+from purple.scoring import ENGLISH
+from purple.switch import SteppingSwitchError
+
+
+DESC = """Search the twenties settings of a PURPLE message"""
+
+EPILOG = """\
+The plugboard alphabet and the sixes switch position must be known. Every
+starting position of the twenties switches is tried under each motion order
+(or only those given with -m), and the best settings are printed, best first,
+with the start of their plaintext. Use --checkpoint to make a long search
+resumable.
+"""
+
+# The (fast, middle) switch numbers of each motion order:
+MOTIONS = ((1, 2), (1, 3), (2, 1), (2, 3), (3, 1), (3, 2))
+
+TRIPLES = 25 ** 3
+NUM_SETTINGS = len(MOTIONS) * TRIPLES
+
+CHECKPOINT_VERSION = 1
+
+Candidate = namedtuple('Candidate', 'score switches')
+
+
+class KeySearchError(Purple97Error):
+    """Exception class for key search errors"""
+
+
+def setting(index, sixes):
+    """Returns the (switches_pos, fast_switch, middle_switch) of a setting
+    index, for a 0-based sixes position.
+
+    """
+    motion, triple = divmod(index, TRIPLES)
+    t1, rest = divmod(triple, 625)
+    t2, t3 = divmod(rest, 25)
+    fast_switch, middle_switch = MOTIONS[motion]
+    return (sixes, t1, t2, t3), fast_switch, middle_switch
+
+
+def key_sheet(index, sixes):
+    """Returns the switches string, as in Purple97.from_key_sheet, of a
+    setting index.
+
+    """
+    switches_pos, fast_switch, middle_switch = setting(index, sixes)
+    return '{}-{},{},{}-{}{}'.format(*[pos + 1 for pos in switches_pos],
+            fast_switch, middle_switch)
+
+
+def search_chunk(ciphertext, alphabet, sixes, indexes, top=10, model=ENGLISH,
+        probe=100, abort_sigmas=2.0):
+    """Scores the settings in the range indexes and returns a 2-tuple: a list
+    of the best (score, index) pairs of the settings not rejected early, at
+    most top of them, and the number of settings that were decrypted in full.
+
+    Settings are rejected early as described in the module documentation;
+    abort_sigmas=None disables early rejection.
+
+    """
+    head, rest = ciphertext[:probe], ciphertext[probe:]
+    n = getattr(model, 'n', 1)
+    cutoff = None
+    if abort_sigmas is not None and rest:
+        # The letters of the probe that end an n-gram and so are scored.
+        # Neighboring n-grams share n - 1 letters, so their scores vary
+        # together, as much as those of about letters / n independent ones.
+        letters = len(head) - head.count('-') - n + 1
+        if letters > 0:
+            cutoff = (letters * model.mean -
+                      abort_sigmas * model.std * math.sqrt(letters * n))
+
+    machines = {}
+    heap = []
+    full = 0
+    for index in indexes:
+        switches_pos, fast_switch, middle_switch = setting(index, sixes)
+        purple = machines.get((fast_switch, middle_switch))
+        if purple is None:
+            purple = machines[fast_switch, middle_switch] = CompiledPurple97(
+                    switches_pos, fast_switch, middle_switch, alphabet)
+        else:
+            purple.set_state(switches_pos)
+
+        plaintext = purple.decrypt(head)
+        score = model.score(plaintext)
+        if cutoff is not None and score < cutoff:
+            continue
+        if rest:
+            # Also score the n-grams that span the end of the probe, so that
+            # the score is that of the whole plaintext
+            score += model.score(plaintext[len(plaintext) - n + 1:] +
+                                 purple.decrypt(rest))
+            full += 1
+
+        if len(heap) < top:
+            heapq.heappush(heap, (score, -index))
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, (score, -index))
+
+    return [(score, -index) for score, index in heap], full
+
+
+def _merge(heap, entries, top):
+    """Merges (score, index) entries into a top-K heap of (score, -index)."""
+    for score, index in entries:
+        item = (score, -index)
+        if len(heap) < top:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+
+class KeySearch:
+    """A resumable search of the twenties settings of one message."""
+
+    def __init__(self, ciphertext, alphabet, sixes, motions=None, top=10,
+            model=ENGLISH, probe=100, abort_sigmas=2.0, chunk_size=1024,
+            checkpoint=None):
+        """Build a search of ciphertext, which was enciphered with the given
+        plugboard alphabet and 0-based sixes starting position. motions is a
+        list of (fast, middle) switch number pairs to try, by default all 6.
+        The top best settings are kept. model, probe and abort_sigmas control
+        scoring and early rejection, as described in the module
+        documentation. Settings are searched chunk_size at a time.
+
+        If checkpoint is the path of a file, progress is saved to it, and
+        loaded from it if it exists. A KeySearchError is raised if it was
+        saved by a search with different parameters.
+
+        """
+        self.ciphertext = ''.join(ciphertext.split())
+        if not self.ciphertext:
+            raise KeySearchError("no ciphertext to search")
+        self.alphabet = validate_alphabet(alphabet)
+        if not 0 <= sixes < 25:
+            raise SteppingSwitchError("Illegal switch position")
+        self.sixes = sixes
+        motions = MOTIONS if motions is None else tuple(map(tuple, motions))
+        for motion in motions:
+            if motion not in MOTIONS:
+                raise KeySearchError("invalid motion order {}".format(motion))
+        self.motions = motions
+        self.top = top
+        self.model = model
+        self.probe = probe
+        self.abort_sigmas = abort_sigmas
+        self.chunk_size = chunk_size
+        self.checkpoint = checkpoint
+
+        self.chunks = []
+        for motion in MOTIONS:
+            if motion in motions:
+                base = MOTIONS.index(motion) * TRIPLES
+                for start in range(base, base + TRIPLES, chunk_size):
+                    self.chunks.append(range(start,
+                            min(start + chunk_size, base + TRIPLES)))
+        self.done = set()
+        self.heap = []
+        self.full = 0
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._load()
+
+    def _parameters(self):
+        digest = hashlib.sha256(self.ciphertext.encode('ascii')).hexdigest()
+        parameters = {
+            'version': CHECKPOINT_VERSION,
+            'ciphertext_sha256': digest,
+            'alphabet': self.alphabet,
+            'sixes': self.sixes,
+            'motions': [list(motion) for motion in self.motions],
+            'chunk_size': self.chunk_size,
+            'top': self.top,
+            'probe': self.probe,
+            'abort_sigmas': self.abort_sigmas,
+        }
+        path = getattr(self.model, 'path', None)
+        if path is not None:
+            parameters['ngrams'] = os.path.abspath(path)
+        return parameters
+
+    def _load(self):
+        try:
+            with open(self.checkpoint, 'r') as fp:
+                state = json.load(fp)
+            parameters = state['parameters']
+            done = state['done']
+            heap = [(score, -index) for score, index in state['best']]
+            full = state['full']
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            raise KeySearchError('{}: unreadable checkpoint: {}'.format(
+                    self.checkpoint, ex))
+        if parameters != self._parameters():
+            raise KeySearchError('{}: checkpoint is for a different '
+                                 'search'.format(self.checkpoint))
+        self.done = set(done)
+        self.heap = heap
+        heapq.heapify(self.heap)
+        self.full = full
+
+    def save(self):
+        """Writes the progress so far to the checkpoint file, atomically
+        replacing it.
+
+        """
+        state = {
+            'parameters': self._parameters(),
+            'done': sorted(self.done),
+            'best': [[score, -index] for score, index in self.heap],
+            'full': self.full,
+        }
+        directory = os.path.dirname(self.checkpoint) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(state, fp)
+            os.replace(tmp_path, self.checkpoint)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @property
+    def finished(self):
+        return len(self.done) == len(self.chunks)
+
+    def results(self):
+        """Returns a list of the best Candidates so far, best first."""
+        return [Candidate(score, key_sheet(-index, self.sixes))
+                for score, index in sorted(self.heap, reverse=True)]
+
+    def _job(self, number):
+        return (self.ciphertext, self.alphabet, self.sixes,
+                self.chunks[number], self.top, self.model, self.probe,
+                self.abort_sigmas)
+
+    def _finish(self, number, result):
+        entries, full = result
+        _merge(self.heap, entries, self.top)
+        self.full += full
+        self.done.add(number)
+
+    def run(self, jobs=1, progress=None, interval=5.0):
+        """Searches the remaining chunks and returns the best Candidates, best
+        first. If jobs is not 1 the chunks are searched on a pool of jobs
+        worker processes (0 means one per CPU). progress, if given, is called
+        with the numbers of chunks done and in total after each chunk. The
+        checkpoint file, if any, is written at most every interval seconds and
+        when the search stops, even if it is interrupted.
+
+        """
+        pending = [number for number in range(len(self.chunks))
+                   if number not in self.done]
+        last_save = time.monotonic()
+
+        def finished(number, result):
+            nonlocal last_save
+            self._finish(number, result)
+            if progress is not None:
+                progress(len(self.done), len(self.chunks))
+            if (self.checkpoint is not None and
+                    time.monotonic() - last_save >= interval):
+                self.save()
+                last_save = time.monotonic()
+
+        try:
+            if jobs == 1:
+                for number in pending:
+                    finished(number, search_chunk(*self._job(number)))
+            else:
+                self._run_pool(pending, jobs or os.cpu_count() or 1, finished)
+        finally:
+            if self.checkpoint is not None:
+                self.save()
+        return self.results()
+
+    def _run_pool(self, pending, jobs, finished):
+        with ProcessPoolExecutor(jobs) as executor:
+            pending = iter(pending)
+            running = {}
+            try:
+                while True:
+                    while len(running) < 2 * jobs:
+                        number = next(pending, None)
+                        if number is None:
+                            break
+                        running[executor.submit(search_chunk,
+                                *self._job(number))] = number
+                    if not running:
+                        return
+                    completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        finished(running.pop(future), future.result())
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+
+
+def parse_motions(text):
+    """Parses a comma separated list of motion orders such as "12,31" into a
+    list of (fast, middle) pairs. A KeySearchError is raised if any is
+    invalid.
+
+    """
+    motions = []
+    for item in text.split(','):
+        item = item.strip()
+        if len(item) != 2 or not item.isdigit():
+            raise KeySearchError("invalid motion order {!r}".format(item))
+        motion = (int(item[0]), int(item[1]))
+        if motion not in MOTIONS:
+            raise KeySearchError("invalid motion order {!r}".format(item))
+        motions.append(motion)
+    return motions
+
+
+def main(argv=None):
+    """Entry point for the "purple search" command."""
+
+    parser = argparse.ArgumentParser(prog='purple search', description=DESC,
+            epilog=EPILOG)
+    parser.add_argument('input', metavar='FILE',
+        help='file to read the ciphertext from, - for stdin')
+    parser.add_argument('-a', '--alphabet', required=True,
+        help='plugboard alphabet of the message')
+    parser.add_argument('-x', '--sixes', type=int, required=True, metavar='N',
+        help='starting position of the sixes switch, 1-25')
+    parser.add_argument('-m', '--motions',
+        help='motion orders to try, e.g. 12,31 [default: all]')
+    parser.add_argument('-k', '--top', type=int, default=10, metavar='N',
+        help='report the %(metavar)s best settings [default: %(default)s]')
+    parser.add_argument('-j', '--jobs', type=int, default=0, metavar='N',
+        help=('search on %(metavar)s worker processes; a value of 0 means one '
+              'per CPU [default: %(default)s]'))
+    parser.add_argument('-c', '--checkpoint', metavar='FILE',
+        help='save progress to FILE and resume from it if it exists')
+    parser.add_argument('--ngrams', metavar='MODEL',
+        help=('score with the n-gram model in MODEL, built with "purple '
+              'ngrams" [default: English letter frequencies]'))
+    parser.add_argument('--exact', action='store_true',
+        help=('decrypt every setting in full rather than rejecting those '
+              'whose first letters do not read as plaintext; for messages '
+              'that start with a header'))
+
+    args = parser.parse_args(args=argv)
+
+    if not 1 <= args.sixes <= 25:
+        parser.error("The --sixes option must be between 1 and 25")
+    if args.top < 1:
+        parser.error("The --top option must be 1 or greater")
+    if args.jobs < 0:
+        parser.error("The --jobs option must be 0 or greater")
+
+    try:
+        motions = parse_motions(args.motions) if args.motions else None
+        fp = sys.stdin if args.input == '-' else open(args.input, 'r')
+        with fp:
+            ciphertext = fp.read()
+        model = get_model(args.ngrams) if args.ngrams else ENGLISH
+        search = KeySearch(ciphertext, args.alphabet, args.sixes - 1, motions,
+                           args.top, model,
+                           abort_sigmas=None if args.exact else 2.0,
+                           checkpoint=args.checkpoint)
+
+        def progress(done, total):
+            print('\rpurple: {}/{} chunks'.format(done, total), end='',
+                  file=sys.stderr)
+
+        try:
+            results = search.run(args.jobs, progress)
+        finally:
+            print(file=sys.stderr)
+    except (Purple97Error, SteppingSwitchError, OSError) as ex:
+        raise SystemExit(str(ex))
+    except KeyboardInterrupt:
+        raise SystemExit('purple: interrupted; progress saved'
+                         if args.checkpoint else 'purple: interrupted')
+
+    purple = CompiledPurple97()
+    for candidate in results:
+        purple.rekey(candidate.switches, search.alphabet)
+        print('{:12.2f}  {}  {}'.format(candidate.score, candidate.switches,
+                purple.decrypt(search.ciphertext[:40])))
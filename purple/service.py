@@ -0,0 +1,389 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains an asyncio based TCP service that encrypts and
+decrypts messages. It is started with the "purple serve" command.
+
+The protocol is JSON Lines: the client sends one JSON object per line and the
+service answers each with one JSON object per line. A request looks like:
+
+    {"id": 1, "op": "decrypt", "switches": "9-1,24,6-23",
+     "alphabet": "NOKTYUXEQLHBRMPDICJASVWGZF", "text": "ZTXOD..."}
+
+op is either "encrypt" or "decrypt". alphabet may be omitted, in which case
+the straight plugboard is used. id is optional and is echoed back unchanged.
+A reply is either {"id": 1, "text": "..."} or {"id": 1, "error": "..."}.
+
+Connections are persistent and requests may be pipelined: a client can send
+any number of requests without waiting, and the replies on a connection are
+always written in request order.
+
+Requests from all connections are coalesced into batches, which are
+enciphered on a pool of worker processes, so the event loop only parses and
+routes messages. A batch is dispatched once it holds max_batch requests or
+max_letters letters, or max_delay seconds after its first request arrived,
+whichever comes first. Each worker keeps one CompiledPurple97, for long
+messages, and one Purple97 with fused tables, for short ones, and rekeys them
+for every request.
+
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import sys
+
+from purple.compiled import CompiledPurple97
+from purple.machine import Purple97, Purple97Error
+from purple.switch import SteppingSwitchError
+
+
+DESC = """Serve PURPLE encrypt and decrypt requests over TCP"""
+
+EPILOG = """\
+Requests and replies are JSON objects, one per line. See the purple.service
+module documentation for the protocol.
+"""
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9797
+
+# Longest request line accepted, in bytes:
+MAX_LINE = 1024 * 1024
+
+OPS = ('encrypt', 'decrypt')
+
+
+# Messages shorter than this are enciphered with a fused Purple97 rather than a
+# CompiledPurple97, which spends about 0.7 ms relabeling its tables for each
+# new alphabet:
+COMPILE_THRESHOLD = 2048
+
+
+def run_batch(requests):
+    """Worker function: enciphers a batch of (op, switches, alphabet, text)
+    requests and returns a list of (ok, text or error message) pairs.
+
+    """
+    compiled, fused = _worker_machines()
+    results = []
+    for op, switches, alphabet, text in requests:
+        purple = compiled if len(text) >= COMPILE_THRESHOLD else fused
+        try:
+            purple.rekey(switches, alphabet)
+            results.append((True, getattr(purple, op)(text)))
+        except (Purple97Error, SteppingSwitchError) as ex:
+            results.append((False, str(ex)))
+    return results
+
+
+_machines = None
+
+
+def _worker_machines():
+    """Returns the (compiled, fused) machines owned by this worker process."""
+    global _machines
+    if _machines is None:
+        _machines = (CompiledPurple97(), Purple97(fused='full'))
+    return _machines
+
+
+def parse_request(line):
+    """Parses and checks one request line. A 2-tuple of (id, request) is
+    returned, where request is an (op, switches, alphabet, text) tuple for
+    run_batch(). A ValueError is raised for a malformed request; its message is
+    suitable for the client, and the id, if known, is in its second argument.
+
+    """
+    try:
+        obj = json.loads(line)
+    except ValueError as ex:
+        raise ValueError('invalid JSON: {}'.format(ex), None)
+    if not isinstance(obj, dict):
+        raise ValueError('request must be a JSON object', None)
+
+    request_id = obj.get('id')
+    op = obj.get('op')
+    switches = obj.get('switches')
+    alphabet = obj.get('alphabet')
+    text = obj.get('text')
+    if op not in OPS:
+        raise ValueError('op must be "encrypt" or "decrypt"', request_id)
+    if not isinstance(switches, str):
+        raise ValueError('switches must be a string', request_id)
+    if alphabet is not None and not isinstance(alphabet, str):
+        raise ValueError('alphabet must be a string', request_id)
+    if not isinstance(text, str):
+        raise ValueError('text must be a string', request_id)
+
+    return request_id, (op, switches, alphabet, text)
+
+
+def _reply(request_id, ok, value):
+    reply = {} if request_id is None else {'id': request_id}
+    reply['text' if ok else 'error'] = value
+    return (json.dumps(reply) + '\n').encode('utf-8')
+
+
+class PurpleService:
+    """An asyncio TCP server for PURPLE requests."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, jobs=None,
+            max_batch=64, max_letters=64 * 1024, max_delay=0.002,
+            pipeline=256, executor=None):
+        """Build a service listening on host and port (0 picks a free port).
+
+        jobs is the number of worker processes (default: one per CPU), unless
+        an executor is supplied, in which case it is used instead and is not
+        shut down by close(). max_batch, max_letters and max_delay control
+        batching as described in the module documentation. pipeline bounds
+        the number of unanswered requests per connection; reading from a
+        connection pauses when it is reached.
+
+        """
+        self.host = host
+        self.port = port
+        self.jobs = jobs or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.max_letters = max_letters
+        self.max_delay = max_delay
+        self.pipeline = pipeline
+        self.executor = executor
+        self.own_executor = executor is None
+        self.server = None
+        self.queue = None
+        self.batcher = None
+        self.in_flight = None
+        self.connections = set()
+        self.requests = 0
+        self.batches = 0
+
+    async def start(self):
+        """Starts listening and returns the (host, port) actually bound."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.jobs)
+        self.queue = asyncio.Queue()
+        # Keep the workers busy without queueing work in the executor:
+        self.in_flight = asyncio.Semaphore(2 * self.jobs)
+        self.batcher = asyncio.ensure_future(self._batch_requests())
+        self.server = await asyncio.start_server(self._handle, self.host,
+                self.port, limit=MAX_LINE)
+        self.host, self.port = self.server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self):
+        """Serves requests until cancelled."""
+        if self.server is None:
+            await self.start()
+        await self.server.serve_forever()
+
+    async def close(self):
+        """Stops the server, drops any open connections, stops the batcher,
+        and shuts down the process pool if the service created it.
+
+        """
+        if self.server is not None:
+            self.server.close()
+            for task in list(self.connections):
+                task.cancel()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.batcher is not None:
+            self.batcher.cancel()
+            try:
+                await self.batcher
+            except asyncio.CancelledError:
+                pass
+        if self.own_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def submit(self, request):
+        """Queues an (op, switches, alphabet, text) request for the next batch
+        and returns a future for its (ok, value) result.
+
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((request, future))
+        self.requests += 1
+        return future
+
+    async def _batch_requests(self):
+        """Collects queued requests into batches and dispatches them."""
+        loop = asyncio.get_running_loop()
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            if queue.empty() and self.max_delay:
+                await asyncio.sleep(self.max_delay)
+            letters = len(batch[0][0][3])
+            while (len(batch) < self.max_batch and letters < self.max_letters
+                    and not queue.empty()):
+                item = queue.get_nowait()
+                batch.append(item)
+                letters += len(item[0][3])
+
+            await self.in_flight.acquire()
+            self.batches += 1
+            work = loop.run_in_executor(self.executor, run_batch,
+                    [request for request, _ in batch])
+            work.add_done_callback(
+                    lambda work, batch=batch: self._finish_batch(work, batch))
+
+    def _finish_batch(self, work, batch):
+        self.in_flight.release()
+        if work.cancelled():
+            results = [(False, 'service shutting down')] * len(batch)
+        elif work.exception() is not None:
+            results = [(False, 'internal error')] * len(batch)
+        else:
+            results = work.result()
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _handle(self, reader, writer):
+        """Serves one client connection."""
+        task = asyncio.current_task()
+        self.connections.add(task)
+        sender = None
+        try:
+            replies = asyncio.Queue(self.pipeline)
+            sender = asyncio.ensure_future(self._send_replies(replies, writer))
+            await self._read_requests(reader, replies)
+            await replies.put(None)
+            await sender
+        except asyncio.CancelledError:
+            # The service is closing
+            if sender is not None:
+                sender.cancel()
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+    async def _read_requests(self, reader, replies):
+        """Reads request lines from a connection until it is closed and
+        queues a future for the reply to each.
+
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                line = await reader.readline()
+            except (ValueError, asyncio.LimitOverrunError):
+                future = loop.create_future()
+                future.set_result((None, False, 'request line too long'))
+                await replies.put(future)
+                return
+            except ConnectionError:
+                return
+            if not line:
+                return
+            if line.strip():
+                await replies.put(self._submit_line(loop, line))
+
+    def _submit_line(self, loop, line):
+        """Returns a future for the (id, ok, value) reply to a request line."""
+        try:
+            request_id, request = parse_request(line)
+        except ValueError as ex:
+            future = loop.create_future()
+            future.set_result((ex.args[1], False, ex.args[0]))
+            return future
+
+        reply = loop.create_future()
+        result = self.submit(request)
+        result.add_done_callback(
+                lambda result: _finish_request(result, reply, request_id))
+        return reply
+
+    async def _send_replies(self, replies, writer):
+        """Writes the replies of one connection in request order. If the
+        client goes away, the remaining replies are still awaited but
+        discarded, so the reading side never blocks on a full queue.
+
+        """
+        connected = True
+        while True:
+            future = await replies.get()
+            if future is None:
+                return
+            reply = _reply(*await future)
+            if not connected:
+                continue
+            writer.write(reply)
+            if replies.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+
+def _finish_request(result, reply, request_id):
+    """Completes the reply future of a request from its (ok, value) result
+    future, replying with an error if the request was cancelled or failed.
+
+    """
+    if reply.done():
+        # The connection was dropped and its replies cancelled
+        return
+    if result.cancelled():
+        reply.set_result((request_id, False, 'service shutting down'))
+    elif result.exception() is not None:
+        reply.set_result((request_id, False, 'internal error'))
+    else:
+        reply.set_result((request_id,) + result.result())
+
+
+def main(argv=None):
+    """Entry point for the "purple serve" command."""
+
+    parser = argparse.ArgumentParser(prog='purple serve', description=DESC,
+            epilog=EPILOG)
+    parser.add_argument('--host', default=DEFAULT_HOST,
+        help='address to listen on [default: %(default)s]')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT,
+        help='TCP port to listen on [default: %(default)s]')
+    parser.add_argument('-j', '--jobs', type=int, default=0, metavar='N',
+        help=('encipher on %(metavar)s worker processes; a value of 0 means '
+              'one per CPU [default: %(default)s]'))
+    parser.add_argument('-b', '--batch', type=int, default=64, metavar='N',
+        help='dispatch at most %(metavar)s requests per batch '
+             '[default: %(default)s]')
+    parser.add_argument('--delay', type=float, default=2.0, metavar='MS',
+        help='wait up to %(metavar)s milliseconds to fill a batch '
+             '[default: %(default)s]')
+
+    args = parser.parse_args(args=argv)
+
+    if args.jobs < 0:
+        parser.error("The --jobs option must be 0 or greater")
+    if args.batch < 1:
+        parser.error("The --batch option must be 1 or greater")
+    if args.delay < 0:
+        parser.error("The --delay option must be 0 or greater")
+
+    service = PurpleService(args.host, args.port, args.jobs or None,
+            max_batch=args.batch, max_delay=args.delay / 1000.0)
+
+    async def serve():
+        async with service:
+            print('purple: listening on {}:{}'.format(service.host,
+                    service.port), file=sys.stderr)
+            await service.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    except OSError as ex:
+        raise SystemExit(str(ex))
@@ -0,0 +1,320 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains the StateGraph class, which describes the cycle
+structure of the PURPLE stepping switches.
+
+The stepping rule in Purple97.step() depends only on the sixes position and on
+the roles of the twenties switches, not on which physical switch plays each
+role. The graph is therefore built over role states (sixes, fast, middle,
+slow), numbered
+
+    index = ((sixes * 25 + fast) * 25 + middle) * 25 + slow
+
+for 25 ** 4 = 390,625 states in all, and the query methods translate to and
+from physical switch positions using the motion order, exactly like
+purple.machine.advance_positions().
+
+Because stepping is invertible, every state lies on exactly one cycle. The
+graph is stored as compact arrays:
+
+    cycle   the cycle number of each state
+    offset  the position of each state along its cycle
+    order   the states of every cycle, in stepping order, cycle after cycle
+    start   the index into order of the first state of each cycle
+    length  the length of each cycle
+
+so that the state k steps after any state, the period of a state, and the
+number of steps between two states are each a few array lookups. (For the
+record, the PURPLE switches form 25 cycles of 15,625 states each.)
+
+Building the graph takes about half a second. get_graph() builds it once and
+saves it in a cache directory, after which it is memory-mapped from the cache
+file (about 2.7 MB).
+
+"""
+from array import array
+from functools import lru_cache
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from purple.machine import Purple97Error
+
+
+NUM_POSITIONS = 25
+NUM_STATES = NUM_POSITIONS ** 4
+
+# Cache file format: a header followed by the arrays, each 8-byte aligned.
+MAGIC = b'PRPLSG01'
+HEADER = struct.Struct('<8s2sII')
+ARRAY_HEADER = struct.Struct('<cxxxI')
+ARRAY_NAMES = ('cycle', 'offset', 'order', 'start', 'length')
+CACHE_NAME = 'stategraph-v1.bin'
+
+_BYTEORDER = b'LE' if sys.byteorder == 'little' else b'BE'
+
+
+class StateGraphError(Purple97Error):
+    """Exception class for unreadable state graph files"""
+
+
+def _typecode(max_value):
+    """Returns the smallest unsigned array typecode holding max_value."""
+    for code in ('B', 'H', 'I', 'L', 'Q'):
+        if max_value < 1 << (8 * array(code).itemsize):
+            return code
+    raise OverflowError("value too large for an array")
+
+
+def successor(index):
+    """Returns the role state index one step after the given one."""
+    sixes, rest = divmod(index, NUM_POSITIONS ** 3)
+    fast, rest = divmod(rest, NUM_POSITIONS ** 2)
+    middle, slow = divmod(rest, NUM_POSITIONS)
+
+    # See Purple97.step() for the rules
+    if sixes == 23 and middle == 24:
+        slow = (slow + 1) % NUM_POSITIONS
+    elif sixes == 24:
+        middle = (middle + 1) % NUM_POSITIONS
+    else:
+        fast = (fast + 1) % NUM_POSITIONS
+    sixes = (sixes + 1) % NUM_POSITIONS
+
+    return ((sixes * NUM_POSITIONS + fast) * NUM_POSITIONS +
+            middle) * NUM_POSITIONS + slow
+
+
+class StateGraph:
+    """The cycle structure of the stepping switch states. Instances are
+    created by build(), load() or get_graph(); the arrays may be array.array
+    objects or memoryviews of a memory-mapped cache file.
+
+    """
+    def __init__(self, cycle, offset, order, start, length):
+        self.cycle = cycle
+        self.offset = offset
+        self.order = order
+        self.start = start
+        self.length = length
+
+    @classmethod
+    def build(cls):
+        """Computes the graph by following every cycle of the step rule."""
+        cycle = array('I', bytes(4 * NUM_STATES))
+        offset = array('I', bytes(4 * NUM_STATES))
+        order = array('I')
+        start = array('I')
+        length = array('I')
+        seen = bytearray(NUM_STATES)
+
+        for first in range(NUM_STATES):
+            if seen[first]:
+                continue
+            number = len(start)
+            start.append(len(order))
+            index = first
+            n = 0
+            while not seen[index]:
+                seen[index] = 1
+                cycle[index] = number
+                offset[index] = n
+                order.append(index)
+                n += 1
+                index = successor(index)
+            length.append(n)
+
+        # Narrow the per-state arrays to the smallest type that fits
+        cycle = array(_typecode(len(length) - 1), cycle)
+        offset = array(_typecode(max(length) - 1), offset)
+        return cls(cycle, offset, order, start, length)
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        """Loads a graph saved with save(). If use_mmap is true the file is
+        memory-mapped rather than read, so that loading is nearly free and
+        the pages are shared between processes. A StateGraphError is raised if
+        the file is not a valid state graph for this platform.
+
+        """
+        with open(path, 'rb') as fp:
+            # mmap cannot map an empty file
+            if os.fstat(fp.fileno()).st_size < HEADER.size:
+                raise StateGraphError("truncated state graph file")
+            if use_mmap:
+                data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = fp.read()
+
+        magic, byteorder, num_states, num_arrays = HEADER.unpack_from(data)
+        if (magic != MAGIC or byteorder != _BYTEORDER or
+                num_states != NUM_STATES or num_arrays != len(ARRAY_NAMES)):
+            raise StateGraphError("not a state graph file for this platform")
+
+        view = memoryview(data)
+        pos = HEADER.size
+        arrays = []
+        for _ in ARRAY_NAMES:
+            pos = _align(pos)
+            if len(data) < pos + ARRAY_HEADER.size:
+                raise StateGraphError("truncated state graph file")
+            code, count = ARRAY_HEADER.unpack_from(data, pos)
+            code = code.decode('ascii')
+            pos = _align(pos + ARRAY_HEADER.size)
+            size = count * array(code).itemsize
+            if len(data) < pos + size:
+                raise StateGraphError("truncated state graph file")
+            arrays.append(view[pos:pos + size].cast(code))
+            pos += size
+        return cls(*arrays)
+
+    def save(self, path):
+        """Writes the graph to path, atomically replacing any existing
+        file.
+
+        """
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(HEADER.pack(MAGIC, _BYTEORDER, NUM_STATES,
+                                     len(ARRAY_NAMES)))
+                for name in ARRAY_NAMES:
+                    values = getattr(self, name)
+                    code = values.typecode if isinstance(values, array) else \
+                           values.format
+                    _pad(fp)
+                    fp.write(ARRAY_HEADER.pack(code.encode('ascii'),
+                                               len(values)))
+                    _pad(fp)
+                    fp.write(bytes(memoryview(values).cast('B')))
+                _pad(fp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @property
+    def num_cycles(self):
+        return len(self.length)
+
+    def index(self, switches_pos, fast_switch, middle_switch):
+        """Returns the role state index of the physical switch positions
+        switches_pos (as in Purple97.__init__) under the given motion order.
+
+        """
+        slow_switch = 6 - fast_switch - middle_switch
+        return (((switches_pos[0] * NUM_POSITIONS +
+                  switches_pos[fast_switch]) * NUM_POSITIONS +
+                 switches_pos[middle_switch]) * NUM_POSITIONS +
+                switches_pos[slow_switch])
+
+    def positions(self, index, fast_switch, middle_switch):
+        """Returns the physical switch positions, as a 4-tuple, of a role
+        state index under the given motion order.
+
+        """
+        sixes, rest = divmod(index, NUM_POSITIONS ** 3)
+        fast, rest = divmod(rest, NUM_POSITIONS ** 2)
+        middle, slow = divmod(rest, NUM_POSITIONS)
+        twenties = [0, 0, 0]
+        twenties[fast_switch - 1] = fast
+        twenties[middle_switch - 1] = middle
+        twenties[5 - fast_switch - middle_switch] = slow
+        return (sixes,) + tuple(twenties)
+
+    def advance(self, switches_pos, fast_switch, middle_switch, n):
+        """Returns the switch positions after n letters; this gives the same
+        result as purple.machine.advance_positions().
+
+        """
+        if n < 0:
+            raise Purple97Error("cannot advance a negative number of letters")
+        index = self.index(switches_pos, fast_switch, middle_switch)
+        number = self.cycle[index]
+        target = self.order[self.start[number] +
+                            (self.offset[index] + n) % self.length[number]]
+        return self.positions(target, fast_switch, middle_switch)
+
+    def period(self, switches_pos, fast_switch, middle_switch):
+        """Returns the number of letters after which the switches return to
+        the given positions.
+
+        """
+        index = self.index(switches_pos, fast_switch, middle_switch)
+        return self.length[self.cycle[index]]
+
+    def cycle_of(self, switches_pos, fast_switch, middle_switch):
+        """Returns the number of the cycle the given positions lie on."""
+        return self.cycle[self.index(switches_pos, fast_switch, middle_switch)]
+
+    def distance(self, start_pos, end_pos, fast_switch, middle_switch):
+        """Returns the smallest number of letters n >= 0 that takes the
+        switches from start_pos to end_pos, or None if end_pos can never be
+        reached from start_pos.
+
+        """
+        a = self.index(start_pos, fast_switch, middle_switch)
+        b = self.index(end_pos, fast_switch, middle_switch)
+        number = self.cycle[a]
+        if self.cycle[b] != number:
+            return None
+        return (self.offset[b] - self.offset[a]) % self.length[number]
+
+    def equivalent(self, a_pos, b_pos, fast_switch, middle_switch):
+        """Returns True if the positions a_pos and b_pos lie on the same
+        cycle, i.e. a machine started at one passes through the other.
+
+        """
+        return (self.cycle_of(a_pos, fast_switch, middle_switch) ==
+                self.cycle_of(b_pos, fast_switch, middle_switch))
+
+
+def _align(pos):
+    return (pos + 7) & ~7
+
+
+def _pad(fp):
+    fp.write(b'\0' * (_align(fp.tell()) - fp.tell()))
+
+
+def cache_dir():
+    """Returns the directory state graph caches are kept in: the
+    PURPLE_CACHE_DIR environment variable if set, or else a purple directory
+    in the user's cache directory.
+
+    """
+    path = os.environ.get('PURPLE_CACHE_DIR')
+    if not path:
+        base = (os.environ.get('XDG_CACHE_HOME') or
+                os.path.join(os.path.expanduser('~'), '.cache'))
+        path = os.path.join(base, 'purple')
+    return path
+
+
+@lru_cache(maxsize=None)
+def get_graph(path=None):
+    """Returns the state graph, memory-mapped from the cache file at path
+    (default: CACHE_NAME in cache_dir()). If the file is missing or invalid
+    the graph is built and, if possible, saved there for next time. The graph
+    is loaded once per process.
+
+    """
+    if path is None:
+        path = os.path.join(cache_dir(), CACHE_NAME)
+    try:
+        return StateGraph.load(path)
+    except (OSError, ValueError, StateGraphError):
+        pass
+
+    graph = StateGraph.build()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        graph.save(path)
+    except OSError:
+        return graph
+    return StateGraph.load(path)
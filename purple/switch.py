@@ -6,7 +6,7 @@
 create the standard switches used on the PURPLE machine.
 
 """
-import purple.data as data
+import purple.wiring as wiring
 
 # "Enum" to name the standard switches:
 SIXES, TWENTIES_1, TWENTIES_2, TWENTIES_3 = range(4)
@@ -20,7 +20,14 @@ class SteppingSwitch:
     """This class simulates a stepping switch, the primary cryptographic element
     in the PURPLE cipher machine.
 
+    The wiring is stored as flat bytes tables indexed by
+    position * num_levels + level. Switches built by create_switch() share the
+    module level tables in purple.wiring rather than holding their own copies.
+
     """
+    __slots__ = ('dec_table', 'enc_table', 'num_positions', 'num_levels',
+                 'pos')
+
     def __init__(self, dec_wiring, enc_wiring=None, init_pos=0):
         """Construct a SteppingSwitch.
 
@@ -34,24 +41,58 @@ class SteppingSwitch:
         init_pos is the initial position of the switch; this defaults to 0.
 
         """
-        self.dec_wiring = dec_wiring
         self.num_positions = len(dec_wiring)
         self.num_levels = len(dec_wiring[0])
 
-        if not all(self.num_levels == len(level) for level in self.dec_wiring):
+        if not all(self.num_levels == len(level) for level in dec_wiring):
             raise SteppingSwitchError("Invalid decrypt wiring dimensions")
 
-        self.enc_wiring = (enc_wiring if enc_wiring else
-                data.build_encrypt_wiring(dec_wiring))
+        if not enc_wiring:
+            enc_wiring = _build_encrypt_wiring(dec_wiring)
 
-        if self.num_positions != len(self.enc_wiring):
+        if self.num_positions != len(enc_wiring):
             raise SteppingSwitchError("Encrypt/Decrypt positions mismatch")
 
-        if not all(self.num_levels == len(level) for level in self.enc_wiring):
+        if not all(self.num_levels == len(level) for level in enc_wiring):
             raise SteppingSwitchError("Invalid encrypt wiring dimensions")
 
+        try:
+            self.dec_table = bytes(n for level in dec_wiring for n in level)
+            self.enc_table = bytes(n for level in enc_wiring for n in level)
+        except (ValueError, TypeError):
+            raise SteppingSwitchError("Invalid wiring levels")
+
         self.set_pos(init_pos)
 
+    @classmethod
+    def from_tables(cls, dec_table, enc_table, num_levels, init_pos=0):
+        """Construct a SteppingSwitch that shares already flattened wiring
+        tables, as found in purple.wiring.DECRYPT_TABLES and ENCRYPT_TABLES. The
+        tables are not copied or validated.
+
+        """
+        switch = cls.__new__(cls)
+        switch.dec_table = dec_table
+        switch.enc_table = enc_table
+        switch.num_levels = num_levels
+        switch.num_positions = len(dec_table) // num_levels
+        switch.set_pos(init_pos)
+        return switch
+
+    @property
+    def dec_wiring(self):
+        """The decrypt wiring as a list of lists, one list per position."""
+        return self._unflatten(self.dec_table)
+
+    @property
+    def enc_wiring(self):
+        """The encrypt wiring as a list of lists, one list per position."""
+        return self._unflatten(self.enc_table)
+
+    def _unflatten(self, table):
+        n = self.num_levels
+        return [list(table[i:i + n]) for i in range(0, len(table), n)]
+
     def set_pos(self, pos):
         """Set the switch position to pos.
         Raises a SteppingSwitchError if pos is out of range.
@@ -77,7 +118,7 @@ class SteppingSwitch:
         returned.
 
         """
-        return self.dec_wiring[self.pos][level]
+        return self.dec_table[self.pos * self.num_levels + level]
 
     def encrypt(self, level):
         """This method is how to determine the output signal from the stepping
@@ -86,7 +127,7 @@ class SteppingSwitch:
         returned.
 
         """
-        return self.enc_wiring[self.pos][level]
+        return self.enc_table[self.pos * self.num_levels + level]
 
 
 def create_switch(switch_type, init_pos=0):
@@ -105,6 +146,24 @@ def create_switch(switch_type, init_pos=0):
     if switch_type not in [SIXES, TWENTIES_1, TWENTIES_2, TWENTIES_3]:
         raise ValueError("illegal switch type")
 
-    return SteppingSwitch(dec_wiring=data.DECRYPT_DATA[switch_type],
-            enc_wiring=data.ENCRYPT_DATA[switch_type],
+    return SteppingSwitch.from_tables(wiring.DECRYPT_TABLES[switch_type],
+            wiring.ENCRYPT_TABLES[switch_type],
+            wiring.NUM_LEVELS[switch_type],
             init_pos=init_pos)
+
+
+def _build_encrypt_wiring(dec_wiring):
+    """Builds a reciprocal encrypt wiring table from the supplied decrypt wiring
+    table. Invalid wiring is reported as a SteppingSwitchError.
+
+    """
+    enc_wiring = []
+    for level in dec_wiring:
+        reciprocal = [None] * len(level)
+        for n, x in enumerate(level):
+            try:
+                reciprocal[x] = n
+            except (IndexError, TypeError):
+                raise SteppingSwitchError("Invalid decrypt wiring contact")
+        enc_wiring.append(reciprocal)
+    return enc_wiring
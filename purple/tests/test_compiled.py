@@ -0,0 +1,105 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import random
+import string
+import unittest
+
+from purple.compiled import (BULK_MIN_LETTERS, CompiledPurple97,
+        level_permutations)
+from purple.machine import Purple97, Purple97Error
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+def random_settings(rng):
+    """Returns a random (switches_pos, fast, middle, alphabet) tuple."""
+    switches_pos = [rng.randrange(25) for _ in range(4)]
+    fast_switch, middle_switch = rng.sample([1, 2, 3], 2)
+    alphabet = list(string.ascii_uppercase)
+    rng.shuffle(alphabet)
+    return switches_pos, fast_switch, middle_switch, ''.join(alphabet)
+
+
+def random_text(rng, n):
+    return ''.join(rng.choice(string.ascii_uppercase) for _ in range(n))
+
+
+class CompiledPurple97TestCase(unittest.TestCase):
+
+    def test_decrypt_part_1_message(self):
+
+        purple = CompiledPurple97.from_key_sheet(
+                switches='9-1,24,6-23',
+                alphabet='NOKTYUXEQLHBRMPDICJASVWGZF')
+
+        self.assertEqual(purple.decrypt(PT1_CT), PT1_PT)
+
+    def test_matches_reference(self):
+
+        rng = random.Random(97)
+        for _ in range(50):
+            settings = random_settings(rng)
+            text = random_text(rng, rng.randrange(1, 1500))
+
+            reference = Purple97(*settings)
+            compiled = CompiledPurple97(*settings)
+
+            self.assertEqual(compiled.encrypt(text), reference.encrypt(text))
+            self.assertEqual(compiled.decrypt(text), reference.decrypt(text))
+            self.assertEqual(compiled.sixes.pos, reference.sixes.pos)
+            self.assertEqual([s.pos for s in compiled.twenties],
+                             [s.pos for s in reference.twenties])
+
+    def test_bulk_matches_loop(self):
+
+        rng = random.Random(15)
+        for _ in range(30):
+            settings = random_settings(rng)
+            n = rng.randrange(BULK_MIN_LETTERS, 5000)
+            text = ''.join(rng.choice(string.ascii_uppercase + '-')
+                           for _ in range(n))
+
+            reference = Purple97(*settings)
+            compiled = CompiledPurple97(*settings)
+
+            self.assertEqual(compiled.decrypt(text), reference.decrypt(text))
+            self.assertEqual(compiled.get_state(), reference.get_state())
+            plaintext = text.replace('-', 'X')
+            self.assertEqual(compiled.encrypt(plaintext),
+                             reference.encrypt(plaintext))
+            self.assertEqual(compiled.get_state(), reference.get_state())
+
+    def test_garbles(self):
+
+        purple = CompiledPurple97()
+        reference = Purple97()
+        text = 'AB--CDEF-G'
+        self.assertEqual(purple.decrypt(text), reference.decrypt(text))
+
+    def test_bad_input(self):
+
+        purple = CompiledPurple97()
+        self.assertRaises(Purple97Error, purple.encrypt, 'ABC-D')
+        self.assertRaises(Purple97Error, purple.encrypt, 'abc')
+        self.assertRaises(Purple97Error, purple.decrypt, 'AB CD')
+        self.assertRaises(Purple97Error, purple.decrypt, 'ABÉ')
+
+    def test_level_permutations(self):
+
+        alphabet = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+        levels = {c: n for n, c in enumerate(alphabet)}
+        text = 'THEQUICKBROWNFOX'
+        reference = Purple97.from_key_sheet('9-1,24,6-23', alphabet)
+        ciphertext = reference.encrypt(text)
+
+        purple = Purple97.from_key_sheet('9-1,24,6-23', alphabet)
+        perms = level_permutations(purple, len(text))
+        self.assertEqual(purple.get_state(), reference.get_state())
+        for perm, c, p in zip(perms, ciphertext, text):
+            self.assertEqual(alphabet[perm[levels[c]]], p)
+
+        purple = Purple97.from_key_sheet('9-1,24,6-23', alphabet)
+        perms = level_permutations(purple, len(text), decrypt=False)
+        for perm, c, p in zip(perms, ciphertext, text):
+            self.assertEqual(alphabet[perm[levels[p]]], c)
@@ -0,0 +1,81 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import unittest
+
+from purple.crib import CribError, CribSolver
+from purple.machine import Purple97
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+PLAINTEXT = ''.join(PT1_PT.split())
+
+
+def agrees(partial, alphabet):
+    return all(c in ('?', a) for c, a in zip(partial, alphabet))
+
+
+class CribSolverTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.solver = CribSolver(PT1_CT, SWITCHES)
+
+    def test_unique(self):
+        crib = PLAINTEXT[300:330]
+        self.assertEqual(self.solver.solve(crib, 300),
+                         ['NOKTYUXEQLHBRMPDIC?ASVW?Z?'])
+
+    def test_several(self):
+        crib = PLAINTEXT[300:320]
+        alphabets = self.solver.solve(crib, 300)
+        self.assertGreater(len(alphabets), 1)
+        self.assertTrue(any(agrees(a, ALPHABET) for a in alphabets))
+        # Every alphabet deciphers the crib
+        for partial in alphabets:
+            levels = {c: n for n, c in enumerate(partial) if c != '?'}
+            for i, p in enumerate(crib, 300):
+                perm = self.solver.decrypt_perms[i]
+                c = self.solver.text[i]
+                self.assertEqual(perm[levels[c]], levels[p])
+
+    def test_limit(self):
+        crib = PLAINTEXT[300:308]
+        self.assertEqual(len(self.solver.solve(crib, 300, limit=5)), 5)
+
+    def test_rejected(self):
+        crib = PLAINTEXT[300:330]
+        self.assertEqual(self.solver.solve(crib, 301), [])
+        self.assertIsNone(self.solver.domains(crib, 301))
+
+    def test_domains(self):
+        domains = self.solver.domains(PLAINTEXT[300:330], 300)
+        for letter, levels in domains.items():
+            self.assertIn(ALPHABET.index(letter), levels)
+
+    def test_placements(self):
+        crib = PLAINTEXT[300:330]
+        self.assertEqual(self.solver.placements(crib), [300])
+        self.assertEqual(self.solver.placements(crib, 250, 290), [])
+
+    def test_self_encipherment_and_garbles(self):
+        # Find a position where a letter deciphers to itself
+        purple = Purple97.from_key_sheet(SWITCHES, ALPHABET)
+        ciphertext = purple.encrypt('A' * 200)
+        i = ciphertext.index('A')
+        solver = CribSolver(ciphertext[:i] + '-' + ciphertext[i + 1:],
+                            SWITCHES)
+        self.assertTrue(any(agrees(a, ALPHABET)
+                            for a in solver.solve('A' * 40, 0)))
+        solver = CribSolver(ciphertext, SWITCHES)
+        self.assertTrue(any(agrees(a, ALPHABET)
+                            for a in solver.solve('A' * 40, i - 20)))
+
+    def test_bad_crib(self):
+        self.assertRaises(CribError, self.solver.solve, '', 0)
+        self.assertRaises(CribError, self.solver.solve, 'AB1', 0)
+        self.assertRaises(CribError, self.solver.solve, 'ABC', -1)
+        self.assertRaises(CribError, self.solver.solve, 'ABC', 1284)
@@ -0,0 +1,42 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import os
+import unittest
+
+import purple.data as data
+import purple.wiring as wiring
+
+
+class DataTestCase(unittest.TestCase):
+
+    def test_wiring_matches_source(self):
+
+        decrypt, encrypt = data.build_tables()
+        self.assertEqual(list(wiring.DECRYPT_TABLES), decrypt)
+        self.assertEqual(list(wiring.ENCRYPT_TABLES), encrypt)
+        self.assertEqual(wiring.NUM_LEVELS, [6, 20, 20, 20])
+
+    def test_wiring_module_is_current(self):
+
+        path = os.path.join(os.path.dirname(wiring.__file__), 'wiring.py')
+        with open(path) as fp:
+            self.assertEqual(fp.read(), data.generate_wiring_module())
+
+    def test_tables_are_permutations(self):
+
+        for n, dec, enc in zip(wiring.NUM_LEVELS, wiring.DECRYPT_TABLES,
+                               wiring.ENCRYPT_TABLES):
+            self.assertEqual(len(dec), 25 * n)
+            for i in range(0, len(dec), n):
+                self.assertEqual(sorted(dec[i:i + n]), list(range(n)))
+                for level in range(n):
+                    self.assertEqual(enc[i + dec[i + level]], level)
+
+    def test_list_views(self):
+
+        self.assertEqual(data.DECRYPT_DATA[0][0], [1, 0, 2, 4, 3, 5])
+        self.assertEqual(data.SIXES_DATA[0], [2, 1, 3, 5, 4, 6])
+        self.assertEqual(data.ENCRYPT_DATA,
+                [data.build_encrypt_wiring(w) for w in data.DECRYPT_DATA])
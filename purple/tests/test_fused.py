@@ -0,0 +1,66 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import random
+import unittest
+
+import purple.fused as fused
+from purple.machine import Purple97, Purple97Error
+from purple.tests.test_compiled import random_settings, random_text
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+class FusedTestCase(unittest.TestCase):
+
+    def test_full_matches_rows(self):
+
+        dec, enc = fused.full_tables()
+        self.assertEqual(len(dec), 25 * 25 * 25 * 20)
+        self.assertEqual(len(enc), 25 * 25 * 25 * 20)
+        rng = random.Random(10)
+        for _ in range(100):
+            p1, p2, p3 = (rng.randrange(25) for _ in range(3))
+            i = ((p1 * 25 + p2) * 25 + p3) * 20
+            self.assertEqual(dec[i:i + 20], fused.decrypt_row(p1, p2, p3))
+            self.assertEqual(enc[i:i + 20], fused.encrypt_row(p1, p2, p3))
+
+    def test_rows_are_inverses(self):
+
+        for p in ((0, 0, 0), (3, 17, 24), (24, 24, 24)):
+            dec = fused.decrypt_row(*p)
+            enc = fused.encrypt_row(*p)
+            self.assertEqual([dec[enc[n]] for n in range(20)], list(range(20)))
+
+    def test_decrypt_part_1_message(self):
+
+        purple = Purple97.from_key_sheet(
+                switches='9-1,24,6-23',
+                alphabet='NOKTYUXEQLHBRMPDICJASVWGZF',
+                fused=fused.FULL)
+        self.assertEqual(purple.decrypt(PT1_CT), PT1_PT)
+
+    def test_matches_unfused(self):
+
+        rng = random.Random(1010)
+        for _ in range(20):
+            settings = random_settings(rng)
+            text = random_text(rng, 300)
+            expected = Purple97(*settings).encrypt(text)
+            purple = Purple97(*settings, fused=fused.FULL)
+            self.assertEqual(purple.encrypt(text), expected)
+            purple = Purple97(*settings, fused=fused.FULL)
+            self.assertEqual(purple.decrypt(expected), text)
+
+    def test_invalid_mode(self):
+
+        self.assertRaises(Purple97Error, Purple97, fused='bogus')
+        self.assertRaises(Purple97Error, Purple97, fused='lru')
+        self.assertRaises(ValueError, fused.get_table, 'bogus')
+
+    def test_tables_are_shared(self):
+
+        self.assertIs(fused.get_table(fused.FULL), fused.get_table(fused.FULL))
+        a = Purple97(fused=fused.FULL)
+        b = Purple97(fused=fused.FULL)
+        self.assertIs(a.fused, b.fused)
@@ -0,0 +1,68 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import random
+import unittest
+
+from purple.hillclimb import PlugboardSolver
+from purple.machine import Purple97, Purple97Error
+from purple.tests.test_machine import PT1_CT
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+class PlugboardSolverTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.solver = PlugboardSolver(PT1_CT, SWITCHES)
+
+    def test_decrypt(self):
+        rng = random.Random(1)
+        ciphertext = ''.join(PT1_CT.split())
+        for _ in range(3):
+            alphabet = ''.join(rng.sample(ALPHABET, 26))
+            purple = Purple97.from_key_sheet(SWITCHES, alphabet)
+            self.assertEqual(self.solver.decrypt(alphabet),
+                             purple.decrypt(ciphertext))
+
+    def test_garbles(self):
+        solver = PlugboardSolver('NBJ-F PDOXO', SWITCHES)
+        purple = Purple97.from_key_sheet(SWITCHES, ALPHABET)
+        self.assertEqual(solver.decrypt(ALPHABET),
+                         purple.decrypt('NBJ-FPDOXO'))
+
+    def test_invalid(self):
+        self.assertRaises(Purple97Error, PlugboardSolver, 'ABC1', SWITCHES)
+        self.assertRaises(Purple97Error, self.solver.decrypt, 'ABC')
+
+    def test_climb_score(self):
+        # The incrementally kept score matches a full rescoring
+        solution = self.solver.climb(seed=7)
+        self.assertAlmostEqual(solution.score,
+                               self.solver.score(solution.alphabet), places=6)
+        self.assertGreater(solution.score,
+                           self.solver.score(Purple97.STRAIGHT_PLUGBOARD))
+
+    def test_climb_recovers(self):
+        rng = random.Random(2)
+        letters = list(ALPHABET)
+        for _ in range(3):
+            i, j = rng.sample(range(26), 2)
+            letters[i], letters[j] = letters[j], letters[i]
+        solution = self.solver.climb(''.join(letters), seed=2)
+        self.assertEqual(solution.alphabet, ALPHABET)
+
+    def test_solve(self):
+        solutions = self.solver.solve(restarts=6, top=3)
+        self.assertEqual(len(solutions), 3)
+        scores = [s.score for s in solutions]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(self.solver.solve(restarts=6, top=3), solutions)
+
+    def test_solve_processes(self):
+        self.assertEqual(self.solver.solve(restarts=4, jobs=2, top=2),
+                         self.solver.solve(restarts=4, top=2))
@@ -0,0 +1,91 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import contextlib
+import io
+import random
+import unittest
+
+from purple.compiled import CompiledPurple97
+import purple.instrument as instrument
+from purple.machine import Purple97
+import purple.main
+from purple.tests.test_compiled import random_settings, random_text
+
+
+def count_motions(purple, n):
+    """Steps purple n times and counts the fast, middle, and slow motions by
+    watching the switch positions.
+
+    """
+    counts = [0, 0, 0]
+    for _ in range(n):
+        before = [purple.fast_switch.pos, purple.middle_switch.pos,
+                  purple.slow_switch.pos]
+        purple._step()
+        after = [purple.fast_switch.pos, purple.middle_switch.pos,
+                 purple.slow_switch.pos]
+        for i in range(3):
+            counts[i] += before[i] != after[i]
+    return counts
+
+
+class InstrumentTestCase(unittest.TestCase):
+
+    def test_motions_match_stepping(self):
+
+        rng = random.Random(12)
+        for cls in (Purple97, CompiledPurple97):
+            for _ in range(20):
+                settings = random_settings(rng)
+                text = random_text(rng, rng.randrange(2000))
+                purple = cls(*settings)
+                stats = instrument.attach(purple)
+                purple.encrypt(text)
+
+                expected = count_motions(Purple97(*settings), len(text))
+                self.assertEqual([stats.fast_steps, stats.middle_steps,
+                                  stats.slow_steps], expected)
+                self.assertEqual(stats.letters, len(text))
+                self.assertEqual(stats.calls, 1)
+
+    def test_garbles_and_step(self):
+
+        purple = Purple97()
+        stats = instrument.attach(purple)
+        purple.decrypt('AB-CD--E')
+        purple.step()
+        self.assertEqual(stats.letters, 8)
+        self.assertEqual(stats.garbles, 3)
+        self.assertEqual(stats.fast_steps, 9)
+        self.assertEqual(stats.calls, 2)
+
+        instrument.detach(purple)
+        purple.decrypt('ABC')
+        self.assertEqual(stats.letters, 8)
+
+        stats.reset()
+        self.assertEqual(set(stats.as_dict().values()), {0})
+
+    def test_phase_timer(self):
+
+        timer = instrument.PhaseTimer()
+        items = list(timer.timed('outer', timer.timed('inner', range(3))))
+        with timer.phase('body'):
+            pass
+        self.assertEqual(items, [0, 1, 2])
+        totals = timer.report()
+        self.assertTrue({'inner', 'outer', 'body', 'other'} <= set(totals))
+        self.assertLessEqual(sum(totals.values()), timer.elapsed())
+
+    def test_main_stats(self):
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(stderr):
+            purple.main.main(['-d', '-t', 'ABCD-EFG', '--stats'])
+        report = stderr.getvalue()
+        self.assertIn('8 letters (1 garbles)', report)
+        self.assertIn('fast 8, middle 0, slow 0', report)
+        self.assertIn('cipher', report)
@@ -0,0 +1,72 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import random
+import string
+import unittest
+
+from purple.isomorph import IsomorphIndex, fingerprint, fingerprints, pattern
+from purple.machine import Purple97
+from purple.tests.test_compiled import random_text
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+class IsomorphTestCase(unittest.TestCase):
+
+    def test_pattern(self):
+
+        self.assertEqual(pattern('QXRQM'), (0, 0, 0, 3, 0))
+        self.assertEqual(pattern('BDABK'), pattern('QXRQM'))
+        self.assertEqual(fingerprint('BDABK'), fingerprint('QXRQM'))
+        self.assertNotEqual(fingerprint('QXRQQ'), fingerprint('QXRQM'))
+
+    def test_rolling(self):
+
+        text = random_text(random.Random(1), 2000)
+        for window in (2, 7, 16):
+            expected = [(s, fingerprint(text[s:s + window]))
+                        for s in range(len(text) - window + 1)]
+            self.assertEqual(list(fingerprints(text, window, 0)), expected)
+
+        windows = list(fingerprints(text, 16, 5))
+        self.assertTrue(0 < len(windows) < len(text) - 15)
+        for s, _ in windows:
+            self.assertGreaterEqual(16 - len(set(text[s:s + 16])), 5)
+        self.assertEqual(list(fingerprints('ABC', 16, 0)), [])
+
+    def test_depth(self):
+
+        # The second message starts 100 letters later on the same switches,
+        # under a relabeled alphabet, with correspondingly relabeled text.
+        rng = random.Random(2)
+        plaintext = random_text(rng, 300)
+        first = Purple97.from_key_sheet(SWITCHES, ALPHABET)
+        m1 = first.encrypt(plaintext[:200])
+
+        letters = list(string.ascii_uppercase)
+        rng.shuffle(letters)
+        relabel = str.maketrans(string.ascii_uppercase, ''.join(letters))
+        second = Purple97.from_key_sheet(SWITCHES,
+                                         ALPHABET.translate(relabel))
+        second.advance(100)
+        m2 = second.encrypt(plaintext[100:].translate(relabel))
+        self.assertEqual(m2[:100], m1[100:].translate(relabel))
+
+        with IsomorphIndex(partitions=4) as index:
+            self.assertEqual(index.add(m1), 0)
+            index.add(random_text(rng, 500))
+            self.assertEqual(index.add(m2), 2)
+
+            depths = index.depths()
+            self.assertEqual(len(depths), 1)
+            depth = depths[0]
+            self.assertEqual(depth[:3], (0, 2, 100))
+            self.assertGreater(depth.hits, 40)
+
+            for iso in index.isomorphs():
+                self.assertLessEqual(iso.first, iso.second)
+        self.assertIsNone(index.directory)
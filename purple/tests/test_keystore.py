@@ -0,0 +1,144 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from purple.keystore import KeyStore, KeyStoreError, main, read_keys
+from purple.machine import Purple97, Purple97Error
+from purple.switch import SteppingSwitchError
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+class KeyStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'keys.db')
+        self.store = KeyStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir)
+
+    def test_add_and_get(self):
+
+        record = self.store.add('1941-12-07', SWITCHES, ALPHABET.lower())
+        self.assertEqual(record.alphabet, ALPHABET)
+        self.assertEqual(record.switches_pos, (8, 0, 23, 5))
+        self.assertEqual((record.fast_switch, record.middle_switch), (2, 3))
+
+        self.assertEqual(self.store.get('1941-12-07'), record)
+        self.assertIsNone(self.store.get('1941-12-08'))
+        self.assertIn('1941-12-07', self.store)
+        self.assertEqual(len(self.store), 1)
+
+        purple = self.store.machine('1941-12-07')
+        self.assertEqual(purple.decrypt(PT1_CT), PT1_PT)
+        purple = self.store.machine('1941-12-07', Purple97)
+        self.assertEqual(purple.decrypt(PT1_CT), PT1_PT)
+        self.assertRaises(KeyStoreError, self.store.machine, 'nope')
+
+        # Replacing a key is seen through the cache
+        self.store.add('1941-12-07', '1-1,1,1-12')
+        self.assertEqual(self.store.get('1941-12-07').switches, '1-1,1,1-12')
+        self.assertTrue(self.store.remove('1941-12-07'))
+        self.assertFalse(self.store.remove('1941-12-07'))
+        self.assertIsNone(self.store.get('1941-12-07'))
+
+    def test_invalid_keys(self):
+
+        self.assertRaises(Purple97Error, self.store.add, 'a', '9-1,24,6-22')
+        self.assertRaises(SteppingSwitchError, self.store.add, 'a',
+                          '26-1,24,6-23')
+        self.assertRaises(Purple97Error, self.store.add, 'a', SWITCHES,
+                          'ABC')
+
+        # A bad key stores nothing
+        keys = [('a', SWITCHES, None), ('b', 'junk', None)]
+        with self.assertRaises(Purple97Error) as cm:
+            self.store.add_many(keys)
+        self.assertIn('b', str(cm.exception))
+        self.assertEqual(len(self.store), 0)
+
+        # Settings that are not strings are reported, not raised as is
+        for keys in ([('a', SWITCHES, None), ('b', 91, None)],
+                     [('a', SWITCHES, None), ('b', SWITCHES, 26)]):
+            with self.assertRaises(KeyStoreError) as cm:
+                self.store.add_many(keys)
+            self.assertIn('b', str(cm.exception))
+        self.assertEqual(len(self.store), 0)
+
+    def test_bulk(self):
+
+        keys = [('1941-12-{:02d}'.format(day),
+                 '{}-1,24,6-23'.format(day % 25 + 1), ALPHABET)
+                for day in range(1, 32)]
+        self.assertEqual(self.store.add_many(keys), len(keys))
+
+        found = self.store.get_many(['1941-12-01', '1941-12-31', 'nope'])
+        self.assertEqual(sorted(found), ['1941-12-01', '1941-12-31'])
+        self.assertEqual(found['1941-12-31'].switches_pos[0], 6)
+
+        self.assertEqual(list(self.store.names('1941-12-1')),
+                         ['1941-12-{}'.format(day) for day in range(10, 20)])
+        self.assertEqual(len(list(self.store.names())), 31)
+
+    def test_reopen(self):
+
+        self.store.add('1941-12-07', SWITCHES, ALPHABET)
+        self.store.close()
+        self.store = KeyStore(self.path, readonly=True)
+        self.assertEqual(self.store.get('1941-12-07').alphabet, ALPHABET)
+
+        self.assertRaises(KeyStoreError, KeyStore,
+                          os.path.join(self.dir, 'missing.db'), readonly=True)
+
+        # Characters with a meaning in URIs are taken as part of the path
+        self.store.close()
+        path = os.path.join(self.dir, 'keys?#%.db')
+        with KeyStore(path) as store:
+            store.add('1941-12-07', SWITCHES, ALPHABET)
+        self.store = KeyStore(path, readonly=True)
+        self.assertEqual(self.store.get('1941-12-07').alphabet, ALPHABET)
+
+    def test_read_keys(self):
+
+        path = os.path.join(self.dir, 'keys.csv')
+        with open(path, 'w') as fp:
+            fp.write('name,switches,alphabet\n')
+            fp.write('a,"{}",{}\n'.format(SWITCHES, ALPHABET))
+            fp.write('b,"1-1,1,1-12",\n')
+        self.assertEqual(list(read_keys(path)),
+                         [('a', SWITCHES, ALPHABET), ('b', '1-1,1,1-12', None)])
+
+        path = os.path.join(self.dir, 'keys.jsonl')
+        with open(path, 'w') as fp:
+            fp.write(json.dumps(dict(name='a', switches=SWITCHES)) + '\n')
+            fp.write(json.dumps(dict(name='b')) + '\n')
+        keys = read_keys(path)
+        self.assertEqual(next(keys), ('a', SWITCHES, None))
+        self.assertRaises(KeyStoreError, next, keys)
+
+        with open(path, 'w') as fp:
+            fp.write(json.dumps(dict(name='a', switches=[9, 1])) + '\n')
+        with self.assertRaises(KeyStoreError) as cm:
+            list(read_keys(path))
+        self.assertIn('switches must be a string', str(cm.exception))
+
+    def test_main(self):
+
+        self.store.close()
+        main([self.path, 'add', 'a', SWITCHES, ALPHABET])
+        main([self.path, 'remove', 'a'])
+        self.assertRaises(SystemExit, main, [self.path, 'add', 'b', 'junk'])
+        self.store = KeyStore(self.path)
+        self.assertEqual(len(self.store), 0)
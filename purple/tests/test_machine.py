@@ -5,7 +5,7 @@
 import string
 import unittest
 
-from purple.machine import Purple97, Purple97Error
+from purple.machine import Purple97, Purple97Error, advance_positions
 from purple.switch import SteppingSwitchError
 
 
@@ -235,3 +235,104 @@ class Purple97TestCase(unittest.TestCase):
                     mismatches)
 
         self.assertTrue(len(mismatches) == 0, msg)
+
+    def test_get_set_state(self):
+
+        purple = Purple97.from_key_sheet('9-1,24,6-23')
+        self.assertEqual(purple.get_state(), (8, 0, 23, 5))
+        self.assertEqual(purple.initial_state, (8, 0, 23, 5))
+
+        purple.set_state((1, 2, 3, 4))
+        self.assertEqual(purple.get_state(), (1, 2, 3, 4))
+        self.assertEqual(purple.sixes.pos, 1)
+        self.assertEqual([s.pos for s in purple.twenties], [2, 3, 4])
+
+        self.assertRaises(Purple97Error, purple.set_state, (1, 2, 3))
+        self.assertRaises(SteppingSwitchError, purple.set_state, (1, 2, 3, 25))
+
+    def test_advance_positions(self):
+
+        # Start from every sixes position with the middle switch near its
+        # last position to exercise the slow switch motion.
+        for sixes in range(25):
+            for middle_pos in (0, 23, 24):
+                for fast, middle in ((1, 2), (2, 3), (3, 1)):
+                    start = [sixes, 7, 7, 7]
+                    start[middle] = middle_pos
+                    purple = Purple97(start, fast, middle)
+                    for n in range(700):
+                        self.assertEqual(purple.get_state(),
+                                advance_positions(start, fast, middle, n))
+                        purple.step()
+
+        self.assertRaises(Purple97Error, advance_positions, (0, 0, 0, 0), 1,
+                2, -1)
+
+    def test_advance_and_seek(self):
+
+        purple = Purple97.from_key_sheet('9-1,24,6-23',
+                alphabet='NOKTYUXEQLHBRMPDICJASVWGZF')
+        purple.advance(100)
+        self.assertEqual(purple.decrypt(PT1_CT[100:200]), PT1_PT[100:200])
+
+        purple.seek(1000)
+        self.assertEqual(purple.decrypt(PT1_CT[1000:]), PT1_PT[1000:])
+
+        purple.seek(0)
+        self.assertEqual(purple.decrypt(PT1_CT[:50]), PT1_PT[:50])
+
+    def test_streaming(self):
+
+        settings = dict(switches='9-1,24,6-23',
+                        alphabet='NOKTYUXEQLHBRMPDICJASVWGZF')
+
+        decryptor = Purple97.from_key_sheet(**settings).decryptor()
+        chunks = [PT1_CT[i:i + 37] for i in range(0, len(PT1_CT), 37)]
+        output = [decryptor.update(chunk) for chunk in chunks]
+        output.append(decryptor.finalize())
+        self.assertEqual(''.join(output), PT1_PT)
+        self.assertEqual(decryptor.count, len(PT1_PT))
+        self.assertRaises(Purple97Error, decryptor.update, 'ABC')
+
+        plaintext = PT1_PT.replace('-', 'X')
+        expected = Purple97.from_key_sheet(**settings).encrypt(plaintext)
+        encryptor = Purple97.from_key_sheet(**settings).encryptor()
+        output = [encryptor.update(plaintext[i:i + 100])
+                  for i in range(0, len(plaintext), 100)]
+        output.append(encryptor.finalize())
+        self.assertEqual(''.join(output), expected)
+
+    def test_rekey_and_reset(self):
+
+        purple = Purple97.from_key_sheet('1-1,1,1-12')
+        switches = purple.twenties
+        purple.encrypt('HELLOTHERE')
+
+        purple.rekey('9-1,24,6-23', 'NOKTYUXEQLHBRMPDICJASVWGZF')
+        self.assertIs(purple.twenties, switches)
+        self.assertEqual(purple.motion, (2, 3, 1))
+        self.assertEqual(purple.decrypt(PT1_CT[:100]), PT1_PT[:100])
+
+        purple.reset()
+        self.assertEqual(purple.decrypt(PT1_CT), PT1_PT)
+
+        alphabet = string.ascii_lowercase
+        fresh = Purple97.from_key_sheet('5-10,20,3-31', alphabet)
+        purple.rekey('5-10,20,3-31', alphabet)
+        self.assertEqual(purple.get_state(), fresh.get_state())
+        self.assertEqual(purple.alphabet, fresh.alphabet)
+        self.assertIs(purple.slow_switch, purple.twenties[1])
+        self.assertEqual(purple.encrypt('ATTACKATDAWN'),
+                         fresh.encrypt('ATTACKATDAWN'))
+
+    def test_bad_rekey(self):
+
+        purple = Purple97.from_key_sheet('9-1,24,6-23',
+                                         'NOKTYUXEQLHBRMPDICJASVWGZF')
+        state = purple.get_state()
+        self.assertRaises(Purple97Error, purple.rekey, '1-1,1,1-11')
+        self.assertRaises(Purple97Error, purple.rekey, '1-1,1-12')
+        self.assertRaises(SteppingSwitchError, purple.rekey, '26-1,1,1-12')
+        self.assertRaises(Purple97Error, purple.rekey, '1-1,1,1-12', 'A' * 26)
+        self.assertEqual(purple.get_state(), state)
+        self.assertEqual(purple.alphabet, 'NOKTYUXEQLHBRMPDICJASVWGZF')
@@ -0,0 +1,110 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import importlib
+import io
+import os
+import random
+import subprocess
+import sys
+import textwrap
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import purple
+from purple.main import (EPILOG, SUBCOMMANDS, OutputFormatter,
+        filter_plaintext, filter_whitespace, group_text, read_chunks)
+
+
+def reference_format(text, group, width):
+    """Formats text the way the command-line program did before output was
+    streamed.
+
+    """
+    if group != 0:
+        text = group_text(text, group)
+    if width != 0:
+        text = textwrap.fill(text, width=width, expand_tabs=False,
+                replace_whitespace=False, drop_whitespace=False,
+                break_long_words=group == 0)
+    return text + '\n'
+
+
+class MainTestCase(unittest.TestCase):
+
+    def test_filters(self):
+
+        source = ['The PURPLE', ' machine, 42!\n']
+        self.assertEqual(''.join(filter_plaintext(source)),
+                'THEPURPLEMACHINEFOURTWO')
+        self.assertEqual(''.join(filter_whitespace(source)),
+                'ThePURPLEmachine,42!')
+
+    def test_read_chunks(self):
+
+        fp = io.StringIO('ABCDEFGHIJ')
+        self.assertEqual(list(read_chunks(fp, 4)), ['ABCD', 'EFGH', 'IJ'])
+
+    def test_output_formatter(self):
+
+        rng = random.Random(5)
+        for _ in range(500):
+            group = rng.choice([0, 1, 3, 5, 8])
+            width = rng.choice([0, 1, 4, 5, 6, 11, 70])
+            text = ''.join(rng.choice('ABC-')
+                           for _ in range(rng.randrange(300)))
+
+            fp = io.StringIO()
+            formatter = OutputFormatter(fp, group, width)
+            i = 0
+            while i < len(text):
+                n = rng.randrange(1, 30)
+                formatter.write(text[i:i + n])
+                i += n
+            formatter.close()
+
+            self.assertEqual(fp.getvalue(),
+                    reference_format(text, group, width))
+
+    def test_output_formatter_garbles(self):
+
+        # textwrap also breaks ungrouped text after garbles, depending on the
+        # letters around them
+        rng = random.Random(7)
+        texts = ['A--A', 'AA-A-AA', 'ABC-DEF-G', 'A-' * 20, 'AB---CD' * 5]
+        texts += [''.join(rng.choice('AB-') for _ in range(200))
+                  for _ in range(50)]
+        for text in texts:
+            for width in (1, 2, 3, 5, 9):
+                for size in (1, 2, 5, 50):
+                    fp = io.StringIO()
+                    formatter = OutputFormatter(fp, 0, width)
+                    for i in range(0, len(text), size):
+                        formatter.write(text[i:i + size])
+                    formatter.close()
+                    self.assertEqual(fp.getvalue(),
+                            reference_format(text, 0, width))
+
+    def test_lazy_imports(self):
+
+        # A plain encrypt or decrypt does not pay for the modules only some
+        # options need
+        code = ('import sys, purple.main; print(sorted(name for name in '
+                '("concurrent.futures", "purple.instrument", '
+                '"purple.parallel", "purple.resync") if name in sys.modules))')
+        root = os.path.dirname(os.path.dirname(purple.__file__))
+        output = subprocess.check_output([sys.executable, '-c', code],
+                cwd=root, universal_newlines=True)
+        self.assertEqual(output.strip(), '[]')
+
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_subcommands(self):
+
+        for name, module in SUBCOMMANDS.items():
+            self.assertTrue(callable(importlib.import_module(module).main))
+            self.assertIn('\n  {} '.format(name), EPILOG)
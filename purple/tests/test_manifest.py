@@ -0,0 +1,139 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from purple.machine import Purple97
+import purple.manifest as manifest
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+KEY = dict(switches='9-1,24,6-23', alphabet='NOKTYUXEQLHBRMPDICJASVWGZF')
+
+
+class ManifestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.write('part1.txt', PT1_CT)
+        self.write('plain.txt', 'The PURPLE machine is now online')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as fp:
+            fp.write(text)
+        return path
+
+    def read(self, name):
+        with open(os.path.join(self.dir, name)) as fp:
+            return fp.read()
+
+    def check_results(self, path, jobs):
+        entries = manifest.read_manifest(path, switches='1-1,1,1-12')
+        results = list(manifest.run(entries, jobs, group=0, width=0,
+                filter_input=True))
+
+        self.assertEqual(len(results), 4)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[0].letters, len(PT1_PT))
+        self.assertEqual(self.read('part1.txt.dec'), PT1_PT + '\n')
+
+        self.assertIsNone(results[1].error)
+        expected = Purple97.from_key_sheet('1-1,1,1-12', KEY['alphabet'])
+        self.assertEqual(self.read('secret.txt'),
+                expected.encrypt('THEPURPLEMACHINEISNOWONLINE') + '\n')
+
+        self.assertIsNotNone(results[2].error)
+        self.assertIn('missing.txt', results[2].entry.input)
+        self.assertIsNone(results[3].entry)
+        self.assertIn('direction', results[3].error)
+
+    def test_json_lines(self):
+
+        rows = [
+            dict(input='part1.txt', direction='decrypt', **KEY),
+            dict(input='plain.txt', direction='e', output='secret.txt',
+                 alphabet=KEY['alphabet']),
+            dict(input='missing.txt', direction='d', **KEY),
+            dict(input='part1.txt', direction='sideways', **KEY),
+        ]
+        path = self.write('manifest.jsonl',
+                '\n'.join(json.dumps(row) for row in rows))
+        self.check_results(path, 1)
+
+    def test_csv(self):
+
+        # The switch settings contain commas, so they must be quoted
+        path = self.write('manifest.csv', '\n'.join([
+            'input,switches,alphabet,direction,output',
+            'part1.txt,"{switches}",{alphabet},decrypt,'.format(**KEY),
+            'plain.txt,,{alphabet},encrypt,secret.txt'.format(**KEY),
+            'missing.txt,"{switches}",{alphabet},d,'.format(**KEY),
+            'part1.txt,"{switches}",{alphabet},sideways,'.format(**KEY),
+        ]))
+        self.check_results(path, 2)
+
+    def test_keystore(self):
+
+        from purple.keystore import KeyStore
+        store = KeyStore(os.path.join(self.dir, 'keys.db'))
+        self.addCleanup(store.close)
+        store.add('1941-12-07', **KEY)
+
+        rows = [
+            dict(input='part1.txt', direction='decrypt', key='1941-12-07'),
+            dict(input='part1.txt', direction='decrypt', key='1941-12-08'),
+        ]
+        path = self.write('manifest.jsonl',
+                '\n'.join(json.dumps(row) for row in rows))
+        entries = list(manifest.read_manifest(path, keystore=store))
+        self.assertEqual(entries[0].switches, KEY['switches'])
+        self.assertEqual(entries[0].alphabet, KEY['alphabet'])
+        self.assertIsInstance(entries[1], manifest.ManifestError)
+        self.assertIn('unknown key', str(entries[1]))
+
+        # Without a key store, key fields are errors
+        entries = list(manifest.read_manifest(path))
+        self.assertIsInstance(entries[0], manifest.ManifestError)
+
+        results = list(manifest.run(manifest.read_manifest(path,
+                keystore=store), group=0, width=0))
+        self.assertIsNone(results[0].error)
+        self.assertEqual(self.read('part1.txt.dec'), PT1_PT + '\n')
+
+    def test_non_string_fields(self):
+
+        rows = [
+            dict(input='part1.txt', direction='d', switches=5),
+            dict(input=7, direction='d', **KEY),
+            dict(input='part1.txt', direction=['d'], **KEY),
+            dict(input='part1.txt', direction='d', **KEY),
+        ]
+        path = self.write('manifest.jsonl',
+                '\n'.join(json.dumps(row) for row in rows))
+        for jobs in (1, 2):
+            results = list(manifest.run(manifest.read_manifest(path), jobs,
+                    group=0, width=0))
+            self.assertEqual(len(results), 4)
+            self.assertIn('switches must be a string', results[0].error)
+            self.assertIn('input must be a string', results[1].error)
+            self.assertIn('direction must be a string', results[2].error)
+            self.assertIsNone(results[3].error)
+
+    def test_partial_output_removed(self):
+
+        self.write('bad.txt', PT1_CT[:200] + '1' + PT1_CT[200:])
+        path = self.write('manifest.jsonl', json.dumps(
+                dict(input='bad.txt', direction='d', **KEY)))
+        results = list(manifest.run(manifest.read_manifest(path)))
+        self.assertIn('invalid input', results[0].error)
+        self.assertFalse(os.path.exists(os.path.join(self.dir,
+                                                     'bad.txt.dec')))
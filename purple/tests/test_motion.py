@@ -0,0 +1,65 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from purple.machine import Purple97, Purple97Error
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+if np is not None:
+    import purple.motion as motion
+
+
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class MotionTestCase(unittest.TestCase):
+
+    def test_sixes_with_alphabet(self):
+        candidates = motion.sixes_candidates(PT1_CT, ALPHABET, top=3)
+        self.assertEqual(len(candidates), 3)
+        self.assertEqual(candidates[0].position, 8)
+        self.assertEqual(candidates[0].letters, 'NOKTYU')
+        self.assertGreater(candidates[0].score, candidates[1].score + 0.05)
+
+    def test_sixes_with_letters(self):
+        candidates = motion.sixes_candidates(PT1_CT, letters='uoktyn')
+        self.assertEqual(candidates[0], motion.SixesCandidate(
+                candidates[0].score, 8, 'NOKTYU'))
+
+    def test_sixes_estimated(self):
+        letters = motion.sixes_letters(PT1_CT)
+        self.assertEqual(len(letters), 6)
+        self.assertGreaterEqual(len(set(letters) & set('NOKTYU')), 5)
+        self.assertEqual(motion.sixes_candidates(PT1_CT)[0].position, 8)
+
+    def test_motion(self):
+        candidates = motion.motion_candidates(PT1_CT, ALPHABET, 8, top=3)
+        self.assertEqual(len(candidates), 3)
+        best = candidates[0]
+        self.assertEqual((best.fast, best.middle, best.positions),
+                         (2, 3, (23, 5)))
+        self.assertEqual(motion.key_sheet(8, best), '9-?,24,6-23')
+
+    def test_motion_other_key(self):
+        # Switch 1 is the fast switch and switch 3 the slow one
+        purple = Purple97.from_key_sheet('3-17,4,21-12', ALPHABET)
+        ciphertext = purple.encrypt(''.join(PT1_PT.split()).replace('-', 'X'))
+        self.assertEqual(motion.sixes_candidates(ciphertext,
+                ALPHABET)[0].position, 2)
+        best = motion.motion_candidates(ciphertext, ALPHABET, 2)[0]
+        self.assertEqual(motion.key_sheet(2, best), '3-?,4,21-12')
+
+    def test_errors(self):
+        self.assertRaises(Purple97Error, motion.sixes_candidates, 'ABC1')
+        self.assertRaises(Purple97Error, motion.sixes_candidates, PT1_CT,
+                          letters='ABCDE')
+        self.assertRaises(Purple97Error, motion.motion_candidates, PT1_CT,
+                          ALPHABET, 25)
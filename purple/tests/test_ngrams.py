@@ -0,0 +1,144 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import math
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+
+from purple.hillclimb import PlugboardSolver
+from purple.machine import Purple97
+from purple.ngrams import (GARBLE, NgramError, NgramModel, build, encode,
+        get_model)
+from purple.search import search_chunk
+from purple.tests.test_machine import PT1_CT, PT1_PT
+from purple.tests.test_search import CIPHERTEXT
+
+
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+PLAINTEXT = ''.join(PT1_PT.split()).replace('-', '')
+
+
+class NgramModelTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.mkdtemp()
+        cls.corpus = os.path.join(cls.dir, 'corpus.txt')
+        with open(cls.corpus, 'w') as fp:
+            fp.write(PT1_PT.lower())
+        cls.path = os.path.join(cls.dir, 'model.bin')
+        cls.total = build([cls.corpus], cls.path)
+        cls.model = get_model(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dir)
+
+    def test_build(self):
+        self.assertEqual(self.total, len(PLAINTEXT) - 3)
+        self.assertEqual(self.model.n, 4)
+        self.assertEqual(len(self.model.table), 26 ** 4)
+        self.assertLess(self.model.random_mean, self.model.threshold)
+        self.assertLess(self.model.threshold, self.model.mean)
+        self.assertGreater(self.model.std, 0.0)
+
+    def test_score(self):
+        text = PLAINTEXT[:50]
+        counts = {}
+        for i in range(len(PLAINTEXT) - 3):
+            gram = PLAINTEXT[i:i + 4]
+            counts[gram] = counts.get(gram, 0) + 1
+        expected = sum(math.log10(counts[text[i:i + 4]] / self.total)
+                       for i in range(len(text) - 3))
+        self.assertAlmostEqual(self.model.score(text), expected, places=3)
+        self.assertAlmostEqual(self.model.score_codes(encode(text)),
+                               self.model.score(text))
+        self.assertGreater(self.model.score(text) / 47,
+                           self.model.score('QXZJVKWQXZJVKWQXZJ') / 15)
+
+    def test_garbles_break_text(self):
+        text = PLAINTEXT[:20]
+        self.assertAlmostEqual(
+                self.model.score(text[:10] + '-' + text[10:]),
+                self.model.score(text[:10]) + self.model.score(text[10:]))
+        self.assertEqual(self.model.score('ABC'), 0.0)
+
+    def test_letter_scores(self):
+        text = PLAINTEXT[:30] + '-' + PLAINTEXT[30:60]
+        scores = self.model.letter_scores(text)
+        self.assertEqual(len(scores), len(text))
+        threshold = self.model.threshold
+        self.assertEqual(scores[:3], [threshold] * 3)
+        self.assertEqual(scores[30:34], [threshold] * 4)
+        total = sum(s for s in scores if s != threshold)
+        self.assertAlmostEqual(total, self.model.score(text), places=3)
+
+    def test_sliding_window(self):
+        rng = random.Random(5)
+        codes = encode(PLAINTEXT[:200])
+        codes = bytes(GARBLE if rng.random() < 0.05 else c for c in codes)
+        window = self.model.window(12)
+        for k, c in enumerate(codes):
+            score = window.push(c)
+            expected = self.model.score_codes(codes[max(0, k - 11):k + 1])
+            self.assertAlmostEqual(score, expected, places=3)
+        self.assertRaises(NgramError, self.model.window, 3)
+
+    def test_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(self.model)), self.model)
+
+    def test_invalid_file(self):
+        path = os.path.join(self.dir, 'bad.bin')
+        with open(path, 'wb') as fp:
+            fp.write(b'PRPLSG01' + bytes(100))
+        self.assertRaises(NgramError, NgramModel, path)
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        with open(path, 'wb') as fp:
+            fp.write(data[:-4])
+        self.assertRaises(NgramError, NgramModel, path)
+        self.assertRaises(NgramError, build, [path + '.none'], path, 7)
+
+        # Empty and short files, which cannot be mapped or hold no header
+        for data in (b'', data[:10]):
+            with open(path, 'wb') as fp:
+                fp.write(data)
+            for use_mmap in (True, False):
+                with self.assertRaisesRegex(NgramError, 'truncated'):
+                    NgramModel(path, use_mmap)
+
+    def test_search(self):
+        index = 3 * 15625 + 23 * 25 + 5
+        best, full = search_chunk(CIPHERTEXT, ALPHABET, 8,
+                range(index - 20, index + 20), top=1, model=self.model)
+        self.assertEqual(best[0][1], index)
+        self.assertEqual(full, 1)
+
+        # The n-grams spanning the end of the probe are scored too
+        exact, full = search_chunk(CIPHERTEXT, ALPHABET, 8, [index],
+                model=self.model, abort_sigmas=None)
+        plaintext = Purple97.from_key_sheet('9-1,24,6-23', ALPHABET).decrypt(
+                CIPHERTEXT)
+        self.assertAlmostEqual(best[0][0], exact[0][0], places=3)
+        self.assertAlmostEqual(best[0][0], self.model.score(plaintext),
+                               places=3)
+
+    def test_hillclimb(self):
+        solver = PlugboardSolver(PT1_CT, '9-1,24,6-23', self.model)
+        rng = random.Random(3)
+        letters = list(ALPHABET)
+        for _ in range(4):
+            i, j = rng.sample(range(26), 2)
+            letters[i], letters[j] = letters[j], letters[i]
+        solution = solver.climb(''.join(letters), seed=3)
+        self.assertEqual(solution.alphabet, ALPHABET)
+        self.assertAlmostEqual(solution.score, solver.score(ALPHABET),
+                               places=3)
+        solution = solver.climb(seed=4, max_passes=2)
+        self.assertAlmostEqual(solution.score,
+                               solver.score(solution.alphabet), places=3)
@@ -0,0 +1,52 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+from concurrent.futures import ThreadPoolExecutor
+import random
+import unittest
+
+from purple.machine import Purple97, Purple97Error
+import purple.parallel as parallel
+from purple.tests.test_compiled import random_settings, random_text
+
+
+class ParallelTestCase(unittest.TestCase):
+
+    def test_imap(self):
+
+        rng = random.Random(6)
+        settings = random_settings(rng)
+        chunks = [random_text(rng, rng.randrange(2000)) for _ in range(10)]
+        expected = Purple97(*settings).encrypt(''.join(chunks))
+
+        purple = Purple97(*settings)
+        with ThreadPoolExecutor(3) as executor:
+            output = parallel.imap(purple, chunks, 'encrypt', executor, 3,
+                    segment_size=333, window=4)
+            self.assertEqual(''.join(output), expected)
+
+        reference = Purple97(*settings)
+        reference.encrypt(''.join(chunks))
+        self.assertEqual(purple.get_state(), reference.get_state())
+
+    def test_process_pool(self):
+
+        rng = random.Random(7)
+        settings = random_settings(rng)
+        text = random_text(rng, 3 * parallel.MIN_SEGMENT_SIZE + 17)
+
+        ciphertext = parallel.encrypt(Purple97(*settings), text, jobs=2)
+        self.assertEqual(ciphertext, Purple97(*settings).encrypt(text))
+        self.assertEqual(parallel.decrypt(Purple97(*settings), ciphertext,
+                jobs=2), text)
+
+    def test_bad_input(self):
+
+        purple = Purple97()
+        with ThreadPoolExecutor(2) as executor:
+            output = parallel.imap(purple, ['ABC', 'D-F'], 'encrypt', executor,
+                                   2)
+            self.assertRaises(Purple97Error, ''.join, output)
+            self.assertRaises(ValueError, next,
+                    parallel.imap(purple, ['ABC'], 'bogus', executor, 2))
@@ -0,0 +1,68 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import random
+import unittest
+
+from purple.compiled import CompiledPurple97
+from purple.machine import Purple97, Purple97Error
+from purple.pool import MachinePool
+from purple.tests.test_compiled import random_text
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+class MachinePoolTestCase(unittest.TestCase):
+
+    def test_machine(self):
+
+        pool = MachinePool(2)
+        with pool.machine(SWITCHES, ALPHABET) as purple:
+            self.assertIs(type(purple), Purple97)
+            self.assertIsNotNone(purple.fused)
+            self.assertEqual(pool.available(), 1)
+            self.assertEqual(purple.decrypt(PT1_CT), PT1_PT)
+        self.assertEqual(pool.available(), 2)
+
+        # A reused machine starts from its new key
+        with pool.machine(SWITCHES, ALPHABET) as purple:
+            self.assertEqual(purple.decrypt(PT1_CT[:50]), PT1_PT[:50])
+
+    def test_exhausted_and_bad_key(self):
+
+        pool = MachinePool(1, Purple97)
+        purple = pool.acquire(SWITCHES, ALPHABET)
+        self.assertRaises(queue.Empty, pool.acquire, SWITCHES, timeout=0.01)
+        pool.release(purple)
+
+        self.assertRaises(Purple97Error, pool.acquire, '1-1,1,1-11')
+        self.assertEqual(pool.available(), 1)
+        self.assertRaises(ValueError, MachinePool, 0)
+
+    def test_threads(self):
+
+        rng = random.Random(13)
+        keys = ['{}-{},{},{}-{}'.format(rng.randint(1, 25), rng.randint(1, 25),
+                rng.randint(1, 25), rng.randint(1, 25),
+                rng.choice(['12', '13', '21', '23', '31', '32']))
+                for _ in range(200)]
+        texts = [random_text(rng, rng.randrange(1, 300)) for _ in keys]
+        expected = [Purple97.from_key_sheet(k, ALPHABET).encrypt(t)
+                    for k, t in zip(keys, texts)]
+
+        pool = MachinePool(3, CompiledPurple97, fused=None)
+
+        def work(key, text):
+            with pool.machine(key, ALPHABET) as purple:
+                return purple.encrypt(text)
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(work, keys, texts))
+        self.assertEqual(results, expected)
+        self.assertEqual(pool.available(), 3)
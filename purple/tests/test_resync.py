@@ -0,0 +1,77 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import random
+import string
+import unittest
+
+from purple.compiled import CompiledPurple97
+from purple.machine import Purple97
+from purple.resync import Correction, Resynchronizer, resync_decrypt
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+# Drop a letter at 300, insert one at 700 and drop two at 1100
+DAMAGED = (PT1_CT[:300] + PT1_CT[301:700] + 'Q' + PT1_CT[700:1100] +
+           PT1_CT[1102:])
+
+
+class ResyncTestCase(unittest.TestCase):
+
+    def test_clean_message(self):
+
+        purple = Purple97.from_key_sheet(SWITCHES, ALPHABET)
+        result = resync_decrypt(purple, PT1_CT)
+        self.assertEqual(result.plaintext, PT1_PT)
+        self.assertEqual(result.corrections, [])
+
+    def test_damaged_message(self):
+
+        for cls in (Purple97, CompiledPurple97):
+            purple = cls.from_key_sheet(SWITCHES, ALPHABET)
+            result = resync_decrypt(purple, DAMAGED)
+            corrections = result.corrections
+            self.assertEqual([(c.kind, c.count) for c in corrections],
+                             [('dropped', 1), ('extra', 1), ('dropped', 2)])
+
+            # A loss of step can only be placed where the text stops reading
+            # as plaintext, which may be a few letters late.
+            self.assertTrue(300 <= corrections[0].position < 310)
+            self.assertEqual(corrections[1:], [Correction(699, 'extra', 1),
+                    Correction(1100, 'dropped', 2)])
+            self.assertEqual(result.plaintext[:300], PT1_PT[:300])
+            self.assertEqual(result.plaintext[310:1100], PT1_PT[310:1100])
+            self.assertEqual(result.plaintext[1100:], '--' + PT1_PT[1102:])
+
+    def test_chunks(self):
+
+        expected = resync_decrypt(Purple97.from_key_sheet(SWITCHES, ALPHABET),
+                                  DAMAGED)
+        for size in (1, 7, 100, 5000):
+            purple = CompiledPurple97.from_key_sheet(SWITCHES, ALPHABET)
+            resync = Resynchronizer(purple)
+            pieces = [resync.update(DAMAGED[i:i + size])
+                      for i in range(0, len(DAMAGED), size)]
+            pieces.append(resync.finalize())
+            self.assertEqual(''.join(pieces), expected.plaintext)
+            self.assertEqual(resync.corrections, expected.corrections)
+            self.assertEqual(resync.unresolved, expected.unresolved)
+            # Plaintext is returned before the end of the message
+            if size < len(DAMAGED):
+                self.assertTrue(len(pieces[0]) + len(pieces[-1]) <
+                                len(expected.plaintext))
+
+    def test_random_text(self):
+
+        rng = random.Random(0)
+        text = ''.join(rng.choice(string.ascii_uppercase)
+                       for _ in range(10000))
+        purple = CompiledPurple97.from_key_sheet(SWITCHES, ALPHABET)
+        result = resync_decrypt(purple, text)
+        self.assertEqual(result.corrections, [])
+        self.assertEqual(len(result.plaintext), len(text))
@@ -0,0 +1,41 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import random
+import unittest
+
+from purple.scoring import ENGLISH, MonogramModel, score
+from purple.tests.test_compiled import random_text
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+class ScoringTestCase(unittest.TestCase):
+
+    def test_reference_values(self):
+
+        self.assertLess(ENGLISH.random_mean, ENGLISH.threshold)
+        self.assertLess(ENGLISH.threshold, ENGLISH.mean)
+
+        # Plaintext scores above the threshold, ciphertext and random text
+        # below it
+        text = PT1_PT.replace('-', '')
+        self.assertGreater(score(text) / len(text), ENGLISH.threshold)
+        self.assertLess(score(PT1_CT) / len(PT1_CT), ENGLISH.threshold)
+        noise = random_text(random.Random(1), 2000)
+        self.assertLess(score(noise) / len(noise), ENGLISH.threshold)
+
+    def test_letter_scores(self):
+
+        scores = ENGLISH.letter_scores('EQ-')
+        self.assertEqual(scores[0], ENGLISH.log_probs['E'])
+        self.assertEqual(scores[2], ENGLISH.threshold)
+        self.assertAlmostEqual(ENGLISH.score('EQ-'), sum(scores[:2]))
+        self.assertAlmostEqual(score('THE') + score('END'), score('THEEND'))
+
+    def test_from_text(self):
+
+        model = MonogramModel.from_text('AAB')
+        self.assertGreater(model.log_probs['A'], model.log_probs['B'])
+        self.assertGreater(model.log_probs['B'], model.log_probs['C'])
+        self.assertRaises(ValueError, MonogramModel, {})
@@ -0,0 +1,100 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from purple.machine import Purple97
+from purple.search import (KeySearch, KeySearchError, key_sheet,
+        parse_motions, search_chunk, setting)
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+SIXES = 8
+# Early rejection needs a message starting with English, so skip the header
+CIPHERTEXT = Purple97.from_key_sheet('9-1,24,6-23', ALPHABET).encrypt(
+        PT1_PT[200:500].replace('-', 'X'))
+
+# The index of 9-1,24,6-23 under motion order 23
+KEY_INDEX = 3 * 15625 + 0 * 625 + 23 * 25 + 5
+
+
+class KeySearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.dir, 'search.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_settings(self):
+
+        self.assertEqual(setting(KEY_INDEX, SIXES), ((8, 0, 23, 5), 2, 3))
+        self.assertEqual(key_sheet(KEY_INDEX, SIXES), '9-1,24,6-23')
+        self.assertEqual(parse_motions('23, 31'), [(2, 3), (3, 1)])
+        self.assertRaises(KeySearchError, parse_motions, '22')
+        self.assertRaises(KeySearchError, parse_motions, '1')
+
+    def test_search_chunk(self):
+
+        indexes = range(KEY_INDEX - 200, KEY_INDEX + 200)
+        best, full = search_chunk(CIPHERTEXT, ALPHABET, SIXES, indexes,
+                                  top=3)
+        self.assertEqual(max(best)[1], KEY_INDEX)
+        # Only the settings decrypting to plaintext are scored in full
+        self.assertEqual(len(best), 1)
+        self.assertEqual(full, 1)
+
+        # Without early rejection every setting is decrypted in full
+        exact, full = search_chunk(CIPHERTEXT, ALPHABET, SIXES, indexes,
+                                   top=3, abort_sigmas=None)
+        self.assertEqual(full, len(indexes))
+        self.assertEqual(len(exact), 3)
+        self.assertAlmostEqual(max(exact)[0], max(best)[0])
+
+        # The header of the original message is not plaintext to the model,
+        # and needs an exact search
+        best, full = search_chunk(PT1_CT[:300], ALPHABET, SIXES, indexes,
+                                  top=3)
+        self.assertEqual(full, 0)
+        exact, full = search_chunk(PT1_CT[:300], ALPHABET, SIXES, indexes,
+                                   top=3, abort_sigmas=None)
+        self.assertEqual(max(exact)[1], KEY_INDEX)
+
+    def test_resume(self):
+
+        def interrupt(done, total):
+            if done == 3:
+                raise KeyboardInterrupt
+
+        search = KeySearch(CIPHERTEXT, ALPHABET, SIXES, motions=[(2, 3)],
+                           top=3, chunk_size=2048, checkpoint=self.checkpoint)
+        self.assertEqual(len(search.chunks), 8)
+        self.assertRaises(KeyboardInterrupt, search.run, progress=interrupt)
+        self.assertTrue(os.path.exists(self.checkpoint))
+
+        search = KeySearch(CIPHERTEXT, ALPHABET, SIXES, motions=[(2, 3)],
+                           top=3, chunk_size=2048, checkpoint=self.checkpoint)
+        self.assertEqual(len(search.done), 3)
+        self.assertFalse(search.finished)
+        results = search.run(jobs=2)
+        self.assertTrue(search.finished)
+        # Besides the true setting, only one other passes the probe
+        self.assertEqual([result.switches for result in results],
+                         ['9-1,24,6-23', '9-18,24,6-23'])
+
+        # A checkpoint only resumes the same search
+        self.assertRaises(KeySearchError, KeySearch, CIPHERTEXT, ALPHABET,
+                SIXES + 1, motions=[(2, 3)], top=3, chunk_size=2048,
+                checkpoint=self.checkpoint)
+        self.assertRaises(KeySearchError, KeySearch, CIPHERTEXT, ALPHABET,
+                SIXES, motions=[(2, 3)], top=3, chunk_size=2048,
+                abort_sigmas=None, checkpoint=self.checkpoint)
+        self.assertRaises(KeySearchError, KeySearch, CIPHERTEXT, ALPHABET,
+                SIXES, motions=[(2, 3)], top=3, chunk_size=2048, probe=50,
+                checkpoint=self.checkpoint)
@@ -0,0 +1,132 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import unittest
+
+from purple.machine import Purple97
+from purple.service import PurpleService, _finish_request, parse_request
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+
+SWITCHES = '9-1,24,6-23'
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+
+
+async def exchange(port, lines):
+    """Pipelines the request lines on one connection and returns the decoded
+    replies.
+
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b''.join(line.encode('utf-8') + b'\n' for line in lines))
+    await writer.drain()
+    replies = [json.loads(await reader.readline()) for _ in lines]
+    writer.close()
+    await writer.wait_closed()
+    return replies
+
+
+class PurpleServiceTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def run_service(self, client, **kwargs):
+        """Starts a service on a free localhost port, runs the coroutine
+        function client(port) against it, and returns its result.
+
+        """
+        async def run():
+            service = PurpleService(port=0, executor=self.executor, **kwargs)
+            async with service:
+                return await client(service.port)
+
+        return asyncio.run(run())
+
+    def test_pipelined_requests(self):
+
+        requests = []
+        expected = []
+        for i in range(50):
+            switches = '{}-1,24,6-23'.format(i % 25 + 1)
+            text = PT1_PT[i:i + 40].replace('-', 'X')
+            requests.append(json.dumps({'id': i, 'op': 'encrypt',
+                    'switches': switches, 'alphabet': ALPHABET, 'text': text}))
+            expected.append({'id': i, 'text': Purple97.from_key_sheet(switches,
+                    ALPHABET).encrypt(text)})
+        requests.append(json.dumps({'id': 'part1', 'op': 'decrypt',
+                'switches': SWITCHES, 'alphabet': ALPHABET, 'text': PT1_CT}))
+        expected.append({'id': 'part1', 'text': PT1_PT})
+
+        replies = self.run_service(lambda port: exchange(port, requests),
+                max_batch=8)
+        self.assertEqual(replies, expected)
+
+    def test_concurrent_clients(self):
+
+        request = json.dumps({'op': 'decrypt', 'switches': SWITCHES,
+                'alphabet': ALPHABET, 'text': PT1_CT[:100]})
+
+        async def clients(port):
+            return await asyncio.gather(*[exchange(port, [request] * 10)
+                                          for _ in range(5)])
+
+        for replies in self.run_service(clients):
+            self.assertEqual(replies, [{'text': PT1_PT[:100]}] * 10)
+
+    def test_errors(self):
+
+        lines = [
+            'not json',
+            '[1, 2]',
+            json.dumps({'id': 1, 'op': 'rot13', 'switches': SWITCHES,
+                        'text': 'A'}),
+            json.dumps({'id': 2, 'op': 'encrypt', 'switches': '1-1,1,1-11',
+                        'text': 'A'}),
+            json.dumps({'id': 3, 'op': 'encrypt', 'switches': SWITCHES,
+                        'text': 'abc'}),
+            json.dumps({'id': 4, 'op': 'encrypt', 'switches': SWITCHES,
+                        'text': 'ABC'}),
+        ]
+        replies = self.run_service(lambda port: exchange(port, lines))
+        self.assertEqual([reply.get('id') for reply in replies],
+                         [None, None, 1, 2, 3, 4])
+        self.assertTrue(all('error' in reply for reply in replies[:5]))
+        self.assertEqual(replies[5], {'id': 4, 'text':
+                Purple97.from_key_sheet(SWITCHES).encrypt('ABC')})
+
+    def test_parse_request(self):
+
+        request_id, request = parse_request(json.dumps({'id': 7, 'op':
+                'decrypt', 'switches': SWITCHES, 'text': 'ABC'}))
+        self.assertEqual(request_id, 7)
+        self.assertEqual(request, ('decrypt', SWITCHES, None, 'ABC'))
+        self.assertRaises(ValueError, parse_request, '{"op": "decrypt"}')
+
+    def test_finish_request(self):
+
+        async def finish(setup):
+            loop = asyncio.get_running_loop()
+            result = loop.create_future()
+            reply = loop.create_future()
+            setup(result)
+            _finish_request(result, reply, 5)
+            return reply.result()
+
+        self.assertEqual(asyncio.run(finish(
+                lambda result: result.set_result((True, 'ABC')))),
+                (5, True, 'ABC'))
+        self.assertEqual(asyncio.run(finish(lambda result: result.cancel())),
+                (5, False, 'service shutting down'))
+        self.assertEqual(asyncio.run(finish(
+                lambda result: result.set_exception(RuntimeError()))),
+                (5, False, 'internal error'))
@@ -0,0 +1,100 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import os
+import random
+import tempfile
+import unittest
+
+from purple.machine import Purple97, Purple97Error, advance_positions
+from purple.stategraph import (StateGraph, StateGraphError, get_graph,
+        successor)
+
+
+class StateGraphTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.graph = StateGraph.build()
+
+    def test_structure(self):
+
+        graph = self.graph
+        self.assertEqual(sum(graph.length), 25 ** 4)
+        self.assertEqual(graph.num_cycles, 25)
+        self.assertEqual(set(graph.length), {15625})
+        for number in range(graph.num_cycles):
+            first = graph.order[graph.start[number]]
+            last = graph.order[graph.start[number] + graph.length[number] - 1]
+            self.assertEqual(successor(last), first)
+
+    def test_successor_matches_step(self):
+
+        rng = random.Random(16)
+        graph = self.graph
+        for _ in range(200):
+            switches_pos = [rng.randrange(25) for _ in range(4)]
+            fast_switch, middle_switch = rng.sample([1, 2, 3], 2)
+            purple = Purple97(switches_pos, fast_switch, middle_switch)
+            index = graph.index(switches_pos, fast_switch, middle_switch)
+            self.assertEqual(graph.positions(index, fast_switch,
+                    middle_switch), tuple(switches_pos))
+            purple.step()
+            self.assertEqual(graph.positions(successor(index), fast_switch,
+                    middle_switch), purple.get_state())
+
+    def test_queries(self):
+
+        rng = random.Random(1616)
+        graph = self.graph
+        for _ in range(500):
+            switches_pos = [rng.randrange(25) for _ in range(4)]
+            fast_switch, middle_switch = rng.sample([1, 2, 3], 2)
+            n = rng.randrange(100000)
+            end_pos = advance_positions(switches_pos, fast_switch,
+                    middle_switch, n)
+            self.assertEqual(graph.advance(switches_pos, fast_switch,
+                    middle_switch, n), end_pos)
+            self.assertEqual(graph.distance(switches_pos, end_pos,
+                    fast_switch, middle_switch), n % 15625)
+            self.assertTrue(graph.equivalent(switches_pos, end_pos,
+                    fast_switch, middle_switch))
+            self.assertEqual(graph.period(switches_pos, fast_switch,
+                    middle_switch), 15625)
+
+        self.assertIsNone(graph.distance((0, 0, 0, 0), (1, 0, 0, 0), 1, 2))
+        self.assertFalse(graph.equivalent((0, 0, 0, 0), (1, 0, 0, 0), 1, 2))
+        self.assertRaises(Purple97Error, graph.advance, (0, 0, 0, 0), 1, 2,
+                          -1)
+
+    def test_save_and_load(self):
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'graph.bin')
+            self.graph.save(path)
+            for use_mmap in (True, False):
+                graph = StateGraph.load(path, use_mmap)
+                for name in ('cycle', 'offset', 'order', 'start', 'length'):
+                    self.assertEqual(list(getattr(graph, name)),
+                                     list(getattr(self.graph, name)))
+                del graph
+
+            with open(path, 'r+b') as fp:
+                fp.write(b'garbage!')
+            self.assertRaises(StateGraphError, StateGraph.load, path)
+
+            # Empty and short files, which cannot be mapped or hold no header
+            for data in (b'', b'PRPL'):
+                with open(path, 'wb') as fp:
+                    fp.write(data)
+                for use_mmap in (True, False):
+                    with self.assertRaisesRegex(StateGraphError, 'truncated'):
+                        StateGraph.load(path, use_mmap)
+
+            # get_graph() replaces an invalid cache file
+            graph = get_graph(path)
+            self.assertEqual(graph.period((0, 0, 0, 0), 1, 2), 15625)
+            self.assertEqual(StateGraph.load(path).num_cycles, 25)
+            get_graph.cache_clear()
+            del graph
@@ -4,6 +4,7 @@
 
 import unittest
 
+import purple.data
 from purple.switch import SteppingSwitch, SteppingSwitchError, create_switch
 import purple.switch
 
@@ -147,3 +148,29 @@ class SwitchTestCase(unittest.TestCase):
         self.assertRaises(ValueError, create_switch, -1)
         self.assertRaises(ValueError, create_switch, 4)
         self.assertRaises(ValueError, create_switch, 99)
+
+    def test_shared_tables(self):
+
+        switch_a = create_switch(purple.switch.TWENTIES_2, 3)
+        switch_b = create_switch(purple.switch.TWENTIES_2, 7)
+        self.assertIs(switch_a.dec_table, switch_b.dec_table)
+        self.assertIs(switch_a.dec_table, purple.data.DECRYPT_TABLES[2])
+        self.assertEqual(switch_a.dec_wiring, purple.data.DECRYPT_DATA[2])
+        self.assertEqual(switch_a.enc_wiring, purple.data.ENCRYPT_DATA[2])
+        self.assertEqual(switch_a.num_positions, 25)
+        self.assertEqual(switch_a.num_levels, 20)
+        self.assertFalse(hasattr(switch_a, '__dict__'))
+
+    def test_custom_wiring(self):
+
+        wiring = [
+            [1, 2, 0],
+            [2, 1, 0],
+            [0, 1, 2],
+        ]
+        switch = SteppingSwitch(wiring, init_pos=1)
+        self.assertEqual(switch.dec_wiring, wiring)
+        self.assertEqual(switch.encrypt(0), 2)
+        self.assertEqual(switch.decrypt(2), 0)
+        self.assertRaises(SteppingSwitchError, SteppingSwitch,
+                [[256, 0], [0, 1]], [[1, 0], [0, 1]])
@@ -0,0 +1,112 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import os
+import random
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from purple.machine import Purple97Error
+from purple.tests.test_compiled import random_text
+from purple.tests.test_machine import PT1_CT
+from purple.textstats import TextStats, collect
+
+
+ALPHABET = 'NOKTYUXEQLHBRMPDICJASVWGZF'
+LETTER_X = ord('X') - ord('A')
+LETTER_Y = ord('Y') - ord('A')
+
+
+class TextStatsTestCase(unittest.TestCase):
+
+    def test_counts(self):
+
+        stats = TextStats()
+        stats.add_message('AAB-B C')
+        self.assertEqual(stats.letters, 5)
+        self.assertEqual(stats.garbles, 1)
+        self.assertEqual(stats.messages, 1)
+        self.assertEqual(stats.counts()[:3], [2, 2, 1])
+        self.assertEqual(stats.counts(0)[0], 1)
+        self.assertEqual(stats.counts(3)[1], 0)     # the garble
+        self.assertEqual(stats.counts(4)[1], 1)
+        self.assertAlmostEqual(stats.ioc(), (2 + 2) / 20)
+        self.assertAlmostEqual(sum(stats.frequencies().values()), 1.0)
+
+    def test_phases(self):
+
+        stats = TextStats()
+        stats.update('X' * 24 + 'Y' * 26)
+        self.assertEqual(stats.counts(24)[LETTER_Y], 2)
+        self.assertEqual(stats.counts(0)[LETTER_Y], 1)
+        self.assertEqual(stats.counts(0)[LETTER_X], 1)
+        self.assertEqual(stats.offset, 0)
+
+    def test_streaming(self):
+
+        text = random_text(random.Random(1), 5003)
+        whole = TextStats()
+        whole.add_message(text)
+
+        chunked = TextStats()
+        for i in range(0, len(text), 37):
+            chunked.update(text[i:i + 37])
+        chunked.new_message()
+        self.assertEqual(chunked.phase_counts, whole.phase_counts)
+
+        # Merging equals counting both messages in one object
+        other = TextStats()
+        other.add_message(PT1_CT)
+        both = TextStats()
+        both.add_message(text)
+        both.add_message(PT1_CT)
+        merged = pickle.loads(pickle.dumps(whole)).merge(other)
+        self.assertEqual(merged.phase_counts, both.phase_counts)
+        self.assertEqual(merged.letters, both.letters)
+        self.assertEqual(merged.messages, 2)
+
+        snapshot = whole.snapshot()
+        whole.update('A')
+        self.assertEqual(snapshot.letters, len(text))
+
+    def test_classes(self):
+
+        stats = TextStats()
+        stats.add_message('NOKTYU' * 3 + 'XEQ')
+        self.assertEqual(stats.class_counts(ALPHABET), (18, 3))
+        self.assertEqual(stats.class_counts(ALPHABET.lower(), phase=0),
+                         (1, 0))
+        sixes_ioc, twenties_ioc = stats.class_iocs(ALPHABET)
+        self.assertAlmostEqual(sixes_ioc, 6 * 3 * 2 / (18 * 17))
+        self.assertEqual(twenties_ioc, 0.0)
+        self.assertEqual(stats.as_dict(ALPHABET)['sixes'], 18)
+        self.assertRaises(Purple97Error, stats.class_counts, 'ABC')
+
+    def test_invalid(self):
+
+        stats = TextStats()
+        self.assertRaises(Purple97Error, stats.update, 'ABC1')
+        self.assertEqual(stats.letters, 0)
+        self.assertEqual(stats.offset, 0)
+
+    def test_collect(self):
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        rng = random.Random(2)
+        texts = [random_text(rng, n) for n in (100, 2000, 31)]
+        paths = []
+        expected = TextStats()
+        for n, text in enumerate(texts):
+            paths.append(os.path.join(directory, '{}.txt'.format(n)))
+            with open(paths[-1], 'w') as fp:
+                fp.write(text)
+            expected.add_message(text)
+
+        for jobs in (1, 2):
+            stats = collect(paths, jobs)
+            self.assertEqual(stats.phase_counts, expected.phase_counts)
+            self.assertEqual(stats.messages, 3)
@@ -0,0 +1,84 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+import random
+import string
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from purple.machine import Purple97, Purple97Error
+from purple.tests.test_compiled import random_settings, random_text
+from purple.tests.test_machine import PT1_CT, PT1_PT
+
+if np is not None:
+    import purple.vectorized as vectorized
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class VectorizedTestCase(unittest.TestCase):
+
+    def test_encode_decode(self):
+
+        messages = ['ABC', '', 'Z-Y-X']
+        codes, lengths = vectorized.encode(messages)
+        self.assertEqual(codes.shape, (3, 5))
+        self.assertEqual(list(codes[0]), [0, 1, 2, 26, 26])
+        self.assertEqual(vectorized.decode(codes, lengths), messages)
+
+        self.assertRaises(Purple97Error, vectorized.encode, ['abc'])
+        self.assertRaises(Purple97Error, vectorized.encode, ['ABCDEF'], 3)
+
+    def test_decrypt_part_1_message(self):
+
+        codes, lengths = vectorized.encode([PT1_CT])
+        result = vectorized.decrypt([[8, 0, 23, 5]], [[2, 3]],
+                'NOKTYUXEQLHBRMPDICJASVWGZF', codes)
+        self.assertEqual(vectorized.decode(result, lengths), [PT1_PT])
+
+    def test_matches_reference(self):
+
+        rng = random.Random(3)
+        settings = [random_settings(rng) for _ in range(40)]
+        messages = [random_text(rng, rng.randrange(700)) for _ in settings]
+        switches_pos = [s[0] for s in settings]
+        motions = [(s[1], s[2]) for s in settings]
+        alphabets = [s[3] for s in settings]
+
+        codes, lengths = vectorized.encode(messages)
+        ciphertext = vectorized.decode(vectorized.encrypt(switches_pos,
+                motions, alphabets, codes), lengths)
+        for s, msg, ct in zip(settings, messages, ciphertext):
+            self.assertEqual(Purple97(*s).encrypt(msg), ct)
+
+        codes, lengths = vectorized.encode(ciphertext)
+        plaintext = vectorized.decode(vectorized.decrypt(switches_pos,
+                motions, alphabets, codes), lengths)
+        self.assertEqual(plaintext, messages)
+
+    def test_positions(self):
+
+        purple = Purple97([23, 4, 24, 9], 3, 2)
+        pos = vectorized.positions([[23, 4, 24, 9]], [[3, 2]], 800)
+        for n in range(800):
+            self.assertEqual(tuple(pos[0, n]), purple.get_state())
+            purple.step()
+
+    def test_bad_keys(self):
+
+        codes, _ = vectorized.encode(['ABC'])
+        alphabet = string.ascii_uppercase
+        self.assertRaises(Purple97Error, vectorized.decrypt, [[0, 0, 0]],
+                [[1, 2]], alphabet, codes)
+        self.assertRaises(Purple97Error, vectorized.decrypt, [[0, 0, 0, 25]],
+                [[1, 2]], alphabet, codes)
+        self.assertRaises(Purple97Error, vectorized.decrypt, [[0, 0, 0, 0]],
+                [[2, 2]], alphabet, codes)
+        self.assertRaises(Purple97Error, vectorized.decrypt, [[0, 0, 0, 0]],
+                [[1, 2]], 'A' * 26, codes)
+        self.assertRaises(Purple97Error, vectorized.decrypt,
+                [[0, 0, 0, 0]] * 2, [[1, 2]] * 2, alphabet, codes)
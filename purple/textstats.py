@@ -0,0 +1,293 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains the TextStats class, which gathers letter statistics
+over any amount of ciphertext, and the "purple stats" command that reports
+them.
+
+Text is fed to a TextStats a chunk at a time, so a corpus never has to be held
+in memory or read twice. Every letter is counted by its offset from the start
+of its message modulo 25, the period of the sixes switch, in one flat array of
+25 x 26 counters. Letter frequencies, the index of coincidence, and the split
+between the sixes and twenties letters of a plugboard alphabet are all derived
+from those counters when asked for, so a TextStats may be queried at any time
+while text is still arriving:
+
+    stats = TextStats()
+    for chunk in chunks:
+        stats.update(chunk)
+    stats.new_message()
+    print(stats.ioc(), stats.class_counts('NOKTYUXEQLHBRMPDICJASVWGZF'))
+
+As in Purple97.decrypt(), a '-' marks a garble: it is not counted as a letter,
+but it occupies a position and so advances the offset. Whitespace is ignored.
+
+TextStats objects can be pickled and are combined with merge(), so a corpus can
+be split between processes; see collect().
+
+"""
+import argparse
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import string
+
+from purple.machine import Purple97Error, validate_alphabet
+
+
+DESC = """Report ciphertext letter statistics"""
+
+EPILOG = """\
+Each file is treated as one message. Offsets are counted from the start of
+each message modulo 25, the period of the sixes switch. If an alphabet is
+given, letters are also split into the sixes and twenties classes of that
+plugboard alphabet.
+"""
+
+PERIOD = 25
+LETTERS = string.ascii_uppercase
+LETTER_INDEX = {c: n for n, c in enumerate(LETTERS)}
+
+
+def _ioc(counts):
+    """Returns the index of coincidence of a sequence of letter counts."""
+    total = sum(counts)
+    if total < 2:
+        return 0.0
+    return sum(n * (n - 1) for n in counts) / (total * (total - 1))
+
+
+class TextStats:
+    """Streaming, mergeable letter counts over ciphertext."""
+
+    __slots__ = ('phase_counts', 'letters', 'garbles', 'messages', 'offset')
+
+    def __init__(self):
+        # phase_counts[phase * 26 + letter] counts letter at that phase
+        self.phase_counts = array('Q', bytes(8 * PERIOD * 26))
+        self.letters = 0
+        self.garbles = 0
+        self.messages = 0
+        self.offset = 0
+
+    def update(self, text):
+        """Counts the letters of text, which continues the current message.
+        A Purple97Error is raised, and nothing is counted, if text contains
+        anything other than the letters A-Z, '-' and whitespace.
+
+        """
+        text = ''.join(text.split())
+        n = len(text)
+        if not n:
+            return
+
+        # Each strided slice holds the letters of one phase; Counter counts
+        # them in C, leaving only a few hundred Python operations per chunk.
+        phases = []
+        for i in range(min(PERIOD, n)):
+            counter = Counter(text[i::PERIOD])
+            for c in counter:
+                if c not in LETTER_INDEX and c != '-':
+                    raise Purple97Error("invalid ciphertext letter '{}'".format(
+                            c))
+            phases.append(counter)
+
+        counts = self.phase_counts
+        for i, counter in enumerate(phases):
+            base = (self.offset + i) % PERIOD * 26
+            for c, k in counter.items():
+                if c == '-':
+                    self.garbles += k
+                else:
+                    counts[base + LETTER_INDEX[c]] += k
+                    self.letters += k
+        self.offset = (self.offset + n) % PERIOD
+
+    def new_message(self):
+        """Ends the current message; the next text counted starts again at
+        offset 0.
+
+        """
+        self.messages += 1
+        self.offset = 0
+
+    def add_message(self, text):
+        """Counts text as one complete message."""
+        self.update(text)
+        self.new_message()
+
+    def merge(self, other):
+        """Adds the counts of another TextStats to this one and returns
+        self. The offset within this object's current message is unchanged.
+
+        """
+        counts = self.phase_counts
+        for i, n in enumerate(other.phase_counts):
+            counts[i] += n
+        self.letters += other.letters
+        self.garbles += other.garbles
+        self.messages += other.messages
+        return self
+
+    def snapshot(self):
+        """Returns an independent copy of the current counts."""
+        copy = TextStats()
+        copy.merge(self)
+        copy.offset = self.offset
+        return copy
+
+    def counts(self, phase=None):
+        """Returns the 26 letter counts, A to Z, either over all text or only
+        at the given offset modulo 25.
+
+        """
+        if phase is not None:
+            base = phase % PERIOD * 26
+            return list(self.phase_counts[base:base + 26])
+        totals = [0] * 26
+        for base in range(0, PERIOD * 26, 26):
+            for i, n in enumerate(self.phase_counts[base:base + 26]):
+                totals[i] += n
+        return totals
+
+    def frequencies(self, phase=None):
+        """Returns a dictionary of the relative frequency of each letter,
+        optionally only at the given phase.
+
+        """
+        counts = self.counts(phase)
+        total = sum(counts) or 1
+        return {c: n / total for c, n in zip(LETTERS, counts)}
+
+    def ioc(self, phase=None):
+        """Returns the index of coincidence, about 0.0385 for random text and
+        0.0667 for English, optionally only at the given phase.
+
+        """
+        return _ioc(self.counts(phase))
+
+    def phase_iocs(self):
+        """Returns a list of the index of coincidence at each of the 25
+        phases.
+
+        """
+        return [self.ioc(phase) for phase in range(PERIOD)]
+
+    def class_counts(self, alphabet, phase=None):
+        """Returns the number of (sixes, twenties) letters for the plugboard
+        alphabet, in which the first 6 letters are the sixes, optionally only
+        at the given phase.
+
+        """
+        alphabet = validate_alphabet(alphabet)
+        counts = self.counts(phase)
+        sixes = sum(counts[LETTER_INDEX[c]] for c in alphabet[:6])
+        return sixes, sum(counts) - sixes
+
+    def class_iocs(self, alphabet, phase=None):
+        """Returns the index of coincidence of the (sixes, twenties) letters
+        of the plugboard alphabet, each taken on its own.
+
+        """
+        alphabet = validate_alphabet(alphabet)
+        counts = self.counts(phase)
+        return (_ioc([counts[LETTER_INDEX[c]] for c in alphabet[:6]]),
+                _ioc([counts[LETTER_INDEX[c]] for c in alphabet[6:]]))
+
+    def as_dict(self, alphabet=None):
+        """Returns a summary of the statistics as a dictionary."""
+        result = {
+            'messages': self.messages,
+            'letters': self.letters,
+            'garbles': self.garbles,
+            'ioc': self.ioc(),
+            'counts': dict(zip(LETTERS, self.counts())),
+            'phase_ioc': self.phase_iocs(),
+        }
+        if alphabet is not None:
+            result['sixes'], result['twenties'] = self.class_counts(alphabet)
+        return result
+
+
+def file_stats(path, chunk_size=64 * 1024):
+    """Returns a TextStats counting the file at path as one message."""
+    stats = TextStats()
+    with open(path, 'r') as fp:
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                break
+            stats.update(chunk)
+    stats.new_message()
+    return stats
+
+
+def collect(paths, jobs=1):
+    """Returns a TextStats counting each file in paths as one message. If
+    jobs is not 1 the files are counted on a pool of jobs worker processes (0
+    means one per CPU) and the results merged.
+
+    """
+    total = TextStats()
+    if jobs == 1:
+        for path in paths:
+            total.merge(file_stats(path))
+        return total
+
+    with ProcessPoolExecutor(jobs or None) as executor:
+        for stats in executor.map(file_stats, paths):
+            total.merge(stats)
+    return total
+
+
+def main(argv=None):
+    """Entry point for the "purple stats" command."""
+
+    parser = argparse.ArgumentParser(prog='purple stats', description=DESC,
+            epilog=EPILOG)
+    parser.add_argument('files', nargs='+', metavar='FILE',
+        help='ciphertext files, one message per file')
+    parser.add_argument('-a', '--alphabet',
+        help='split the counts by the sixes and twenties of this alphabet')
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N',
+        help=('count files on %(metavar)s worker processes; a value of 0 '
+              'means one per CPU [default: %(default)s]'))
+    parser.add_argument('-p', '--phases', action='store_true',
+        help='also report the index of coincidence at each offset mod 25')
+
+    args = parser.parse_args(args=argv)
+
+    if args.jobs < 0:
+        parser.error("The --jobs option must be 0 or greater")
+
+    try:
+        if args.alphabet is not None:
+            args.alphabet = validate_alphabet(args.alphabet)
+        stats = collect(args.files, args.jobs)
+    except (Purple97Error, OSError, UnicodeDecodeError) as ex:
+        raise SystemExit(str(ex))
+
+    print('messages: {}'.format(stats.messages))
+    print('letters:  {}'.format(stats.letters))
+    print('garbles:  {}'.format(stats.garbles))
+    print('IoC:      {:.5f}'.format(stats.ioc()))
+    if args.alphabet is not None:
+        sixes, twenties = stats.class_counts(args.alphabet)
+        sixes_ioc, twenties_ioc = stats.class_iocs(args.alphabet)
+        total = sixes + twenties or 1
+        print('sixes:    {} ({:.2%}), IoC {:.5f}'.format(sixes, sixes / total,
+                sixes_ioc))
+        print('twenties: {} ({:.2%}), IoC {:.5f}'.format(twenties,
+                twenties / total, twenties_ioc))
+
+    print()
+    counts = stats.counts()
+    total = sum(counts) or 1
+    for c, n in zip(LETTERS, counts):
+        print('{}  {:>10}  {:6.2%}'.format(c, n, n / total))
+
+    if args.phases:
+        print()
+        for phase, value in enumerate(stats.phase_iocs()):
+            print('{:>2}  {:.5f}'.format(phase, value))
@@ -0,0 +1,259 @@
+# Copyright (C) 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+
+"""This module contains a NumPy based engine for enciphering many messages,
+each under its own key, in a single vectorized pass.
+
+NumPy is an optional dependency of purple; it is only required by this module.
+
+Messages are represented as a 2-D array of letter codes, one row per message,
+where A-Z are 0-25 and GARBLE (26) marks a garble or padding. The encode() and
+decode() helpers convert between lists of strings and this representation.
+
+Keys are given as arrays:
+
+    switches_pos: shape (M, 4), 0-based starting positions as described in
+        Purple97.__init__
+    motions: shape (M, 2), the fast and middle switch numbers (1-3)
+    alphabets: either a single 26-letter string shared by all rows, or a
+        sequence of M such strings, or an (M, 26) array of letter codes
+
+Because the switch positions at every letter are a closed form function of the
+starting positions (see purple.machine.advance_positions), the positions for
+all rows and columns are computed at once, and the wiring tables from
+purple.wiring, stacked into ndarrays, are gathered with fancy indexing.
+
+"""
+import string
+
+import numpy as np
+
+from purple.machine import Purple97Error
+import purple.wiring as wiring
+
+
+GARBLE = 26
+
+_LETTERS = np.frombuffer(string.ascii_uppercase.encode('ascii') + b'-',
+                         dtype=np.uint8)
+
+_ENCODE = np.full(256, 255, dtype=np.uint8)
+_ENCODE[_LETTERS] = np.arange(27, dtype=np.uint8)
+
+
+def _stack(tables):
+    """Stacks flat wiring tables from purple.wiring into a 1-D ndarray."""
+    return np.frombuffer(b''.join(tables), dtype=np.uint8).astype(np.intp)
+
+
+# Stacked wiring: sixes is (25, 6), twenties is (3, 25, 20)
+SIXES_DECRYPT = _stack(wiring.DECRYPT_TABLES[:1]).reshape(25, 6)
+SIXES_ENCRYPT = _stack(wiring.ENCRYPT_TABLES[:1]).reshape(25, 6)
+TWENTIES_DECRYPT = _stack(wiring.DECRYPT_TABLES[1:]).reshape(3, 25, 20)
+TWENTIES_ENCRYPT = _stack(wiring.ENCRYPT_TABLES[1:]).reshape(3, 25, 20)
+
+
+def encode(messages, width=None):
+    """Encodes a sequence of message strings into a 2-D uint8 array of letter
+    codes, padded with GARBLE to width columns (default: the longest message).
+
+    A 2-tuple of (array, lengths) is returned, where lengths is a 1-D array of
+    the original message lengths. Only A-Z and '-' are accepted; anything else
+    raises a Purple97Error.
+
+    """
+    lengths = np.array([len(msg) for msg in messages], dtype=np.intp)
+    if width is None:
+        width = int(lengths.max()) if len(messages) else 0
+    elif (lengths > width).any():
+        raise Purple97Error("message longer than width")
+
+    try:
+        raw = np.frombuffer(''.join(messages).encode('ascii'), dtype=np.uint8)
+    except UnicodeEncodeError:
+        raise Purple97Error("invalid input in messages")
+    letters = _ENCODE[raw]
+    if (letters == 255).any():
+        raise Purple97Error("invalid input in messages")
+
+    # Scatter the concatenated letters into their padded rows:
+    rows = np.repeat(np.arange(len(messages)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    cols = np.arange(len(raw)) - np.repeat(starts, lengths)
+    codes = np.full((len(messages), width), GARBLE, dtype=np.uint8)
+    codes[rows, cols] = letters
+
+    return codes, lengths
+
+
+def decode(codes, lengths=None):
+    """Decodes a 2-D array of letter codes back into a list of strings. If
+    lengths is given, each row is truncated to its length; GARBLE codes are
+    decoded as '-'.
+
+    """
+    codes = np.asarray(codes)
+    rows = _LETTERS[codes]
+    if lengths is None:
+        lengths = [codes.shape[1]] * codes.shape[0]
+    return [row[:n].tobytes().decode('ascii') for row, n in zip(rows, lengths)]
+
+
+def positions(switches_pos, motions, n):
+    """Computes the switch positions of every row at each of n letters.
+
+    An int32 array of shape (M, n, 4) is returned, holding the sixes position and
+    the positions of twenties switches 1-3 in effect when each letter is
+    processed. This is a vectorized form of purple.machine.advance_positions.
+
+    """
+    switches_pos = np.asarray(switches_pos, dtype=np.intp)
+    motions = np.asarray(motions, dtype=np.intp)
+    _validate_keys(switches_pos, motions)
+
+    m = switches_pos.shape[0]
+    steps = np.arange(n, dtype=np.int32)[np.newaxis, :]
+    sixes = switches_pos[:, 0:1]
+
+    fast = motions[:, 0]
+    middle = motions[:, 1]
+    slow = 6 - fast - middle
+    rows = np.arange(m)
+    middle_pos = switches_pos[rows, middle][:, np.newaxis]
+
+    middle_steps = _count_visits(sixes, 24, steps)
+    sixes_23 = _count_visits(sixes, 23, steps)
+    first = (24 - middle_pos - (sixes == 24)) % 25
+    slow_steps = np.where(sixes_23 <= first, 0, (sixes_23 - 1 - first) // 25 + 1)
+    fast_steps = steps - middle_steps - slow_steps
+
+    result = np.empty((m, n, 4), dtype=np.int32)
+    result[:, :, 0] = (sixes + steps) % 25
+    for switch_n in (1, 2, 3):
+        moved = np.where((fast == switch_n)[:, np.newaxis], fast_steps,
+                    np.where((middle == switch_n)[:, np.newaxis], middle_steps,
+                             slow_steps))
+        result[:, :, switch_n] = (switches_pos[:, switch_n:switch_n + 1] +
+                                  moved) % 25
+    return result
+
+
+def decrypt(switches_pos, motions, alphabets, codes):
+    """Decrypts a 2-D array of ciphertext letter codes, one row per key, and
+    returns a 2-D uint8 array of plaintext letter codes. GARBLE codes are
+    passed through unchanged, and the machine is stepped, as in
+    Purple97.decrypt.
+
+    """
+    return _run(switches_pos, motions, alphabets, codes, True)
+
+
+def encrypt(switches_pos, motions, alphabets, codes):
+    """Encrypts a 2-D array of plaintext letter codes, one row per key, and
+    returns a 2-D uint8 array of ciphertext letter codes. GARBLE codes are
+    passed through unchanged, and the machine is stepped; this allows rows of
+    different lengths to be padded.
+
+    """
+    return _run(switches_pos, motions, alphabets, codes, False)
+
+
+def _count_visits(start, target, n):
+    """Vectorized form of purple.machine._count_visits."""
+    first = (target - start) % 25
+    return np.where(n <= first, 0, (n - 1 - first) // 25 + 1)
+
+
+def _validate_keys(switches_pos, motions):
+    """Raises Purple97Error if the key arrays are malformed."""
+    if switches_pos.ndim != 2 or switches_pos.shape[1] != 4:
+        raise Purple97Error("switches_pos must have shape (M, 4)")
+    if motions.shape != (switches_pos.shape[0], 2):
+        raise Purple97Error("motions must have shape (M, 2)")
+    if ((switches_pos < 0) | (switches_pos > 24)).any():
+        raise Purple97Error("switch positions out of range (0-24)")
+    if ((motions < 1) | (motions > 3)).any():
+        raise Purple97Error("motion switch numbers out of range (1-3)")
+    if (motions[:, 0] == motions[:, 1]).any():
+        raise Purple97Error("fast & middle switches cannot be the same")
+
+
+def _alphabet_codes(alphabets, m):
+    """Converts the alphabets argument into an (m, 26) array of letter codes,
+    validating that each row is a permutation of A-Z.
+
+    """
+    if isinstance(alphabets, str):
+        codes = np.broadcast_to(_alphabet_codes([alphabets], 1), (m, 26))
+        return codes
+    if not isinstance(alphabets, np.ndarray):
+        alphabets = [a.upper() for a in alphabets]
+        if any(len(a) != 26 for a in alphabets):
+            raise Purple97Error("invalid alphabet length")
+        codes, _ = encode(alphabets, 26)
+    else:
+        codes = alphabets
+
+    if codes.shape != (m, 26):
+        raise Purple97Error("alphabets must have shape (M, 26)")
+    if not (np.sort(codes, axis=1) == np.arange(26)).all():
+        raise Purple97Error("invalid alphabet")
+    return codes.astype(np.uint8)
+
+
+def _run(switches_pos, motions, alphabets, codes, decrypt):
+    """Enciphers codes in the given direction; see encrypt() and decrypt()."""
+    codes = np.asarray(codes)
+    if codes.ndim != 2:
+        raise Purple97Error("messages must be a 2-D array")
+    if ((codes < 0) | (codes > GARBLE)).any():
+        raise Purple97Error("invalid letter code in messages")
+
+    m, n = codes.shape
+    switches_pos = np.asarray(switches_pos, dtype=np.intp)
+    if switches_pos.shape[:1] != (m,):
+        raise Purple97Error("one key is required per message")
+    pos = positions(switches_pos, motions, n)
+
+    # Plugboard and output alphabet, extended so that GARBLE maps to itself:
+    alphabet = np.empty((m, 27), dtype=np.uint8)
+    alphabet[:, :26] = _alphabet_codes(alphabets, m)
+    alphabet[:, GARBLE] = GARBLE
+    rows = np.arange(m)[:, np.newaxis]
+    plugboard = np.empty((m, 27), dtype=np.uint8)
+    plugboard[rows, alphabet] = np.arange(27, dtype=np.uint8)
+
+    levels = plugboard[rows, codes]
+    is_sixes = levels < 6
+
+    sixes_index = pos[:, :, 0] * 6 + np.minimum(levels, 5)
+    twenties_index = ((pos[:, :, 1] * 625 + pos[:, :, 2] * 25 + pos[:, :, 3]) *
+                      20 + np.clip(levels.astype(np.int32) - 6, 0, 19))
+
+    if decrypt:
+        sixes, twenties = SIXES_DECRYPT, _FUSED_DECRYPT
+    else:
+        sixes, twenties = SIXES_ENCRYPT, _FUSED_ENCRYPT
+
+    out_levels = np.where(is_sixes, sixes.ravel()[sixes_index],
+                          twenties[twenties_index] + 6)
+    out_levels[levels == GARBLE] = GARBLE
+    return alphabet[rows, out_levels]
+
+
+def _fuse(twenties, decrypt):
+    """Composes the three stacked twenties wiring tables into a flat table
+    indexed by (t1 * 625 + t2 * 25 + t3) * 20 + level.
+
+    """
+    p1, p2, p3, level = np.ix_(*[np.arange(25)] * 3 + [np.arange(20)])
+    if decrypt:
+        fused = twenties[0][p1, twenties[1][p2, twenties[2][p3, level]]]
+    else:
+        fused = twenties[2][p3, twenties[1][p2, twenties[0][p1, level]]]
+    return fused.astype(np.uint8).ravel()
+
+
+_FUSED_DECRYPT = _fuse(TWENTIES_DECRYPT, True)
+_FUSED_ENCRYPT = _fuse(TWENTIES_ENCRYPT, False)
@@ -0,0 +1,233 @@
+# Copyright (C) 2013 - 2026 by Brian Neal.
+# This file is part of purple, the PURPLE (Cipher Machine 97) simulation.
+# purple is released under the MIT License (see LICENSE.txt).
+#
+# This file was generated by purple.data; do not edit.
+
+"""This module contains the 0-based wiring tables for the PURPLE switches,
+precomputed from the 1-based data in purple.data.
+
+Each table is a bytes object indexed by position * num_levels + level, in the
+order sixes, twenties 1, twenties 2, twenties 3.
+
+"""
+
+NUM_LEVELS = [6, 20, 20, 20]
+
+DECRYPT_TABLES = (
+    (b'\x01\x00\x02\x04\x03\x05\x05\x02\x04\x01\x00\x03\x00\x04\x03\x05'
+     b'\x01\x02\x03\x02\x01\x00\x05\x04\x02\x05\x00\x03\x04\x01\x01\x00'
+     b'\x05\x04\x02\x03\x05\x04\x03\x01\x00\x02\x02\x05\x00\x03\x04\x01'
+     b'\x04\x03\x01\x05\x02\x00\x03\x04\x02\x01\x00\x05\x01\x00\x03\x04'
+     b'\x05\x02\x04\x03\x05\x02\x01\x00\x02\x00\x01\x05\x03\x04\x03\x01'
+     b'\x04\x00\x02\x05\x00\x05\x01\x02\x04\x03\x04\x03\x02\x05\x00\x01'
+     b'\x05\x01\x04\x02\x03\x00\x01\x02\x03\x00\x04\x05\x00\x01\x02\x04'
+     b'\x05\x03\x02\x00\x05\x03\x01\x04\x05\x04\x00\x01\x03\x02\x00\x02'
+     b'\x05\x03\x01\x04\x05\x03\x04\x00\x02\x01\x03\x05\x00\x01\x04\x02'
+     b'\x04\x01\x03\x02\x05\x00'),
+    (b'\x05\x12\x0d\x00\x09\x03\x01\x06\x0c\x08\x07\x0f\x02\x11\x0e\x0a'
+     b'\x04\x0b\x13\x10\x03\x04\x0f\x10\x0d\x00\x13\x0e\x02\x07\x11\x0a'
+     b'\x0b\x0c\x09\x12\x01\x05\x08\x06\x10\x00\x0c\x05\x0e\x0a\x12\x0b'
+     b'\x0f\x11\x09\x02\x06\x0d\x07\x13\x03\x08\x01\x04\x02\x0d\x13\x03'
+     b'\x05\x0f\x07\x12\x01\x0b\x10\x08\x04\x00\x0a\x09\x06\x0c\x0e\x11'
+     b'\x12\x05\x07\x13\x0c\x04\x11\x03\x09\x02\x0f\x0e\x0d\x0b\x06\x01'
+     b'\x10\x0a\x00\x08\x01\x0a\x08\x0d\x06\x12\x05\x02\x11\x0c\x0b\x07'
+     b'\x09\x0e\x0f\x10\x13\x03\x04\x00\x0f\x06\x05\x11\x08\x09\x0c\x00'
+     b'\x10\x01\x04\x03\x0a\x12\x13\x0d\x07\x0e\x02\x0b\x00\x13\x06\x0f'
+     b'\x0b\x0d\x04\x11\x0e\x09\x0c\x05\x07\x02\x03\x08\x0a\x10\x12\x01'
+     b'\x10\x08\x0a\x07\x13\x11\x06\x0d\x00\x0f\x0e\x04\x12\x01\x05\x0b'
+     b'\x03\x09\x0c\x02\x0b\x07\x10\x08\x02\x13\x03\x09\x0d\x04\x06\x11'
+     b'\x01\x0f\x0c\x05\x00\x12\x0e\x0a\x13\x00\x0f\x0a\x01\x10\x08\x03'
+     b'\x07\x0e\x09\x0c\x02\x11\x0d\x04\x05\x06\x0b\x12\x04\x03\x0e\x01'
+     b'\x0c\x12\x05\x0f\x0b\x0d\x07\x06\x10\x09\x11\x02\x08\x00\x0a\x13'
+     b'\x0e\x10\x09\x12\x0f\x01\x0a\x07\x08\x06\x02\x0d\x11\x0c\x0b\x00'
+     b'\x04\x13\x05\x03\x0a\x0b\x06\x02\x07\x0e\x0f\x05\x03\x13\x01\x04'
+     b'\x00\x08\x12\x11\x09\x0d\x10\x0c\x0b\x0f\x01\x06\x03\x07\x0e\x12'
+     b'\x04\x00\x0a\x08\x13\x10\x05\x0d\x0c\x02\x11\x09\x07\x0e\x11\x00'
+     b'\x0b\x0a\x10\x0d\x13\x0f\x0c\x12\x08\x06\x02\x03\x01\x04\x09\x05'
+     b'\x06\x02\x04\x11\x10\x0c\x12\x13\x0d\x0a\x08\x09\x01\x05\x00\x0e'
+     b'\x0b\x0f\x03\x07\x09\x0c\x03\x0d\x11\x02\x01\x10\x0a\x12\x13\x00'
+     b'\x05\x0b\x08\x06\x0e\x07\x04\x0f\x0c\x06\x08\x0b\x13\x0f\x0d\x09'
+     b'\x12\x05\x00\x01\x0a\x03\x04\x02\x11\x10\x07\x0e\x00\x01\x02\x03'
+     b'\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f\x10\x11\x12\x13'
+     b'\x08\x13\x0b\x04\x09\x10\x00\x0c\x06\x0e\x03\x02\x0f\x07\x11\x0a'
+     b'\x12\x01\x0d\x05\x11\x0e\x01\x0c\x00\x06\x09\x04\x12\x10\x05\x13'
+     b'\x08\x0a\x0b\x07\x02\x03\x0f\x0d\x0f\x11\x12\x09\x0a\x13\x04\x08'
+     b'\x00\x03\x0b\x0c\x06\x05\x10\x01\x0d\x0e\x02\x07\x04\x07\x00\x0e'
+     b'\x12\x08\x0b\x01\x05\x02\x0d\x10\x03\x13\x0f\x0c\x11\x09\x06\x0a'
+     b'\x0d\x09\x03\x07\x08\x0b\x02\x0a\x10\x13\x12\x05\x0e\x04\x01\x11'
+     b'\x0f\x06\x00\x0c'),
+    (b'\x0e\x08\x00\x04\x10\x12\x02\x01\x09\x07\x0a\x11\x0b\x0f\x05\x0c'
+     b'\x13\x03\x0d\x06\x0b\x05\x0e\x01\x03\x08\x07\x0f\x12\x10\x04\x0a'
+     b'\x13\x06\x09\x11\x00\x0d\x0c\x02\x03\x11\x04\x07\x0f\x00\x0b\x0e'
+     b'\x13\x0d\x0c\x10\x0a\x01\x06\x08\x05\x02\x09\x12\x05\x0a\x01\x13'
+     b'\x0d\x06\x11\x0b\x0e\x02\x07\x04\x09\x00\x10\x12\x08\x0f\x03\x0c'
+     b'\x06\x01\x0c\x02\x08\x03\x10\x0d\x00\x0b\x11\x13\x05\x0a\x0f\x0e'
+     b'\x04\x07\x12\x09\x04\x10\x0d\x06\x09\x08\x12\x13\x07\x0c\x00\x01'
+     b'\x0f\x02\x03\x0b\x0a\x11\x05\x0e\x07\x03\x02\x0a\x12\x0c\x01\x08'
+     b'\x0b\x0f\x09\x10\x0d\x0e\x13\x05\x11\x00\x06\x04\x13\x00\x0f\x09'
+     b'\x0e\x07\x0d\x0a\x11\x04\x02\x06\x0c\x10\x12\x03\x01\x08\x0b\x05'
+     b'\x08\x07\x06\x0e\x04\x01\x03\x0c\x10\x00\x0a\x05\x12\x11\x0d\x09'
+     b'\x02\x13\x0f\x0b\x09\x0b\x0a\x11\x07\x0f\x13\x10\x04\x05\x08\x02'
+     b'\x03\x12\x0c\x06\x00\x0d\x0e\x01\x0a\x06\x0d\x03\x11\x13\x05\x00'
+     b'\x0c\x12\x0b\x0e\x04\x08\x0f\x01\x10\x09\x07\x02\x01\x02\x08\x09'
+     b'\x0c\x0d\x0e\x0f\x06\x0a\x13\x0b\x11\x05\x00\x04\x07\x10\x12\x03'
+     b'\x0f\x09\x0e\x00\x10\x02\x0c\x08\x03\x06\x05\x07\x01\x0d\x04\x0a'
+     b'\x0b\x12\x11\x13\x12\x0f\x11\x0b\x02\x0c\x08\x09\x05\x01\x10\x0d'
+     b'\x0a\x03\x06\x13\x0e\x04\x00\x07\x11\x0d\x0b\x12\x00\x06\x09\x05'
+     b'\x0a\x0e\x04\x08\x07\x13\x10\x03\x02\x0c\x01\x0f\x13\x02\x12\x01'
+     b'\x03\x04\x0a\x0d\x08\x09\x11\x0f\x0e\x0b\x07\x06\x0c\x05\x10\x00'
+     b'\x02\x05\x03\x0d\x01\x0b\x0f\x04\x11\x13\x06\x12\x00\x0e\x08\x07'
+     b'\x09\x0a\x0c\x10\x04\x0e\x13\x08\x09\x10\x00\x12\x0c\x0b\x03\x01'
+     b'\x06\x05\x0a\x0d\x0f\x07\x02\x11\x0d\x13\x0c\x10\x04\x11\x07\x03'
+     b'\x01\x0e\x0f\x00\x08\x12\x02\x05\x06\x09\x0b\x0a\x07\x0a\x00\x05'
+     b'\x12\x0d\x04\x11\x10\x02\x09\x0c\x0b\x13\x0e\x0f\x03\x01\x06\x08'
+     b'\x10\x12\x05\x00\x0b\x0e\x13\x06\x0f\x08\x02\x0a\x0c\x09\x01\x11'
+     b'\x07\x03\x04\x0d\x00\x04\x0b\x13\x05\x0a\x0d\x07\x08\x06\x12\x03'
+     b'\x02\x0c\x09\x10\x11\x0f\x0e\x01\x0f\x07\x09\x0c\x0a\x05\x12\x04'
+     b'\x02\x03\x0e\x13\x10\x01\x11\x00\x0d\x06\x08\x0b\x12\x0c\x07\x0f'
+     b'\x13\x09\x06\x00\x01\x11\x0d\x05\x08\x04\x0b\x02\x10\x0e\x0a\x03'
+     b'\x0c\x00\x10\x0e\x06\x03\x0f\x02\x0d\x04\x01\x09\x11\x07\x0a\x08'
+     b'\x12\x0b\x13\x05'),
+    (b'\x06\x12\x0a\x02\x13\x00\x09\x05\x0f\x0b\x10\x0c\x07\x08\x03\x11'
+     b'\x04\x0d\x0e\x01\x0e\x10\x0d\x01\x0b\x0c\x07\x02\x00\x12\x08\x03'
+     b'\x09\x06\x0a\x13\x0f\x05\x11\x04\x01\x0a\x13\x0b\x00\x12\x03\x09'
+     b'\x08\x0d\x05\x0e\x0c\x02\x06\x0f\x11\x07\x04\x10\x0f\x02\x0b\x08'
+     b'\x03\x13\x05\x12\x11\x01\x04\x07\x0d\x0a\x09\x00\x0e\x10\x0c\x06'
+     b'\x0b\x11\x0f\x03\x08\x02\x0e\x0c\x05\x13\x07\x01\x06\x09\x04\x12'
+     b'\x0d\x00\x10\x0a\x0c\x08\x04\x05\x07\x06\x0b\x10\x0d\x11\x13\x09'
+     b'\x01\x12\x0a\x0e\x03\x02\x00\x0f\x03\x06\x01\x0e\x10\x09\x12\x04'
+     b'\x07\x0f\x00\x0b\x02\x0c\x05\x0d\x13\x08\x0a\x11\x08\x05\x03\x09'
+     b'\x11\x0f\x07\x0d\x04\x0b\x10\x00\x13\x0e\x0c\x12\x01\x0a\x06\x02'
+     b'\x04\x0d\x11\x10\x0c\x0e\x0a\x0b\x06\x07\x02\x05\x00\x01\x13\x03'
+     b'\x08\x09\x0f\x12\x0a\x0f\x08\x11\x02\x0b\x04\x0e\x09\x00\x0d\x10'
+     b'\x01\x03\x12\x05\x07\x06\x0c\x13\x12\x07\x02\x0e\x0d\x04\x00\x0a'
+     b'\x01\x09\x0b\x0f\x11\x13\x10\x06\x0c\x03\x08\x05\x00\x0b\x10\x0c'
+     b'\x08\x06\x0d\x01\x0e\x03\x04\x0a\x05\x0f\x02\x07\x11\x12\x13\x09'
+     b'\x02\x03\x09\x0b\x00\x11\x01\x07\x0d\x0c\x12\x06\x0f\x05\x0e\x08'
+     b'\x10\x13\x04\x0a\x08\x0a\x05\x04\x09\x03\x10\x12\x0c\x0e\x06\x01'
+     b'\x0b\x11\x0d\x13\x00\x0f\x07\x02\x07\x0c\x0d\x0f\x12\x0b\x13\x06'
+     b'\x09\x02\x0e\x08\x03\x10\x00\x0a\x04\x01\x05\x11\x11\x0f\x0e\x03'
+     b'\x01\x10\x0c\x0b\x05\x0a\x13\x12\x0d\x04\x08\x00\x07\x06\x02\x09'
+     b'\x0d\x00\x06\x13\x05\x0c\x0f\x11\x0b\x08\x03\x10\x04\x0a\x01\x02'
+     b'\x09\x0e\x12\x07\x10\x12\x00\x0a\x06\x01\x11\x03\x02\x07\x09\x04'
+     b'\x0e\x0b\x0f\x08\x05\x0c\x13\x0d\x09\x0e\x01\x0d\x0a\x05\x06\x00'
+     b'\x0f\x13\x0c\x02\x08\x07\x11\x10\x12\x04\x0b\x03\x13\x08\x07\x05'
+     b'\x0b\x0a\x01\x04\x03\x06\x0f\x0d\x10\x02\x0e\x09\x0c\x12\x11\x00'
+     b'\x0a\x13\x0c\x07\x0f\x09\x11\x0d\x12\x05\x0e\x03\x00\x10\x06\x04'
+     b'\x02\x08\x01\x0b\x0f\x04\x09\x12\x03\x11\x0e\x10\x00\x02\x01\x13'
+     b'\x0a\x05\x07\x0c\x06\x0b\x0d\x08\x05\x09\x12\x0f\x04\x08\x00\x13'
+     b'\x10\x03\x0a\x11\x06\x0d\x0c\x01\x0b\x07\x02\x0e\x07\x06\x04\x00'
+     b'\x0e\x0d\x08\x0f\x0a\x10\x11\x05\x12\x13\x02\x0b\x03\x01\x09\x0c'
+     b'\x0c\x01\x10\x06\x0d\x07\x02\x08\x13\x04\x0f\x09\x05\x00\x0b\x0e'
+     b'\x0a\x11\x03\x12'),
+)
+
+ENCRYPT_TABLES = (
+    (b'\x01\x00\x02\x04\x03\x05\x04\x03\x01\x05\x02\x00\x00\x04\x05\x02'
+     b'\x01\x03\x03\x02\x01\x00\x05\x04\x02\x05\x00\x03\x04\x01\x01\x00'
+     b'\x04\x05\x03\x02\x04\x03\x05\x02\x01\x00\x02\x05\x00\x03\x04\x01'
+     b'\x05\x02\x04\x01\x00\x03\x04\x03\x02\x00\x01\x05\x01\x00\x05\x02'
+     b'\x03\x04\x05\x04\x03\x01\x00\x02\x01\x02\x00\x04\x05\x03\x03\x01'
+     b'\x04\x00\x02\x05\x00\x02\x03\x05\x04\x01\x04\x05\x02\x01\x00\x03'
+     b'\x05\x01\x03\x04\x02\x00\x03\x00\x01\x02\x04\x05\x00\x01\x02\x05'
+     b'\x03\x04\x01\x04\x00\x03\x05\x02\x02\x03\x05\x04\x01\x00\x00\x04'
+     b'\x01\x03\x05\x02\x03\x05\x04\x01\x02\x00\x02\x03\x05\x00\x04\x01'
+     b'\x05\x01\x03\x02\x00\x04'),
+    (b'\x03\x06\x0c\x05\x10\x00\x07\x0a\x09\x04\x0f\x11\x08\x02\x0e\x0b'
+     b'\x13\x0d\x01\x12\x05\x10\x08\x00\x01\x11\x13\x09\x12\x0e\x0b\x0c'
+     b'\x0d\x04\x07\x02\x03\x0a\x0f\x06\x01\x12\x0b\x10\x13\x03\x0c\x0e'
+     b'\x11\x0a\x05\x07\x02\x0d\x04\x08\x00\x09\x06\x0f\x0d\x08\x00\x03'
+     b'\x0c\x04\x10\x06\x0b\x0f\x0e\x09\x11\x01\x12\x05\x0a\x13\x07\x02'
+     b'\x12\x0f\x09\x07\x05\x01\x0e\x02\x13\x08\x11\x0d\x04\x0c\x0b\x0a'
+     b'\x10\x06\x00\x03\x13\x00\x07\x11\x12\x06\x04\x0b\x02\x0c\x01\x0a'
+     b'\x09\x03\x0d\x0e\x0f\x08\x05\x10\x07\x09\x12\x0b\x0a\x02\x01\x10'
+     b'\x04\x05\x0c\x13\x06\x0f\x11\x00\x08\x03\x0d\x0e\x00\x13\x0d\x0e'
+     b'\x06\x0b\x02\x0c\x0f\x09\x10\x04\x0a\x05\x08\x03\x11\x07\x12\x01'
+     b'\x08\x0d\x13\x10\x0b\x0e\x06\x03\x01\x11\x02\x0f\x12\x07\x0a\x09'
+     b'\x00\x05\x0c\x04\x10\x0c\x04\x06\x09\x0f\x0a\x01\x03\x07\x13\x00'
+     b'\x0e\x08\x12\x0d\x02\x0b\x11\x05\x01\x04\x0c\x07\x0f\x10\x11\x08'
+     b'\x06\x0a\x03\x12\x0b\x0e\x09\x02\x05\x0d\x13\x00\x11\x03\x0f\x01'
+     b'\x00\x06\x0b\x0a\x10\x0d\x12\x08\x04\x09\x02\x07\x0c\x0e\x05\x13'
+     b'\x0f\x05\x0a\x13\x10\x12\x09\x07\x08\x02\x06\x0e\x0d\x0b\x00\x04'
+     b'\x01\x0c\x03\x11\x0c\x0a\x03\x08\x0b\x07\x02\x04\x0d\x10\x00\x01'
+     b'\x13\x11\x05\x06\x12\x0f\x0e\x09\x09\x02\x11\x04\x08\x0e\x03\x05'
+     b'\x0b\x13\x0a\x00\x10\x0f\x06\x01\x0d\x12\x07\x0c\x03\x10\x0e\x0f'
+     b'\x11\x13\x0d\x00\x0c\x12\x05\x04\x0a\x07\x01\x09\x06\x02\x0b\x08'
+     b'\x0e\x0c\x01\x12\x02\x0d\x00\x13\x0a\x0b\x09\x10\x05\x08\x0f\x11'
+     b'\x04\x03\x06\x07\x0b\x06\x05\x02\x12\x0c\x0f\x11\x0e\x00\x08\x0d'
+     b'\x01\x03\x10\x13\x07\x04\x09\x0a\x0a\x0b\x0f\x0d\x0e\x09\x01\x12'
+     b'\x02\x07\x0c\x03\x00\x06\x13\x05\x11\x10\x08\x04\x00\x01\x02\x03'
+     b'\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f\x10\x11\x12\x13'
+     b'\x06\x11\x0b\x0a\x03\x13\x08\x0d\x00\x04\x0f\x02\x07\x12\x09\x0c'
+     b'\x05\x0e\x10\x01\x04\x02\x10\x11\x07\x0a\x05\x0f\x0c\x06\x0d\x0e'
+     b'\x03\x13\x01\x12\x09\x00\x08\x0b\x08\x0f\x12\x09\x06\x0d\x0c\x13'
+     b'\x07\x03\x04\x0a\x0b\x10\x11\x00\x0e\x01\x02\x05\x02\x07\x09\x0c'
+     b'\x00\x08\x12\x01\x05\x11\x13\x06\x0f\x0a\x03\x0e\x0b\x10\x04\x0d'
+     b'\x12\x0e\x06\x02\x0d\x0b\x11\x03\x04\x01\x07\x05\x13\x00\x0c\x10'
+     b'\x08\x0f\x0a\x09'),
+    (b'\x02\x07\x06\x11\x03\x0e\x13\x09\x01\x08\x0a\x0c\x0f\x12\x00\x0d'
+     b'\x04\x0b\x05\x10\x10\x03\x13\x04\x0a\x01\x0d\x06\x05\x0e\x0b\x00'
+     b'\x12\x11\x02\x07\x09\x0f\x08\x0c\x05\x0d\x11\x00\x02\x10\x0e\x03'
+     b'\x0f\x12\x0c\x06\x0a\x09\x07\x04\x0b\x01\x13\x08\x0d\x02\x09\x12'
+     b'\x0b\x00\x05\x0a\x10\x0c\x01\x07\x13\x04\x08\x11\x0e\x06\x0f\x03'
+     b'\x08\x01\x03\x05\x10\x0c\x00\x11\x04\x13\x0d\x09\x02\x07\x0f\x0e'
+     b'\x06\x0a\x12\x0b\x0a\x0b\x0d\x0e\x00\x12\x03\x08\x05\x04\x10\x0f'
+     b'\x09\x02\x13\x0c\x01\x11\x06\x07\x11\x06\x02\x01\x13\x0f\x12\x00'
+     b'\x07\x0a\x03\x08\x05\x0c\x0d\x09\x0b\x10\x04\x0e\x01\x10\x0a\x0f'
+     b'\x09\x13\x0b\x05\x11\x03\x07\x12\x0c\x06\x04\x02\x0d\x08\x0e\x00'
+     b'\x09\x05\x10\x06\x04\x0b\x02\x01\x00\x0f\x0a\x13\x07\x0e\x03\x12'
+     b'\x08\x0d\x0c\x11\x10\x13\x0b\x0c\x08\x09\x0f\x04\x0a\x00\x02\x01'
+     b'\x0e\x11\x12\x05\x07\x03\x0d\x06\x07\x0f\x13\x03\x0c\x06\x01\x12'
+     b'\x0d\x11\x00\x0a\x08\x02\x0b\x0e\x10\x04\x09\x05\x0e\x00\x01\x13'
+     b'\x0f\x0d\x08\x10\x02\x03\x09\x0b\x04\x05\x06\x07\x11\x0c\x12\x0a'
+     b'\x03\x0c\x05\x08\x0e\x0a\x09\x0b\x07\x01\x0f\x10\x06\x0d\x02\x00'
+     b'\x04\x12\x11\x13\x12\x09\x04\x0d\x11\x08\x0e\x13\x06\x07\x0c\x03'
+     b'\x05\x0b\x10\x01\x0a\x02\x00\x0f\x04\x12\x10\x0f\x0a\x07\x05\x0c'
+     b'\x0b\x06\x08\x02\x11\x01\x09\x13\x0e\x00\x03\x0d\x13\x03\x01\x04'
+     b'\x05\x11\x0f\x0e\x08\x09\x06\x0d\x10\x07\x0c\x0b\x12\x0a\x02\x00'
+     b'\x0c\x04\x00\x02\x07\x01\x0a\x0f\x0e\x10\x11\x05\x12\x03\x0d\x06'
+     b'\x13\x08\x0b\x09\x06\x0b\x12\x0a\x00\x0d\x0c\x11\x03\x04\x0e\x09'
+     b'\x08\x0f\x01\x10\x05\x13\x07\x02\x0b\x08\x0e\x07\x04\x0f\x10\x06'
+     b'\x0c\x11\x13\x12\x02\x00\x09\x0a\x03\x05\x0d\x01\x02\x11\x09\x10'
+     b'\x06\x03\x12\x00\x13\x0a\x01\x0c\x0b\x05\x0e\x0f\x08\x07\x04\x0d'
+     b'\x03\x0e\x0a\x11\x12\x02\x07\x10\x09\x0d\x0b\x04\x0c\x13\x05\x08'
+     b'\x00\x0f\x01\x06\x00\x13\x0c\x0b\x01\x04\x09\x07\x08\x0e\x05\x02'
+     b'\x0d\x06\x12\x11\x0f\x10\x0a\x03\x0f\x0d\x08\x09\x07\x05\x11\x01'
+     b'\x12\x02\x04\x13\x03\x10\x0a\x00\x0c\x0e\x06\x0b\x07\x08\x0f\x13'
+     b'\x0d\x0b\x06\x02\x0c\x05\x12\x0e\x01\x0a\x11\x03\x10\x09\x00\x04'
+     b'\x01\x0a\x07\x05\x09\x13\x04\x0d\x0f\x0b\x0e\x11\x00\x08\x03\x06'
+     b'\x02\x0c\x10\x12'),
+    (b'\x05\x13\x03\x0e\x10\x07\x00\x0c\x0d\x06\x02\x09\x0b\x11\x12\x08'
+     b'\x0a\x0f\x01\x04\x08\x03\x07\x0b\x13\x11\x0d\x06\x0a\x0c\x0e\x04'
+     b'\x05\x02\x00\x10\x01\x12\x09\x0f\x04\x00\x0d\x06\x12\x0a\x0e\x11'
+     b'\x08\x07\x01\x03\x0c\x09\x0b\x0f\x13\x10\x05\x02\x0f\x09\x01\x04'
+     b'\x0a\x06\x13\x0b\x03\x0e\x0d\x02\x12\x0c\x10\x00\x11\x08\x07\x05'
+     b'\x11\x0b\x05\x03\x0e\x08\x0c\x0a\x04\x0d\x13\x00\x07\x10\x06\x02'
+     b'\x12\x01\x0f\x09\x12\x0c\x11\x10\x02\x03\x05\x04\x01\x0b\x0e\x06'
+     b'\x00\x08\x0f\x13\x07\x09\x0d\x0a\x0a\x02\x0c\x00\x07\x0e\x01\x08'
+     b'\x11\x05\x12\x0b\x0d\x0f\x03\x09\x04\x13\x06\x10\x0b\x10\x13\x02'
+     b'\x08\x01\x12\x06\x00\x03\x11\x09\x0e\x07\x0d\x05\x0a\x04\x0f\x0c'
+     b'\x0c\x0d\x0a\x0f\x00\x0b\x08\x09\x10\x11\x06\x07\x04\x01\x05\x12'
+     b'\x03\x02\x13\x0e\x09\x0c\x04\x0d\x06\x0f\x11\x10\x02\x08\x00\x05'
+     b'\x12\x0a\x07\x01\x0b\x03\x0e\x13\x06\x08\x02\x11\x05\x13\x0f\x01'
+     b'\x12\x09\x07\x0a\x10\x04\x03\x0b\x0e\x0c\x00\x0d\x00\x07\x0e\x09'
+     b'\x0a\x0c\x05\x0f\x04\x13\x0b\x01\x03\x06\x08\x0d\x02\x10\x11\x12'
+     b'\x04\x06\x00\x01\x12\x0d\x0b\x07\x0f\x02\x13\x03\x09\x08\x0e\x0c'
+     b'\x10\x05\x0a\x11\x10\x0b\x13\x05\x03\x02\x0a\x12\x00\x04\x01\x0c'
+     b'\x08\x0e\x09\x11\x06\x0d\x07\x0f\x0e\x11\x09\x0c\x10\x12\x07\x00'
+     b'\x0b\x08\x0f\x05\x01\x02\x0a\x03\x0d\x13\x04\x06\x0f\x04\x12\x03'
+     b'\x0d\x08\x11\x10\x0e\x13\x09\x07\x06\x0c\x02\x01\x05\x00\x0b\x0a'
+     b'\x01\x0e\x0f\x0a\x0c\x04\x02\x13\x09\x10\x0d\x08\x05\x00\x11\x06'
+     b'\x0b\x07\x12\x03\x02\x05\x08\x07\x0b\x10\x04\x09\x0f\x0a\x03\x0d'
+     b'\x11\x13\x0c\x0e\x00\x06\x01\x12\x07\x02\x0b\x13\x11\x05\x06\x0d'
+     b'\x0c\x00\x04\x12\x0a\x03\x01\x08\x0f\x0e\x10\x09\x13\x06\x0d\x08'
+     b'\x07\x03\x09\x02\x01\x0f\x05\x04\x10\x0b\x0e\x0a\x0c\x12\x11\x00'
+     b'\x0c\x12\x10\x0b\x0f\x09\x0e\x03\x11\x05\x00\x13\x02\x07\x0a\x04'
+     b'\x0d\x06\x08\x01\x08\x0a\x09\x04\x01\x0d\x10\x0e\x13\x02\x0c\x11'
+     b'\x0f\x12\x06\x00\x07\x05\x03\x0b\x06\x0f\x12\x09\x04\x00\x0c\x11'
+     b'\x05\x01\x0a\x10\x0e\x0d\x13\x03\x08\x0b\x02\x07\x03\x11\x0e\x10'
+     b'\x02\x0b\x01\x00\x06\x12\x08\x0f\x13\x05\x04\x07\x09\x0a\x0c\x0d'
+     b'\x0d\x01\x06\x12\x09\x0c\x03\x05\x07\x0b\x10\x0e\x00\x04\x0f\x0a'
+     b'\x02\x11\x13\x08'),
+)